@@ -0,0 +1,90 @@
+"""Run the benchmark suite or compare two result files.
+
+python -m benchmarks run --output results.json [--filter mesh] [--group micro]
+python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import logging
+import sys
+
+import benchmarks.imports  # noqa: F401 # pyright: ignore[reportUnusedImport]
+import benchmarks.macros  # noqa: F401 # pyright: ignore[reportUnusedImport]
+import benchmarks.micro  # noqa: F401 # pyright: ignore[reportUnusedImport]
+from benchmarks.registry import BENCHMARKS
+from benchmarks.results import REGRESSION_THRESHOLD, BenchmarkResult, ResultsFile, Status, compare
+from benchmarks.runner import MIN_ROUND_TIME, ROUNDS, run_benchmark
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def _run(args: argparse.Namespace) -> int:
+    selected = [
+        b
+        for b in BENCHMARKS
+        if (args.group is None or b.group == args.group)
+        and (args.filter is None or fnmatch.fnmatch(b.key, args.filter))
+    ]
+    if not selected:
+        print("No benchmarks match the selection", file=sys.stderr)
+        return 1
+
+    results: list[BenchmarkResult] = []
+    for bench in selected:
+        result = run_benchmark(bench, rounds=args.rounds, min_round_time=args.min_time)
+        results.append(result)
+        print(f"{result.key:<70} {_format_time(result.median):>12} ± {_format_time(result.stddev)}")
+
+    if args.output:
+        ResultsFile(results).save(args.output)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    comparisons = compare(ResultsFile.load(args.baseline), ResultsFile.load(args.current), args.threshold)
+    for c in comparisons:
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        print(f"{c.key:<70} {_format_time(c.baseline):>12} {_format_time(c.current):>12} {ratio:>7}  {c.status.value}")
+
+    regressions = [c for c in comparisons if c.status is Status.REGRESSION]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks")
+    run.add_argument("--filter", help="glob matched against benchmark keys, e.g. 'path.*'")
+    run.add_argument("--group", choices=["micro", "macro", "import"])
+    run.add_argument("--output", help="write results as JSON to this file")
+    run.add_argument("--rounds", type=int, default=ROUNDS)
+    run.add_argument("--min-time", type=float, default=MIN_ROUND_TIME, help="minimum seconds per round")
+    run.set_defaults(handler=_run)
+
+    comparison = commands.add_parser("compare", help="flag regressions against a baseline")
+    comparison.add_argument("baseline")
+    comparison.add_argument("current")
+    comparison.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    comparison.set_defaults(handler=_compare)
+
+    logging.basicConfig(level=logging.WARNING)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
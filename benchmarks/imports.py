@@ -0,0 +1,47 @@
+"""Import time of the modules loaded when Klippy starts, as reported by `python -X importtime`.
+
+Each round imports the module in a fresh interpreter, so caches of the running suite do not hide any cost.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from typing import Callable
+
+import cartographer
+from benchmarks.registry import benchmark
+
+GROUP = "import"
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(cartographer.__file__)))
+
+
+def parse_import_time(output: str, module: str) -> float:
+    """Cumulative import time of module in seconds, from `-X importtime` output."""
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    msg = f"{module} not found in import time output"
+    raise RuntimeError(msg)
+
+
+@benchmark("import.time", GROUP, self_timed=True, module=["cartographer.core", "cartographer.runtime.loader"])
+def import_time(module: str) -> Callable[[], float]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SOURCE_DIR, os.environ.get("PYTHONPATH")])))
+
+    def run() -> float:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return parse_import_time(result.stderr, module)
+
+    return run
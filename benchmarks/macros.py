@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable
+
+from benchmarks.registry import benchmark
+from cartographer.interfaces.printer import Position
+from simulator import GaussianNoise, SimulatedPrinter, SimulatorAdapters, WavyBed
+from simulator.adapters import DEFAULT_TOUCH_MODEL
+from simulator.configuration import SimulatorConfiguration
+from simulator.sensor import synthetic_scan_model
+
+GROUP = "macro"
+MARGIN = 10.0
+NOISE = 0.001
+
+
+def _printer(bed_size: float, sample_rate: float, probe_count: int = 10) -> SimulatedPrinter:
+    sensor_model = synthetic_scan_model()
+    config = SimulatorConfiguration()
+    config.bed_mesh = replace(
+        config.bed_mesh,
+        mesh_min=(MARGIN, MARGIN + config.general.y_offset),
+        mesh_max=(bed_size - MARGIN, bed_size - MARGIN),
+        probe_count=(probe_count, probe_count),
+        zero_reference_position=(bed_size / 2, bed_size / 2),
+    )
+    config.save_scan_model(sensor_model)
+    config.save_touch_model(DEFAULT_TOUCH_MODEL)
+    adapters = SimulatorAdapters(
+        bed=WavyBed(amplitude=0.1, wavelength=bed_size),
+        config=config,
+        sensor_model=sensor_model,
+        noise=GaussianNoise(NOISE),
+        sample_rate=sample_rate,
+        position=Position(bed_size / 2, bed_size / 2, 10),
+        axis_maximum=(bed_size, bed_size, 250),
+    )
+    printer = SimulatedPrinter(adapters)
+    printer.home_z()
+    return printer
+
+
+@benchmark(
+    "macro.bed_mesh_calibrate",
+    GROUP,
+    bed_size=[235, 350],
+    probe_count=[10, 30],
+    sample_rate=[250, 500],
+)
+def bed_mesh_calibrate(bed_size: float, probe_count: int, sample_rate: float) -> Callable[[], object]:
+    printer = _printer(bed_size, sample_rate, probe_count)
+    return lambda: printer.run_macro("BED_MESH_CALIBRATE")
+
+
+@benchmark("macro.probe", GROUP, sample_rate=[500])
+def probe(sample_rate: float) -> Callable[[], object]:
+    printer = _printer(235, sample_rate)
+    return lambda: printer.run_macro("PROBE")
+
+
+@benchmark("macro.probe_accuracy", GROUP, samples=[10, 50], sample_rate=[500])
+def probe_accuracy(samples: int, sample_rate: float) -> Callable[[], object]:
+    printer = _printer(235, sample_rate)
+    return lambda: printer.run_macro("PROBE_ACCURACY", SAMPLES=samples)
+
+
+@benchmark("macro.touch", GROUP, sample_rate=[500])
+def touch(sample_rate: float) -> Callable[[], object]:
+    printer = _printer(235, sample_rate)
+    return lambda: printer.run_macro("CARTOGRAPHER_TOUCH")
+
+
+@benchmark("macro.scan_calibrate", GROUP, sample_rate=[500])
+def scan_calibrate(sample_rate: float) -> Callable[[], object]:
+    printer = _printer(235, sample_rate)
+    return lambda: printer.run_macro("CARTOGRAPHER_SCAN_CALIBRATE")
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from benchmarks.registry import benchmark
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.lib.nearest_neighbor import NearestNeighborSearcher
+from cartographer.lib.statistics import compute_mad
+from cartographer.lib.stream_recording import StreamRecorder, replay
+from cartographer.macros.bed_mesh.alternating_snake import AlternatingSnakePathGenerator
+from cartographer.macros.bed_mesh.mesh_utils import assign_samples_to_grid
+from cartographer.macros.bed_mesh.random_path import RandomPathGenerator
+from cartographer.macros.bed_mesh.snake_path import SnakePathGenerator
+from cartographer.macros.bed_mesh.spiral_path import SpiralPathGenerator
+from cartographer.probe.scan_model import ScanModel
+from cartographer.probe.touch_mode import TouchMode, TouchModeConfiguration
+from simulator import SimulatorAdapters
+from simulator.mcu import SimulatedStream
+from simulator.reactor import VirtualReactor
+from simulator.sensor import synthetic_scan_model
+
+if TYPE_CHECKING:
+    from cartographer.macros.bed_mesh.interfaces import PathGenerator, Point
+
+BED_SIZE = 200.0
+GROUP = "micro"
+
+PATH_GENERATORS: dict[str, Callable[[], PathGenerator]] = {
+    "snake": lambda: SnakePathGenerator("x", corner_radius=2),
+    "alternating_snake": lambda: AlternatingSnakePathGenerator("x", corner_radius=2),
+    "spiral": lambda: SpiralPathGenerator("x", corner_radius=2),
+    "random": lambda: RandomPathGenerator("x", corner_radius=2),
+}
+
+
+def _grid(count: int) -> list[Point]:
+    spacing = BED_SIZE / (count - 1)
+    return [(x * spacing, y * spacing) for y in range(count) for x in range(count)]
+
+
+def _scan_samples(grid: list[Point], per_point: int, rng: np.random.Generator) -> list[Sample]:
+    samples: list[Sample] = []
+    for x, y in grid:
+        for _ in range(per_point):
+            position = Position(float(x + rng.normal(0, 0.2)), float(y + rng.normal(0, 0.2)), 2.0)
+            frequency = 1 / (0.001 * float(x) + rng.normal(2.0, 0.001))
+            samples.append(Sample(frequency, time=0.0, position=position, velocity=100.0, temperature=30.0))
+    return samples
+
+
+@benchmark("scan_model.frequency_to_distance", GROUP, calls=[1000])
+def frequency_to_distance(calls: int) -> Callable[[], object]:
+    model = ScanModel(synthetic_scan_model())
+    frequencies = [model.distance_to_frequency(d) for d in np.linspace(0.5, 5, calls)]
+
+    def run() -> object:
+        return [model.frequency_to_distance(f) for f in frequencies]
+
+    return run
+
+
+@benchmark("scan_model.distance_to_frequency", GROUP, calls=[100])
+def distance_to_frequency(calls: int) -> Callable[[], object]:
+    model = ScanModel(synthetic_scan_model())
+    distances = list(np.linspace(0.5, 5, calls))
+
+    def run() -> object:
+        return [model.distance_to_frequency(d) for d in distances]
+
+    return run
+
+
+@benchmark("mesh.assign_samples_to_grid", GROUP, grid=[10, 25, 50], samples_per_point=[10, 40])
+def assign_samples(grid: int, samples_per_point: int) -> Callable[[], object]:
+    points = _grid(grid)
+    samples = _scan_samples(points, samples_per_point, np.random.default_rng(0))
+
+    def run() -> object:
+        return assign_samples_to_grid(points, samples, lambda s: 1 / s.frequency, correct_direction=True)
+
+    return run
+
+
+@benchmark("path.generate_path", GROUP, generator=["snake", "alternating_snake", "spiral"], grid=[10, 25, 50])
+# Random paths grow much faster than the others, larger grids would dominate the suite
+@benchmark("path.generate_path", GROUP, generator=["random"], grid=[10, 25])
+def generate_path(generator: str, grid: int) -> Callable[[], object]:
+    path_generator = PATH_GENERATORS[generator]()
+    points = _grid(grid)
+
+    def run() -> object:
+        return list(path_generator.generate_path(points))
+
+    return run
+
+
+@benchmark("nearest_neighbor.batch_query", GROUP, grid=[10, 50], queries=[10000])
+def batch_query(grid: int, queries: int) -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    searcher = NearestNeighborSearcher([Position(float(x), float(y), 0) for x, y in _grid(grid)])
+    positions = [(float(x), float(y)) for x, y in rng.uniform(0, BED_SIZE, (queries, 2))]
+
+    def run() -> object:
+        return searcher.batch_query(positions)
+
+    return run
+
+
+@benchmark("statistics.compute_mad", GROUP, size=[5, 100, 10000])
+def mad(size: int) -> Callable[[], object]:
+    samples = np.random.default_rng(0).normal(0, 0.01, size)
+
+    def run() -> object:
+        return compute_mad(samples)
+
+    return run
+
+
+@benchmark("touch._find_valid_combination", GROUP, samples=[10, 15], size=[5])
+def find_valid_combination(samples: int, size: int) -> Callable[[], object]:
+    adapters = SimulatorAdapters()
+    touch = TouchMode(adapters.mcu, adapters.toolhead, TouchModeConfiguration.from_config(adapters.config))
+    # Spread too wide for any combination to pass, the worst case of trying every one
+    touches = [i * 0.01 for i in range(samples)]
+
+    def run() -> object:
+        return touch._find_valid_combination(touches, size)  # pyright: ignore[reportPrivateUsage]
+
+    return run
+
+
+@benchmark("stream.replay", GROUP, samples=[10000])
+def stream_replay(samples: int) -> Callable[[], object]:
+    directory = tempfile.TemporaryDirectory()
+    path = os.path.join(directory.name, "stream.bin")
+    recorder = StreamRecorder(path)
+    recorder.record_constants(12e6, 1 / 4095, 8)
+    for i in range(samples):
+        recorder.record_data(i * 24000, 50_000_000 + i, 16000, i / 500, Position(100.0, 100.0, 2.0), 100.0)
+    recorder.close()
+    stream = SimulatedStream(VirtualReactor())
+
+    def run() -> object:
+        # Keeps the directory alive for as long as the benchmark runs
+        _ = directory
+        with stream.start_session() as session:
+            _ = replay(path, stream)
+        return session.get_items()
+
+    return run
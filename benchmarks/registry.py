@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Callable, Dict, Union
+
+from typing_extensions import TypeAlias
+
+ParamValue: TypeAlias = Union[int, float, str]
+Params: TypeAlias = Dict[str, ParamValue]
+# Setup runs untimed and returns the function that is timed
+Setup: TypeAlias = Callable[..., Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    group: str
+    params: Params
+    setup: Setup
+    # Self-timed benchmarks return their own measurement in seconds instead of being timed
+    self_timed: bool = False
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        formatted = ",".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.name}[{formatted}]"
+
+    def prepare(self) -> Callable[[], object]:
+        return self.setup(**self.params)
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, group: str, *, self_timed: bool = False, **grid: list[ParamValue]) -> Callable[[Setup], Setup]:
+    """Register a setup function once for every combination of the parameter grid."""
+
+    def register(setup: Setup) -> Setup:
+        names = list(grid)
+        for values in itertools.product(*(grid[n] for n in names)):
+            BENCHMARKS.append(Benchmark(name, group, dict(zip(names, values)), setup, self_timed))
+        return setup
+
+    return register
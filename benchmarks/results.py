@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from benchmarks.registry import Params
+
+RESULTS_VERSION = 1
+REGRESSION_THRESHOLD = 0.10  # Relative slowdown of the median before it counts as a regression
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    key: str
+    name: str
+    group: str
+    params: Params
+    rounds: int
+    loops: int
+    # Seconds per call
+    min: float
+    median: float
+    mean: float
+    stddev: float
+
+
+def describe_environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+@dataclass
+class ResultsFile:
+    results: list[BenchmarkResult]
+    environment: dict[str, str] = field(default_factory=describe_environment)
+
+    def save(self, path: str) -> None:
+        data = {
+            "version": RESULTS_VERSION,
+            "environment": self.environment,
+            "results": [asdict(r) for r in self.results],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    @staticmethod
+    def load(path: str) -> ResultsFile:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != RESULTS_VERSION:
+            msg = f"Unsupported benchmark results version {data.get('version')} in {path}"
+            raise RuntimeError(msg)
+        return ResultsFile(
+            results=[BenchmarkResult(**r) for r in data["results"]],
+            environment=data["environment"],
+        )
+
+
+class Status(Enum):
+    REGRESSION = "regression"
+    IMPROVEMENT = "improvement"
+    UNCHANGED = "unchanged"
+    NEW = "new"
+    MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    status: Status
+    baseline: float | None
+    current: float | None
+
+    @property
+    def ratio(self) -> float | None:
+        if self.baseline is None or self.current is None or self.baseline == 0:
+            return None
+        return self.current / self.baseline
+
+
+def compare(baseline: ResultsFile, current: ResultsFile, threshold: float = REGRESSION_THRESHOLD) -> list[Comparison]:
+    """Compare medians per benchmark, anything slower than the threshold is a regression."""
+    before = {r.key: r for r in baseline.results}
+    after = {r.key: r for r in current.results}
+
+    comparisons: list[Comparison] = []
+    for key, result in after.items():
+        previous = before.get(key)
+        if previous is None:
+            comparisons.append(Comparison(key, Status.NEW, None, result.median))
+            continue
+        ratio = result.median / previous.median if previous.median > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = Status.REGRESSION
+        elif ratio < 1 / (1 + threshold):
+            status = Status.IMPROVEMENT
+        else:
+            status = Status.UNCHANGED
+        comparisons.append(Comparison(key, status, previous.median, result.median))
+
+    comparisons.extend(Comparison(key, Status.MISSING, r.median, None) for key, r in before.items() if key not in after)
+    return comparisons
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import gc
+import logging
+import statistics
+import time
+from typing import TYPE_CHECKING, Callable
+
+from benchmarks.results import BenchmarkResult
+
+if TYPE_CHECKING:
+    from benchmarks.registry import Benchmark
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 5
+MIN_ROUND_TIME = 0.05  # s, fast benchmarks loop until a round takes at least this long
+MAX_LOOPS = 1 << 20
+
+
+def _time_loops(fn: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - start
+
+
+def calibrate_loops(fn: Callable[[], object], min_round_time: float = MIN_ROUND_TIME) -> int:
+    """Find how many calls make a round long enough to time reliably, the first call doubles as warmup."""
+    loops = 1
+    while loops < MAX_LOOPS:
+        if _time_loops(fn, loops) >= min_round_time:
+            break
+        loops *= 2
+    return loops
+
+
+def _timed_rounds(fn: Callable[[], object], loops: int, rounds: int) -> list[float]:
+    timings: list[float] = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            timings.append(_time_loops(fn, loops) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def _self_timed(fn: Callable[[], object]) -> float:
+    result = fn()
+    if not isinstance(result, float):
+        msg = f"Self-timed benchmark returned {result!r} instead of seconds"
+        raise RuntimeError(msg)
+    return result
+
+
+def run_benchmark(
+    benchmark: Benchmark, rounds: int = ROUNDS, min_round_time: float = MIN_ROUND_TIME
+) -> BenchmarkResult:
+    fn = benchmark.prepare()
+    if benchmark.self_timed:
+        _ = fn()  # Warmup
+        loops = 1
+        timings = [_self_timed(fn) for _ in range(rounds)]
+    else:
+        loops = calibrate_loops(fn, min_round_time)
+        timings = _timed_rounds(fn, loops, rounds)
+
+    return BenchmarkResult(
+        key=benchmark.key,
+        name=benchmark.name,
+        group=benchmark.group,
+        params=benchmark.params,
+        rounds=rounds,
+        loops=loops,
+        min=min(timings),
+        median=statistics.median(timings),
+        mean=statistics.mean(timings),
+        stddev=statistics.stdev(timings) if rounds > 1 else 0.0,
+    )
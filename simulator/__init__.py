@@ -0,0 +1,7 @@
+from simulator.adapters import SimulatorAdapters as SimulatorAdapters
+from simulator.printer import SimulatedPrinter as SimulatedPrinter
+from simulator.sensor import GaussianNoise as GaussianNoise
+from simulator.sensor import TouchResponse as TouchResponse
+from simulator.surface import FlatBed as FlatBed
+from simulator.surface import TiltedBed as TiltedBed
+from simulator.surface import WavyBed as WavyBed
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+import tempfile
+from typing import TYPE_CHECKING, final
+
+from cartographer.interfaces.configuration import TouchModelConfiguration
+from cartographer.interfaces.printer import Position
+from cartographer.runtime.adapters import Adapters
+from simulator.bed_mesh import RecordingBedMesh
+from simulator.configuration import SimulatorConfiguration
+from simulator.mcu import HALT_LATENCY, SAMPLE_RATE, SimulatedMcu
+from simulator.motion import Trajectory
+from simulator.reactor import VirtualReactor
+from simulator.sensor import (
+    GaussianNoise,
+    NoiseModel,
+    ScanResponse,
+    TouchResponse,
+    synthetic_scan_model,
+)
+from simulator.surface import BedSurface, FlatBed
+from simulator.task_executor import InlineTaskExecutor
+from simulator.toolhead import SimulatedToolhead
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.configuration import Configuration, ScanModelConfiguration
+
+logger = logging.getLogger(__name__)
+
+START_POSITION = Position(110.0, 110.0, 10.0)
+AXIS_MAXIMUM = (220.0, 220.0, 250.0)
+DEFAULT_TOUCH_MODEL = TouchModelConfiguration(name="default", threshold=2500, speed=3.0, z_offset=0.0)
+
+
+@final
+class SimulatorAdapters(Adapters):
+    """Simulated printer hardware, deterministic for a given seed.
+
+    Without a configuration the printer starts calibrated for the sensor model,
+    with the toolhead homed and physically at START_POSITION.
+    """
+
+    def __init__(
+        self,
+        *,
+        bed: BedSurface | None = None,
+        config: Configuration | None = None,
+        sensor_model: ScanModelConfiguration | None = None,
+        touch_response: TouchResponse | None = None,
+        noise: NoiseModel | None = None,
+        sample_rate: float = SAMPLE_RATE,
+        sensor_latency: float = 0.0,
+        halt_latency: float = HALT_LATENCY,
+        halt_decel: float | None = None,
+        position: Position = START_POSITION,
+        axis_maximum: tuple[float, float, float] = AXIS_MAXIMUM,
+        homed_axes: str = "xyz",
+        seed: int = 0,
+        state_dir: str | None = None,
+    ) -> None:
+        self.bed = bed or FlatBed()
+        sensor_model = sensor_model or synthetic_scan_model()
+        if config is None:
+            config = SimulatorConfiguration()
+            config.save_scan_model(sensor_model)
+            config.save_touch_model(DEFAULT_TOUCH_MODEL)
+        self.config = config
+        self.state_dir = state_dir or tempfile.gettempdir()
+
+        self.reactor = VirtualReactor()
+        self.trajectory = Trajectory(position)
+        self.mcu = SimulatedMcu(
+            self.reactor,
+            self.trajectory,
+            self.bed,
+            scan_response=ScanResponse(sensor_model),
+            touch_response=touch_response or TouchResponse(),
+            noise=noise or GaussianNoise(),
+            x_offset=config.general.x_offset,
+            y_offset=config.general.y_offset,
+            sample_rate=sample_rate,
+            sensor_latency=sensor_latency,
+            sample_latency=config.scan.sample_latency,
+            halt_latency=halt_latency,
+            halt_decel=halt_decel,
+            seed=seed,
+        )
+        # The concrete parts are kept alongside the protocol typed attributes, for the simulation only features
+        self.simulated_toolhead = SimulatedToolhead(
+            self.reactor, self.trajectory, self.bed, axis_maximum=axis_maximum, homed_axes=homed_axes
+        )
+        self.toolhead = self.simulated_toolhead
+        self.recording_bed_mesh = RecordingBedMesh()
+        self.bed_mesh = self.recording_bed_mesh
+        self.task_executor = InlineTaskExecutor()
+        self.axis_twist_compensation = None
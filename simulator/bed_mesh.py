@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, final
+
+import numpy as np
+from typing_extensions import override
+
+from cartographer.macros.bed_mesh.interfaces import BedMeshAdapter, MeshGrid, Polygon
+from cartographer.macros.bed_mesh.mesh_utils import mesh_grid_from_points
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.printer import Position
+
+
+@dataclass(frozen=True)
+class AppliedMesh:
+    mesh: MeshGrid
+    profile_name: str | None
+
+
+@final
+class RecordingBedMesh(BedMeshAdapter):
+    """Bed mesh that keeps every applied mesh so a simulation can inspect them."""
+
+    def __init__(self, objects: list[Polygon] | None = None) -> None:
+        self.objects: list[Polygon] = objects or []
+        self.applied: list[AppliedMesh] = []
+        self.active: MeshGrid | None = None
+
+    @override
+    def get_objects(self) -> list[Polygon]:
+        return self.objects
+
+    @override
+    def clear_mesh(self) -> None:
+        self.active = None
+
+    @override
+    def apply_mesh(self, mesh: MeshGrid | list[Position], profile_name: str | None = None) -> None:
+        if not isinstance(mesh, MeshGrid):
+            mesh = mesh_grid_from_points(np.array([p.as_tuple() for p in mesh], dtype=float))
+        self.applied.append(AppliedMesh(mesh, profile_name))
+        self.active = mesh
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import final
+
+from typing_extensions import override
+
+from cartographer.interfaces.configuration import (
+    BedMeshConfig,
+    Configuration,
+    GeneralConfig,
+    ScanConfig,
+    ScanModelConfiguration,
+    TouchConfig,
+    TouchModelConfiguration,
+)
+
+
+def default_general_config() -> GeneralConfig:
+    return GeneralConfig(
+        x_offset=0.0,
+        y_offset=15.0,
+        travel_speed=300.0,
+        z_backlash=0.0,
+        macro_prefix="cartographer",
+        verbose=False,
+        mesh_executor="inline",
+        convergence_executor="inline",
+    )
+
+
+def default_scan_config() -> ScanConfig:
+    return ScanConfig(
+        samples=20,
+        models={},
+        probe_speed=5.0,
+        mesh_runs=1,
+        mesh_height=4.0,
+        mesh_corner_radius=2.0,
+        mesh_min_samples=5,
+        mesh_direction_correction=False,
+        sample_latency=0.0,
+        homing_approach_height=0.0,
+        mesh_direction="x",
+        mesh_path="snake",
+    )
+
+
+def default_touch_config() -> TouchConfig:
+    return TouchConfig(samples=5, max_samples=10, approach_clearance=0.0, models={})
+
+
+def default_bed_mesh_config() -> BedMeshConfig:
+    return BedMeshConfig(
+        mesh_min=(10.0, 20.0),
+        mesh_max=(210.0, 210.0),
+        probe_count=(10, 10),
+        speed=100.0,
+        horizontal_move_z=3.0,
+        adaptive_margin=0.0,
+        zero_reference_position=(110.0, 110.0),
+    )
+
+
+@final
+class SimulatorConfiguration(Configuration):
+    """In memory configuration, saved values only last as long as the simulation."""
+
+    def __init__(
+        self,
+        *,
+        general: GeneralConfig | None = None,
+        scan: ScanConfig | None = None,
+        touch: TouchConfig | None = None,
+        bed_mesh: BedMeshConfig | None = None,
+    ) -> None:
+        self.general = general or default_general_config()
+        self.scan = scan or default_scan_config()
+        self.touch = touch or default_touch_config()
+        self.bed_mesh = bed_mesh or default_bed_mesh_config()
+
+    @override
+    def save_scan_model(self, config: ScanModelConfiguration) -> None:
+        self.scan.models[config.name] = config
+
+    @override
+    def save_touch_model(self, config: TouchModelConfiguration) -> None:
+        self.touch.models[config.name] = config
+
+    @override
+    def save_z_backlash(self, backlash: float) -> None:
+        self.general = replace(self.general, z_backlash=backlash)
+
+    @override
+    def save_sample_latency(self, latency: float) -> None:
+        self.scan = replace(self.scan, sample_latency=latency)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, final
+
+import numpy as np
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Mcu, Sample
+from cartographer.lib.stream_stats import StreamStats, SupportsStreamStats
+from cartographer.stream import Condition, Session, Stream
+
+if TYPE_CHECKING:
+    from simulator.motion import Trajectory
+    from simulator.reactor import VirtualReactor
+    from simulator.sensor import NoiseModel, ScanResponse, TouchResponse
+    from simulator.surface import BedSurface
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 500.0
+COIL_TEMPERATURE = 30.0
+HALT_LATENCY = 0.005  # s, trigger to stepper stop across mcus
+
+
+@final
+class SimulatedStream(Stream[Sample]):
+    def __init__(self, reactor: VirtualReactor) -> None:
+        super().__init__()
+        self._reactor = reactor
+
+    @override
+    def condition(self) -> Condition:
+        return self._reactor.condition()
+
+
+@dataclass
+class _HomingRequest:
+    start_time: float
+    frequency: float | None = None
+    touch_height: float | None = None
+    trigger_time: float | None = None
+
+
+@final
+class SimulatedMcu(Mcu, SupportsStreamStats):
+    """Cartographer mcu streaming synthetic readings of a simulated bed.
+
+    Readings are taken from the physical nozzle position `sensor_latency` ago,
+    while sample positions are looked up with the configured sample latency, as on hardware.
+    Homing stops the toolhead `halt_latency` after the sample that crosses the trigger,
+    the time trsync takes to reach the stepper mcu, braking with `halt_decel` if given.
+    """
+
+    def __init__(
+        self,
+        reactor: VirtualReactor,
+        trajectory: Trajectory,
+        bed: BedSurface,
+        *,
+        scan_response: ScanResponse,
+        touch_response: TouchResponse,
+        noise: NoiseModel,
+        x_offset: float,
+        y_offset: float,
+        sample_rate: float = SAMPLE_RATE,
+        sensor_latency: float = 0.0,
+        sample_latency: float = 0.0,
+        halt_latency: float = HALT_LATENCY,
+        halt_decel: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.sample_latency = sample_latency
+        self.stream = SimulatedStream(reactor)
+        self.stream_stats = StreamStats()
+        self._reactor = reactor
+        self._trajectory = trajectory
+        self._bed = bed
+        self._scan_response = scan_response
+        self._touch_response = touch_response
+        self._noise = noise
+        self._x_offset = x_offset
+        self._y_offset = y_offset
+        self._interval = 1 / sample_rate
+        self._sensor_latency = sensor_latency
+        self._halt_latency = halt_latency
+        self._halt_decel = halt_decel
+        self._rng = np.random.default_rng(seed)
+        self._homing: _HomingRequest | None = None
+
+        _ = reactor.register_timer(self._handle_sample, reactor.monotonic())
+
+    @override
+    def start_homing_scan(self, print_time: float, frequency: float) -> object:
+        self._homing = _HomingRequest(print_time, frequency=frequency)
+        return self._homing
+
+    @override
+    def start_homing_touch(self, print_time: float, threshold: int) -> object:
+        touch_height = self._touch_response.trigger_height(threshold, self._rng)
+        self._homing = _HomingRequest(print_time, touch_height=touch_height)
+        return self._homing
+
+    @override
+    def stop_homing(self, home_end_time: float) -> float:
+        homing = self._homing
+        if homing is None:
+            return 0.0
+        self._reactor.wait_for(
+            lambda: homing.trigger_time is not None or self._reactor.monotonic() >= home_end_time + self._interval
+        )
+        self._homing = None
+        return homing.trigger_time if homing.trigger_time is not None else 0.0
+
+    @override
+    def start_session(self, start_condition: Callable[[Sample], bool] | None = None) -> Session[Sample]:
+        return self.stream.start_session(start_condition)
+
+    @override
+    def set_sample_latency(self, latency: float) -> None:
+        self.sample_latency = latency
+
+    @override
+    def get_stream_stats(self) -> StreamStats:
+        return self.stream_stats
+
+    def _handle_sample(self, eventtime: float) -> float:
+        handler_start = perf_counter()
+        sensed = self._trajectory.physical_position_at(eventtime - self._sensor_latency)
+        distance = sensed.z - self._bed.height(sensed.x + self._x_offset, sensed.y + self._y_offset)
+        frequency = self._scan_response.frequency(distance + self._noise.sample(self._rng))
+        self._check_trigger(eventtime, frequency)
+
+        position, velocity = self._trajectory.position_at(eventtime - self.sample_latency)
+        self.stream.add_item(
+            Sample(
+                frequency=frequency,
+                time=eventtime,
+                position=position,
+                velocity=velocity,
+                temperature=COIL_TEMPERATURE,
+            )
+        )
+        # Samples are handled the moment they are taken
+        self.stream_stats.record(eventtime, eventtime, perf_counter() - handler_start)
+        return eventtime + self._interval
+
+    def _check_trigger(self, eventtime: float, frequency: float) -> None:
+        homing = self._homing
+        if homing is None or homing.trigger_time is not None or eventtime < homing.start_time:
+            return
+
+        if homing.frequency is not None:
+            triggered = frequency >= homing.frequency
+        else:
+            nozzle = self._trajectory.physical_position_at(eventtime)
+            triggered = nozzle.z - self._bed.height(nozzle.x, nozzle.y) <= (homing.touch_height or 0.0)
+        if not triggered:
+            return
+
+        homing.trigger_time = eventtime
+        self._trajectory.halt(eventtime + self._halt_latency, self._halt_decel)
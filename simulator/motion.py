@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from typing import final
+
+from cartographer.interfaces.printer import Position
+
+
+def _distance(a: Position, b: Position) -> float:
+    return math.sqrt((b.x - a.x) ** 2 + (b.y - a.y) ** 2 + (b.z - a.z) ** 2)
+
+
+@final
+@dataclass(frozen=True)
+class Move:
+    """A straight rest to rest move with a trapezoidal velocity profile.
+
+    Positions are in toolhead coordinates, `z_origin` is where z=0 of those coordinates
+    physically is, so the simulated hardware can tell where the nozzle really is.
+    """
+
+    start_time: float
+    start: Position
+    end: Position
+    cruise_velocity: float
+    accel: float
+    accel_time: float
+    cruise_time: float
+    z_origin: float = 0.0
+    halt_time: float | None = None
+    halt_decel: float | None = None  # None stops dead, like steps that are no longer sent
+
+    @staticmethod
+    def plan(start_time: float, start: Position, end: Position, *, speed: float, accel: float, z_origin: float) -> Move:
+        length = _distance(start, end)
+        if length == 0:
+            return Move(start_time, start, end, 0.0, accel, 0.0, 0.0, z_origin)
+        # Short moves never reach the requested speed
+        cruise_velocity = min(speed, math.sqrt(length * accel))
+        accel_time = cruise_velocity / accel
+        cruise_time = (length - cruise_velocity * accel_time) / cruise_velocity
+        return Move(start_time, start, end, cruise_velocity, accel, accel_time, cruise_time, z_origin)
+
+    @property
+    def length(self) -> float:
+        return _distance(self.start, self.end)
+
+    @property
+    def planned_end_time(self) -> float:
+        return self.start_time + 2 * self.accel_time + self.cruise_time
+
+    @property
+    def end_time(self) -> float:
+        if self.halt_time is None or self.halt_time >= self.planned_end_time:
+            return self.planned_end_time
+        if self.halt_decel is None:
+            return self.halt_time
+        _, velocity = self._travel(self.halt_time - self.start_time)
+        return self.halt_time + velocity / self.halt_decel
+
+    def position_at(self, time: float) -> tuple[Position, float]:
+        """Position and velocity at the given time, clamped to the move."""
+        if time >= self.end_time:
+            return self._position_along(self._travel_until(self.end_time)[0]), 0.0
+        travel, velocity = self._travel_until(max(time, self.start_time))
+        return self._position_along(travel), velocity
+
+    def _travel_until(self, time: float) -> tuple[float, float]:
+        halt_time = self.halt_time
+        if halt_time is None or time <= halt_time or self.halt_decel is None:
+            return self._travel(time - self.start_time)
+        # Braking from wherever the halt caught the move
+        travel, velocity = self._travel(halt_time - self.start_time)
+        braking = min(time - halt_time, velocity / self.halt_decel)
+        return travel + velocity * braking - 0.5 * self.halt_decel * braking**2, velocity - self.halt_decel * braking
+
+    def _travel(self, elapsed: float) -> tuple[float, float]:
+        accel = self.accel
+        velocity = self.cruise_velocity
+        if elapsed < self.accel_time:
+            return 0.5 * accel * elapsed**2, accel * elapsed
+        accel_distance = 0.5 * velocity * self.accel_time
+        cruise_end = self.accel_time + self.cruise_time
+        if elapsed < cruise_end:
+            return accel_distance + velocity * (elapsed - self.accel_time), velocity
+        decel = min(elapsed - cruise_end, self.accel_time)
+        travel = accel_distance + velocity * self.cruise_time + velocity * decel - 0.5 * accel * decel**2
+        return travel, velocity - accel * decel
+
+    def _position_along(self, travel: float) -> Position:
+        length = self.length
+        if length == 0:
+            return self.start
+        ratio = min(travel / length, 1.0)
+        return Position(
+            x=self.start.x + (self.end.x - self.start.x) * ratio,
+            y=self.start.y + (self.end.y - self.start.y) * ratio,
+            z=self.start.z + (self.end.z - self.start.z) * ratio,
+        )
+
+
+@final
+class Trajectory:
+    """Motion history of the toolhead, the simulator's equivalent of Klipper's trapq."""
+
+    def __init__(self, position: Position, z_origin: float = 0.0) -> None:
+        self._moves: list[Move] = []
+        self._start_times: list[float] = []
+        self.set_position(0.0, position, z_origin)
+
+    @property
+    def last(self) -> Move:
+        return self._moves[-1]
+
+    @property
+    def z_origin(self) -> float:
+        return self.last.z_origin
+
+    def end_position(self) -> Position:
+        position, _ = self.last.position_at(self.last.end_time)
+        return position
+
+    def append(self, move: Move) -> None:
+        if self._moves and move.start_time < self.last.end_time:
+            msg = f"Move at {move.start_time:.3f}s overlaps the previous move ending at {self.last.end_time:.3f}s"
+            raise RuntimeError(msg)
+        self._moves.append(move)
+        self._start_times.append(move.start_time)
+
+    def set_position(self, time: float, position: Position, z_origin: float) -> None:
+        """Redefine the toolhead coordinates, physically nothing moves."""
+        start_time = max(time, self.last.end_time) if self._moves else time
+        self.append(Move.plan(start_time, position, position, speed=1.0, accel=1.0, z_origin=z_origin))
+
+    def halt(self, time: float, decel: float | None = None) -> None:
+        """Stop the toolhead from the given time on, dropping all motion planned after it.
+
+        Without a deceleration the toolhead stops dead at that time.
+        """
+        while len(self._moves) > 1 and self.last.start_time > time:
+            _ = self._moves.pop()
+            _ = self._start_times.pop()
+        if time < self.last.end_time:
+            self._moves[-1] = replace(self.last, halt_time=time, halt_decel=decel)
+
+    def position_at(self, time: float) -> tuple[Position, float]:
+        """Requested toolhead position and velocity at the given time."""
+        return self._move_at(time).position_at(time)
+
+    def physical_position_at(self, time: float) -> Position:
+        move = self._move_at(time)
+        position, _ = move.position_at(time)
+        return Position(position.x, position.y, position.z + move.z_origin)
+
+    def _move_at(self, time: float) -> Move:
+        index = bisect_right(self._start_times, time) - 1
+        return self._moves[max(index, 0)]
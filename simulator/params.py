@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar, final, overload
+
+from typing_extensions import override
+
+from cartographer.interfaces.printer import MacroParams
+
+T = TypeVar("T", int, float)
+
+
+@final
+class SimulatorParams(MacroParams):
+    """Macro parameters validated the way Klipper's G-code commands validate them."""
+
+    def __init__(self, params: dict[str, object] | None = None) -> None:
+        self.params: dict[str, str] = {key.upper(): str(value) for key, value in (params or {}).items()}
+
+    @overload
+    def get(self, name: str, default: str = ...) -> str: ...
+    @overload
+    def get(self, name: str, default: None) -> str | None: ...
+
+    @override
+    def get(self, name: str, default: str | None = ...) -> str | None:
+        value = self.params.get(name)
+        if value is not None:
+            return value
+        if default is ...:
+            msg = f"Missing parameter {name}"
+            raise ValueError(msg)
+        return default
+
+    @overload
+    def get_float(
+        self, name: str, default: float = ..., *, above: float = ..., minval: float = ..., maxval: float = ...
+    ) -> float: ...
+    @overload
+    def get_float(
+        self, name: str, default: None, *, above: float = ..., minval: float = ..., maxval: float = ...
+    ) -> float | None: ...
+
+    @override
+    def get_float(
+        self, name: str, default: float | None = ..., *, above: float = ..., minval: float = ..., maxval: float = ...
+    ) -> float | None:
+        value = self._parse(name, default, float)
+        if value is None:
+            return None
+        if above is not ... and value <= above:
+            msg = f"Parameter {name} must be above {above}"
+            raise ValueError(msg)
+        return self._check_range(name, value, minval, maxval)
+
+    @override
+    def get_int(self, name: str, default: int = ..., *, minval: int = ..., maxval: int = ...) -> int:
+        value = self._parse(name, default, int)
+        if value is None:
+            msg = f"Missing parameter {name}"
+            raise ValueError(msg)
+        return self._check_range(name, value, minval, maxval)
+
+    def _parse(self, name: str, default: T | None, parse: Callable[[str], T]) -> T | None:
+        value = self.params.get(name)
+        if value is None:
+            if default is ...:
+                msg = f"Missing parameter {name}"
+                raise ValueError(msg)
+            return default
+        try:
+            return parse(value)
+        except ValueError:
+            msg = f"Unable to parse '{value}' for parameter {name}"
+            raise ValueError(msg) from None
+
+    def _check_range(self, name: str, value: T, minval: T, maxval: T) -> T:
+        if minval is not ... and value < minval:
+            msg = f"Parameter {name} must have minimum of {minval}"
+            raise ValueError(msg)
+        if maxval is not ... and value > maxval:
+            msg = f"Parameter {name} must have maximum of {maxval}"
+            raise ValueError(msg)
+        return value
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, final
+
+from cartographer.core import PrinterCartographer
+from simulator.params import SimulatorParams
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.printer import Macro
+    from simulator.adapters import SimulatorAdapters
+
+logger = logging.getLogger(__name__)
+
+
+@final
+class SimulatedPrinter:
+    """Cartographer wired to simulated hardware, macros run end to end in virtual time."""
+
+    def __init__(self, adapters: SimulatorAdapters) -> None:
+        self.adapters = adapters
+        self.cartographer = PrinterCartographer(adapters)
+        self._macros: dict[str, Macro] = {reg.name: reg.macro for reg in self.cartographer.macros}
+
+    @property
+    def time(self) -> float:
+        return self.adapters.reactor.monotonic()
+
+    def run_macro(self, name: str, **params: object) -> None:
+        macro = self._macros.get(name.upper())
+        if macro is None:
+            msg = f"Unknown macro {name}"
+            raise RuntimeError(msg)
+        logger.debug("Running %s at %.3fs", name, self.time)
+        macro.run(SimulatorParams(params))
+
+    def home_z(self, *, speed: float = 5.0, retract_dist: float = 0.0) -> None:
+        """G28 Z with the scan endstop."""
+        self.adapters.simulated_toolhead.home_z(self.cartographer.scan_mode, speed=speed, retract_dist=retract_dist)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Callable, final
+
+from typing_extensions import override
+
+from cartographer.stream import Condition
+
+NEVER = float("inf")
+MAX_WAIT_TIME = 600.0  # s of virtual time before a wait is considered stalled
+
+
+@final
+class VirtualTimer:
+    def __init__(self, callback: Callable[[float], float], waketime: float) -> None:
+        self.callback = callback
+        self.waketime = waketime
+
+
+@final
+class VirtualReactor:
+    """Single threaded stand-in for Klipper's reactor running on a virtual clock.
+
+    Time only moves while something waits, and then jumps straight to the next timer,
+    so a simulation runs as fast as its timers can be processed.
+    """
+
+    def __init__(self, start_time: float = 0.0) -> None:
+        self._now = start_time
+        self._timers: list[VirtualTimer] = []
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def register_timer(self, callback: Callable[[float], float], waketime: float = NEVER) -> VirtualTimer:
+        """Register a callback that returns the time it wants to run next, or NEVER."""
+        timer = VirtualTimer(callback, waketime)
+        self._timers.append(timer)
+        return timer
+
+    def update_timer(self, timer: VirtualTimer, waketime: float) -> None:
+        timer.waketime = waketime
+
+    def unregister_timer(self, timer: VirtualTimer) -> None:
+        self._timers.remove(timer)
+
+    def advance(self, until: float) -> None:
+        """Run every timer due up to the given time and move the clock there."""
+        while True:
+            timer = self._next_timer()
+            if timer is None or timer.waketime > until:
+                break
+            self._run(timer)
+        self._now = max(self._now, until)
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: float = MAX_WAIT_TIME) -> None:
+        """Run timers until the predicate holds."""
+        deadline = self._now + timeout
+        while not predicate():
+            timer = self._next_timer()
+            if timer is None or timer.waketime > deadline:
+                msg = f"Simulation stalled at {self._now:.3f}s, nothing left to satisfy the wait"
+                raise RuntimeError(msg)
+            self._run(timer)
+
+    def condition(self) -> Condition:
+        return VirtualCondition(self)
+
+    def _next_timer(self) -> VirtualTimer | None:
+        # Ties go to the timer registered first, which keeps runs deterministic
+        return min(self._timers, key=lambda timer: timer.waketime, default=None)
+
+    def _run(self, timer: VirtualTimer) -> None:
+        self._now = max(self._now, timer.waketime)
+        timer.waketime = timer.callback(self._now)
+
+
+@final
+class VirtualCondition(Condition):
+    def __init__(self, reactor: VirtualReactor) -> None:
+        self._reactor = reactor
+
+    @override
+    def notify_all(self) -> None:
+        # Waiters poll their predicate after every timer, there is nobody to wake
+        pass
+
+    @override
+    def wait_for(self, predicate: Callable[[], bool]) -> None:
+        self._reactor.wait_for(predicate)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol, final
+
+import numpy as np
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.probe.scan_model import ScanModel
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.configuration import ScanModelConfiguration
+
+RESPONSE_RESOLUTION = 4096
+# Idealised coil response, frequency = BASE_FREQUENCY * (1 + COUPLING / (distance + COUPLING_DISTANCE))
+BASE_FREQUENCY = 2.9e6
+COUPLING = 0.3
+COUPLING_DISTANCE = 1.0
+SYNTHETIC_RANGE = (0.1, 5.5)
+
+
+class NoiseModel(Protocol):
+    def sample(self, rng: np.random.Generator) -> float:
+        """Draw the error of a single reading."""
+        ...
+
+
+@final
+@dataclass(frozen=True)
+class GaussianNoise(NoiseModel):
+    std: float = 0.0
+
+    @override
+    def sample(self, rng: np.random.Generator) -> float:
+        if self.std == 0:
+            return 0.0
+        return float(rng.normal(0.0, self.std))
+
+
+def synthetic_scan_model(name: str = "default") -> ScanModelConfiguration:
+    """Fit a scan model to an idealised coil response, the way SCAN_CALIBRATE would."""
+    distances = np.linspace(*SYNTHETIC_RANGE, num=500)
+    frequencies = BASE_FREQUENCY * (1 + COUPLING / (distances + COUPLING_DISTANCE))
+    samples = [
+        Sample(frequency=float(f), time=0.0, position=Position(0, 0, float(d)), velocity=0.0, temperature=0.0)
+        for d, f in zip(distances, frequencies)
+    ]
+    return ScanModel.fit(name, samples, z_offset=0)
+
+
+@final
+class ScanResponse:
+    """Coil frequency for a distance, the inverse of a scan model.
+
+    The model is tabulated once so every simulated sample is a single interpolation.
+    """
+
+    def __init__(self, model: ScanModelConfiguration) -> None:
+        lower, upper = model.domain
+        self._inverse_frequencies = np.linspace(lower, upper, RESPONSE_RESOLUTION)
+        poly = ScanModel(model).poly
+        self._distances = np.asarray(poly(self._inverse_frequencies), dtype=float) + model.z_offset
+        if not np.all(np.diff(self._distances) > 0):
+            msg = f"Scan model {model.name} is not monotonic and cannot be simulated"
+            raise RuntimeError(msg)
+
+    def frequency(self, distance: float) -> float:
+        # Readings beyond the model land just outside its domain, so they map to +/-inf like on hardware
+        if distance >= self._distances[-1]:
+            inverse_frequency = self._inverse_frequencies[-1] * 1.01
+        elif distance <= self._distances[0]:
+            inverse_frequency = self._inverse_frequencies[0] * 0.99
+        else:
+            inverse_frequency = np.interp(distance, self._distances, self._inverse_frequencies)
+        return float(1 / inverse_frequency)
+
+
+@final
+@dataclass(frozen=True)
+class TouchResponse:
+    """Where a touch with a given threshold triggers, relative to the bed surface."""
+
+    min_threshold: int = 1500  # Thresholds below this trigger on vibrations before contact
+    compression: float = 1e-5  # mm the nozzle presses into the bed per threshold count
+    noise: float = 0.002
+    false_trigger_height: float = 0.3
+
+    def trigger_height(self, threshold: int, rng: np.random.Generator) -> float:
+        if threshold < self.min_threshold:
+            return float(rng.uniform(0.0, self.false_trigger_height))
+        return float(-threshold * self.compression + rng.normal(0.0, self.noise))
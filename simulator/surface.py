@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Protocol, final
+
+from typing_extensions import override
+
+
+class BedSurface(Protocol):
+    def height(self, x: float, y: float) -> float:
+        """Physical height of the bed surface at the given position."""
+        ...
+
+
+@final
+@dataclass(frozen=True)
+class FlatBed(BedSurface):
+    offset: float = 0.0
+
+    @override
+    def height(self, x: float, y: float) -> float:
+        return self.offset
+
+
+@final
+@dataclass(frozen=True)
+class TiltedBed(BedSurface):
+    x_slope: float
+    y_slope: float
+    offset: float = 0.0
+
+    @override
+    def height(self, x: float, y: float) -> float:
+        return self.offset + self.x_slope * x + self.y_slope * y
+
+
+@final
+@dataclass(frozen=True)
+class WavyBed(BedSurface):
+    """Sinusoidal ripples in both directions, a stand-in for a warped sheet."""
+
+    amplitude: float
+    wavelength: float
+    offset: float = 0.0
+
+    @override
+    def height(self, x: float, y: float) -> float:
+        k = 2 * math.pi / self.wavelength
+        return self.offset + self.amplitude * math.sin(k * x) * math.cos(k * y)
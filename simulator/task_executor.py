@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar, final
+
+from typing_extensions import ParamSpec, override
+
+from cartographer.interfaces.multiprocessing import TaskExecutor
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@final
+class InlineTaskExecutor(TaskExecutor):
+    """Runs tasks on the calling thread, virtual time does not pass while they compute."""
+
+    @override
+    def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        return fn(*args, **kwargs)
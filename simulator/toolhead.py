@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Callable, final
+
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Endstop, HomingAxis, HomingState, Position, TemperatureStatus, Toolhead
+from simulator.motion import Move
+
+if TYPE_CHECKING:
+    from simulator.motion import Trajectory
+    from simulator.reactor import VirtualReactor
+    from simulator.surface import BedSurface
+
+logger = logging.getLogger(__name__)
+
+MOVE_BUFFER_TIME = 0.1  # s, like Klipper new moves are scheduled a little ahead of now
+MANUAL_PROBE_HEIGHT = 0.1  # The simulated user always lands on a perfect paper test
+
+
+@final
+class SimulatedHomingState(HomingState):
+    def __init__(self, z_retract_distance: float = 0.0) -> None:
+        self.z_homed_position: float | None = None
+        self.z_overshoot: float = 0.0
+        self.z_retract_distance = z_retract_distance
+
+    @override
+    def is_homing_z(self) -> bool:
+        return True
+
+    @override
+    def set_z_homed_position(self, position: float) -> None:
+        self.z_homed_position = position
+
+    @override
+    def get_z_overshoot(self) -> float:
+        return self.z_overshoot
+
+    @override
+    def get_z_retract_distance(self) -> float:
+        return self.z_retract_distance
+
+
+@final
+class SimulatedToolhead(Toolhead):
+    """Toolhead executing trapezoidal moves on a virtual clock."""
+
+    def __init__(
+        self,
+        reactor: VirtualReactor,
+        trajectory: Trajectory,
+        bed: BedSurface,
+        *,
+        axis_minimum: tuple[float, float, float] = (0.0, 0.0, -2.0),
+        axis_maximum: tuple[float, float, float] = (220.0, 220.0, 250.0),
+        max_velocity: float = 300.0,
+        max_accel: float = 3000.0,
+        homed_axes: str = "xyz",
+    ) -> None:
+        self._reactor = reactor
+        self._trajectory = trajectory
+        self._bed = bed
+        self._axis_minimum = axis_minimum
+        self._axis_maximum = axis_maximum
+        self._max_velocity = max_velocity
+        self._max_accel = max_accel
+        self._homed_axes = set(homed_axes)
+        self._position = trajectory.end_position()
+        self._last_move_time = 0.0
+
+        self.gcode_z_offset = 0.0
+        self.extruder_temperature = 25.0
+
+    @override
+    def get_last_move_time(self) -> float:
+        self._last_move_time = max(self._last_move_time, self._reactor.monotonic() + MOVE_BUFFER_TIME)
+        return self._last_move_time
+
+    @override
+    def wait_moves(self) -> None:
+        self._reactor.advance(self._last_move_time)
+
+    @override
+    def get_position(self) -> Position:
+        return self._position
+
+    @override
+    def move(self, *, x: float | None = None, y: float | None = None, z: float | None = None, speed: float) -> None:
+        current = self._position
+        target = Position(
+            x=current.x if x is None else x,
+            y=current.y if y is None else y,
+            z=current.z if z is None else z,
+        )
+        self._check_limits(target)
+        self._queue_move(target, speed)
+
+    @override
+    def is_homed(self, axis: HomingAxis) -> bool:
+        return axis in self._homed_axes
+
+    @override
+    def get_gcode_z_offset(self) -> float:
+        return self.gcode_z_offset
+
+    @override
+    def z_homing_move(self, endstop: Endstop, *, speed: float) -> float:
+        trigger_z, _ = self._homing_move(endstop, speed)
+        return trigger_z
+
+    def home_z(
+        self, endstop: Endstop, *, speed: float, retract_dist: float = 0.0, second_speed: float | None = None
+    ) -> None:
+        """Home z the way Klipper's G28 Z does, including the optional retract and second approach."""
+        homing_state = SimulatedHomingState(retract_dist)
+        endstop.on_home_begin(homing_state)
+
+        # An unhomed axis is assumed to be at its maximum, so the homing move covers the full range
+        self._set_z_position(self._axis_maximum[2])
+        trigger_z, halt_z = self._homing_move(endstop, speed)
+        if retract_dist > 0:
+            self._queue_move(Position(self._position.x, self._position.y, self._position.z + retract_dist), speed)
+            trigger_z, halt_z = self._homing_move(endstop, second_speed or speed / 2)
+
+        # Like Klipper, the homed position is where the toolhead halted
+        homing_state.z_overshoot = trigger_z - halt_z
+        endstop.on_home_end(homing_state)
+        homed = homing_state.z_homed_position
+        if homed is None:
+            homed = endstop.get_endstop_position() - homing_state.z_overshoot
+        self.set_z_position(homed)
+
+    @override
+    def set_z_position(self, z: float) -> None:
+        self._set_z_position(z)
+        self._homed_axes.add("z")
+
+    @override
+    def get_z_axis_limits(self) -> tuple[float, float]:
+        return self._axis_minimum[2], self._axis_maximum[2]
+
+    @override
+    def get_max_velocity(self) -> float:
+        return self._max_velocity
+
+    @override
+    def manual_probe(self, finalize_callback: Callable[[Position | None], None]) -> None:
+        position = self._position
+        physical_z = self._bed.height(position.x, position.y) + MANUAL_PROBE_HEIGHT
+        self._queue_move(Position(position.x, position.y, physical_z - self._trajectory.z_origin), 5)
+        self.wait_moves()
+        finalize_callback(self._position)
+
+    @override
+    def clear_z_homing_state(self) -> None:
+        self._homed_axes.discard("z")
+
+    @override
+    def dwell(self, seconds: float) -> None:
+        self._last_move_time = self.get_last_move_time() + seconds
+
+    @override
+    def get_extruder_temperature(self) -> TemperatureStatus:
+        return TemperatureStatus(self.extruder_temperature, 0)
+
+    @override
+    def apply_axis_twist_compensation(self, position: Position) -> Position:
+        return position
+
+    def _queue_move(self, target: Position, speed: float) -> None:
+        move = Move.plan(
+            self.get_last_move_time(),
+            self._position,
+            target,
+            speed=min(speed, self._max_velocity),
+            accel=self._max_accel,
+            z_origin=self._trajectory.z_origin,
+        )
+        self._trajectory.append(move)
+        self._last_move_time = move.end_time
+        self._position = target
+
+    def _homing_move(self, endstop: Endstop, speed: float) -> tuple[float, float]:
+        """Move down until the endstop triggers and return the trigger and halt heights."""
+        self.wait_moves()
+        start_time = self.get_last_move_time()
+        self._queue_move(Position(self._position.x, self._position.y, self._axis_minimum[2]), speed)
+        move = self._trajectory.last
+
+        _ = endstop.home_start(start_time)
+        trigger_time = endstop.home_wait(move.planned_end_time)
+
+        self._position = self._trajectory.end_position()
+        self._last_move_time = self._trajectory.last.end_time
+        if trigger_time <= 0:
+            msg = "No trigger on probe after full movement"
+            raise RuntimeError(msg)
+
+        trigger, _ = self._trajectory.position_at(trigger_time)
+        return trigger.z, self._position.z
+
+    def _set_z_position(self, z: float) -> None:
+        physical_z = self._position.z + self._trajectory.z_origin
+        self._position = Position(self._position.x, self._position.y, z)
+        self._trajectory.set_position(self.get_last_move_time(), self._position, physical_z - z)
+
+    def _check_limits(self, position: Position) -> None:
+        for index, axis in enumerate("xyz"):
+            if axis not in self._homed_axes:
+                continue
+            value = position.as_list()[index]
+            if not self._axis_minimum[index] <= value <= self._axis_maximum[index]:
+                msg = f"Move out of range: {position.x:.3f} {position.y:.3f} {position.z:.3f}"
+                raise RuntimeError(msg)
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import TYPE_CHECKING, final
 
 from cartographer.adapters.klipper.axis_twist_compensation import KlipperAxisTwistCompensationHelper
 from cartographer.adapters.klipper.bed_mesh import KlipperBedMesh
 from cartographer.adapters.klipper.configuration import KlipperConfiguration
 from cartographer.adapters.klipper.mcu import KlipperCartographerMcu
-from cartographer.adapters.klipper.task_executor import KlipperMultiprocessingExecutor
+from cartographer.adapters.klipper.task_executor import KlipperTaskExecutor
 from cartographer.adapters.klipper.toolhead import KlipperToolhead
+from cartographer.lib.flight_recorder import DUMP_DIRECTORY, FlightRecorder
 from cartographer.runtime.adapters import Adapters
 
 if TYPE_CHECKING:
@@ -22,10 +24,20 @@ logger = logging.getLogger(__name__)
 class KlipperAdapters(Adapters):
     def __init__(self, config: KlipperConfigWrapper) -> None:
         self.printer = config.get_printer()
+        # Runtime state lives next to the printer config
+        self.state_dir = os.path.dirname(os.path.abspath(str(self.printer.get_start_args()["config_file"])))
 
         self.config = KlipperConfiguration(config)
-        self.mcu = KlipperCartographerMcu(config)
-        self.task_executor = KlipperMultiprocessingExecutor(self.printer.get_reactor())
+        self.mcu = KlipperCartographerMcu(
+            config,
+            FlightRecorder(os.path.join(self.state_dir, DUMP_DIRECTORY)),
+            sample_latency=self.config.scan.sample_latency,
+        )
+        self.task_executor = KlipperTaskExecutor(
+            self.printer.get_reactor(),
+            {"mesh": self.config.general.mesh_executor, "convergence": self.config.general.convergence_executor},
+        )
+        self.printer.register_event_handler("klippy:disconnect", self.task_executor.thread.shutdown)
 
         self.toolhead = KlipperToolhead(config, self.mcu)
         self.bed_mesh = KlipperBedMesh(config)
@@ -6,7 +6,8 @@ import numpy as np
 from extras import bed_mesh
 from typing_extensions import override
 
-from cartographer.macros.bed_mesh.interfaces import BedMeshAdapter, Polygon
+from cartographer.macros.bed_mesh.interfaces import BedMeshAdapter, MeshGrid, Polygon
+from cartographer.macros.bed_mesh.mesh_utils import mesh_grid_from_points
 
 if TYPE_CHECKING:
     from configfile import ConfigWrapper
@@ -45,37 +46,16 @@ class KlipperBedMesh(BedMeshAdapter):
         self.bed_mesh.set_mesh(None)
 
     @override
-    def apply_mesh(self, mesh_points: list[Position], profile_name: str | None = None) -> None:
-        coords = np.array([p.as_tuple() for p in mesh_points])
-
-        xs_rounded = np.round(coords[:, 0], ROUND_DECIMALS)
-        ys_rounded = np.round(coords[:, 1], ROUND_DECIMALS)
-        zs = coords[:, 2]
-
-        x_unique = np.unique(xs_rounded)
-        y_unique = np.unique(ys_rounded)
-        points_per_x = len(x_unique)
-        points_per_y = len(y_unique)
-
-        x_indices = {v: i for i, v in enumerate(x_unique)}
-        y_indices = {v: i for i, v in enumerate(y_unique)}
-
-        matrix = np.full((points_per_y, points_per_x), np.nan)
-
-        for x, y, z in zip(xs_rounded, ys_rounded, zs):
-            xi = x_indices[x]
-            yi = y_indices[y]
-            matrix[yi, xi] = z
-
-        if np.isnan(matrix).any():
-            msg = "Mesh has missing points or inconsistent coordinates"
-            raise RuntimeError(msg)
+    def apply_mesh(self, mesh: MeshGrid | list[Position], profile_name: str | None = None) -> None:
+        if not isinstance(mesh, MeshGrid):
+            mesh = mesh_grid_from_points(np.array([p.as_tuple() for p in mesh], dtype=float), ROUND_DECIMALS)
+        points_per_y, points_per_x = mesh.matrix.shape
 
         mesh_params: BedMeshParams = {
-            "min_x": float(x_unique[0]),
-            "min_y": float(y_unique[0]),
-            "max_x": float(x_unique[-1]),
-            "max_y": float(y_unique[-1]),
+            "min_x": round(mesh.min[0], ROUND_DECIMALS),
+            "min_y": round(mesh.min[1], ROUND_DECIMALS),
+            "max_x": round(mesh.max[0], ROUND_DECIMALS),
+            "max_y": round(mesh.max[1], ROUND_DECIMALS),
             "x_count": points_per_x,
             "y_count": points_per_y,
             "mesh_x_pps": 0,
@@ -84,13 +64,13 @@ class KlipperBedMesh(BedMeshAdapter):
             "tension": 0.2,
         }
 
-        mesh = bed_mesh.ZMesh(mesh_params, profile_name)
+        z_mesh = bed_mesh.ZMesh(mesh_params, profile_name)
         try:
-            native_matrix = [[float(z) for z in row] for row in matrix.tolist()]
-            mesh.build_mesh(native_matrix)
+            # tolist() already yields native floats
+            z_mesh.build_mesh(mesh.matrix.astype(float).tolist())
         except bed_mesh.BedMeshError as e:
             raise RuntimeError(str(e)) from e
 
-        self.bed_mesh.set_mesh(mesh)
+        self.bed_mesh.set_mesh(z_mesh)
         if profile_name is not None:
             self.bed_mesh.save_profile(profile_name)
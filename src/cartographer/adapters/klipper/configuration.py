@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from functools import partial
 from typing import TYPE_CHECKING, final
 
@@ -57,8 +58,8 @@ class KlipperConfigWrapper(ParseConfigWrapper):
         return self._config.getfloatlist(option, count=count)
 
     @override
-    def get_int(self, option: str, default: int) -> int:
-        return self._config.getint(option, default=default)
+    def get_int(self, option: str, default: int, minimum: int | None = None) -> int:
+        return self._config.getint(option, default=default, minval=minimum)
 
     @override
     def get_required_int_list(self, option: str, count: int | None = None) -> list[int]:
@@ -85,7 +86,8 @@ class KlipperConfiguration(Configuration):
             cfg.get_name(): parse_scan_model_config(cfg)
             for cfg in (KlipperConfigWrapper(wrapper) for wrapper in config.get_prefix_sections(self.scan_model_prefix))
         }
-        self.scan = parse_scan_config(KlipperConfigWrapper(config.getsection(f"{self.name} scan")), scan_models)
+        self.scan_section = f"{self.name} scan"
+        self.scan = parse_scan_config(KlipperConfigWrapper(config.getsection(self.scan_section)), scan_models)
 
         self.touch_model_prefix = f"{self.name} touch_model"
         touch_models = {
@@ -115,3 +117,8 @@ class KlipperConfiguration(Configuration):
     @override
     def save_z_backlash(self, backlash: float) -> None:
         self._config.set(self.name, "z_backlash", backlash)
+
+    @override
+    def save_sample_latency(self, latency: float) -> None:
+        self._config.set(self.scan_section, "sample_latency", f"{latency:.6f}")
+        self.scan = replace(self.scan, sample_latency=latency)
@@ -14,7 +14,7 @@ if TYPE_CHECKING:
     from extras.homing import Homing
     from mcu import MCU
     from reactor import ReactorCompletion
-    from stepper import MCU_stepper
+    from stepper import MCU_stepper, PrinterRail
 
     from cartographer.adapters.klipper.mcu import KlipperCartographerMcu
     from cartographer.interfaces.printer import Endstop
@@ -34,8 +34,9 @@ def axis_to_index(axis: HomingAxis) -> int:
 
 @final
 class KlipperHomingState(HomingState):
-    def __init__(self, homing: Homing) -> None:
+    def __init__(self, homing: Homing, rails: list[PrinterRail]) -> None:
         self.homing = homing
+        self.rails = rails
 
     @override
     def is_homing_z(self) -> bool:
@@ -46,6 +47,29 @@ class KlipperHomingState(HomingState):
         logger.debug("Setting homed distance for z to %.3f", position)
         self.homing.set_homed_position([None, None, position])
 
+    @override
+    def get_z_overshoot(self) -> float:
+        toolhead = self.homing.toolhead
+        kinematics = toolhead.get_kinematics()
+        # Rebuild the toolhead position from the stepper positions recorded at the trigger
+        trigger_positions = {
+            stepper.get_name(): stepper.mcu_to_commanded_position(self.homing.get_trigger_position(stepper.get_name()))
+            if stepper.is_active_axis("z")
+            else stepper.get_commanded_position()
+            for stepper in kinematics.get_steppers()
+        }
+        trigger_z = kinematics.calc_position(trigger_positions)[2]
+        halt_z = toolhead.get_position()[2]
+        logger.debug("Z triggered at %.3f and halted at %.3f", trigger_z, halt_z)
+        return trigger_z - halt_z
+
+    @override
+    def get_z_retract_distance(self) -> float:
+        # Like Klipper's homing, the first rail decides on the retract
+        if not self.rails:
+            return 0.0
+        return self.rails[0].get_homing_info().retract_dist
+
 
 @final
 class KlipperEndstop(MCU_endstop):
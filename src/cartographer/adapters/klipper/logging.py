@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+from collections import deque
 from textwrap import dedent
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 from typing_extensions import override
 
+if TYPE_CHECKING:
+    from reactor import Reactor
+
 module_name = __name__.split(".")[0]
 
 root_logger = logging.getLogger(module_name)
@@ -16,8 +21,8 @@ class Console(Protocol):
     def respond_raw(self, msg: str) -> None: ...
 
 
-def setup_console_logger(console: Console) -> logging.Handler:
-    console_handler = GCodeConsoleHandler(console)
+def setup_console_logger(console: Console, reactor: Reactor) -> logging.Handler:
+    console_handler = GCodeConsoleHandler(console, reactor)
     console_handler.setFormatter(GCodeConsoleFormatter())
     console_handler.addFilter(GCodeConsoleFilter())
     root_logger.addHandler(console_handler)
@@ -54,16 +59,99 @@ class GCodeConsoleFilter(logging.Filter):
         return "klipper.mcu" not in record.name or record.levelno >= logging.WARNING
 
 
+FLUSH_INTERVAL = 0.25  # s
+MAX_LINES_PER_FLUSH = 20
+MAX_PENDING = 1000
+
+
 class GCodeConsoleHandler(logging.Handler):
-    def __init__(self, console: Console) -> None:
+    """Queues records and writes them to the console in batches from a reactor timer.
+
+    Formatting is deferred to the flush, so records dropped by the rate limit are never formatted.
+    Consecutive identical messages are coalesced into one line.
+    Warnings and errors flush immediately.
+    Records can come from any thread, the queue is only touched while holding the handler lock.
+    """
+
+    def __init__(self, console: Console, reactor: Reactor) -> None:
         self.console: Console = console
+        self._reactor = reactor
+        self._pending: deque[logging.LogRecord] = deque()
+        self._dropped = 0
+        self._scheduled = False
+        self._timer = reactor.register_timer(self._handle_timer, reactor.NEVER)
         super().__init__()
 
     @override
     def emit(self, record: logging.LogRecord) -> None:
+        if len(self._pending) >= MAX_PENDING:
+            _ = self._pending.popleft()
+            self._dropped += 1
+        self._pending.append(record)
+
+        on_reactor = threading.current_thread() is threading.main_thread()
+        if record.levelno >= logging.WARNING and on_reactor:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            if on_reactor:
+                self._schedule(self._reactor.monotonic())
+            else:
+                self._reactor.register_async_callback(self._schedule)
+
+    def _schedule(self, eventtime: float) -> None:
+        self._reactor.update_timer(self._timer, eventtime + FLUSH_INTERVAL)
+
+    def _handle_timer(self, eventtime: float) -> float:
+        self.acquire()
         try:
-            log_entry = self.format(record)
-            self.console.respond_raw(f"{log_entry}\n")
+            lines, record = self._take_lines(MAX_LINES_PER_FLUSH)
+            # Cleared under the lock, so records emitted from other threads meanwhile schedule a new flush
+            self._scheduled = more = bool(self._pending)
+        finally:
+            self.release()
+        self._respond(lines, record)
+        return eventtime + FLUSH_INTERVAL if more else self._reactor.NEVER
 
+    @override
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            lines, record = self._take_lines(None)
+        finally:
+            self.release()
+        self._respond(lines, record)
+
+    def _take_lines(self, max_lines: int | None) -> tuple[list[str], logging.LogRecord | None]:
+        lines: list[str] = []
+        record: logging.LogRecord | None = None
+        if self._dropped:
+            lines.append(f"!! {self._dropped} log messages dropped")
+            self._dropped = 0
+
+        while self._pending and (max_lines is None or len(lines) < max_lines):
+            record = self._pending.popleft()
+            repeats = 0
+            while self._pending and _same_message(self._pending[0], record):
+                _ = self._pending.popleft()
+                repeats += 1
+            try:
+                line = self.format(record)
+            except Exception:
+                self.handleError(record)
+                continue
+            lines.append(f"{line} (repeated {repeats} more times)" if repeats else line)
+        return lines, record
+
+    def _respond(self, lines: list[str], record: logging.LogRecord | None) -> None:
+        if not lines:
+            return
+        try:
+            self.console.respond_raw("\n".join(lines) + "\n")
         except Exception:
-            self.handleError(record)
+            if record is not None:
+                self.handleError(record)
+
+
+def _same_message(a: logging.LogRecord, b: logging.LogRecord) -> bool:
+    return a.msg == b.msg and a.args == b.args and a.levelno == b.levelno
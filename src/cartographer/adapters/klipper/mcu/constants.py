@@ -4,11 +4,13 @@ import logging
 import struct
 from typing import TYPE_CHECKING, TypedDict, final
 
-from extras.thermistor import Thermistor
+from cartographer.lib.sensor_constants import SensorConstants
 
 if TYPE_CHECKING:
     from mcu import MCU, CommandQueryWrapper
 
+    from cartographer.lib.stream_recording import StreamRecorder
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,9 +28,7 @@ UINT16_MAX = 0xFFFF
 
 @final
 class KlipperCartographerConstants:
-    _sensor_frequency: float = 1
-    _inverse_adc_max: float = 0.0
-    _adc_smooth_count: int = 1
+    _sensor: SensorConstants = SensorConstants(sensor_frequency=1, inverse_adc_max=0.0, adc_smooth_count=1)
 
     minimum_adc_count: int = 0
     minimum_count: int = 0
@@ -38,14 +38,13 @@ class KlipperCartographerConstants:
         self._command_queue = self._mcu.alloc_command_queue()
         self._mcu.register_config_callback(self._initialize_constants)
 
-        self.thermistor = Thermistor(10000.0, 0.0)
-        self.thermistor.setup_coefficients_beta(25.0, 47000.0, 4041.0)
-
     def _initialize_constants(self):
         constants = self._mcu.get_constants()
-        self._sensor_frequency = self._clock_to_sensor_frequency(float(constants["CLOCK_FREQ"]))
-        self._inverse_adc_max = 1.0 / int(constants["ADC_MAX"])
-        self._adc_smooth_count = int(constants["CARTOGRAPHER_ADC_SMOOTH_COUNT"])
+        self._sensor = SensorConstants(
+            sensor_frequency=self._clock_to_sensor_frequency(float(constants["CLOCK_FREQ"])),
+            inverse_adc_max=1.0 / int(constants["ADC_MAX"]),
+            adc_smooth_count=int(constants["CARTOGRAPHER_ADC_SMOOTH_COUNT"]),
+        )
         logger.debug("Received constants: %s", constants)
 
         base_read_command = self._mcu.lookup_query_command(
@@ -80,11 +79,14 @@ class KlipperCartographerConstants:
         return clock_frequency / 6
 
     def count_to_frequency(self, count: int) -> float:
-        return count * self._sensor_frequency / (2**28)
+        return self._sensor.count_to_frequency(count)
 
     def frequency_to_count(self, frequency: float) -> int:
-        return int(frequency * (2**28) / self._sensor_frequency)
+        return self._sensor.frequency_to_count(frequency)
 
     def calculate_temperature(self, raw_temp: int) -> float:
-        temp_adc = raw_temp / self._adc_smooth_count * self._inverse_adc_max
-        return self.thermistor.calc_temp(temp_adc)
+        return self._sensor.calculate_temperature(raw_temp)
+
+    def record_to(self, recorder: StreamRecorder) -> None:
+        sensor = self._sensor
+        recorder.record_constants(sensor.sensor_frequency, sensor.inverse_adc_max, sensor.adc_smooth_count)
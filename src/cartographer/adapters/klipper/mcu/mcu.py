@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from time import perf_counter
 from typing import TYPE_CHECKING, Callable, TypedDict, final
 
 import mcu
@@ -22,26 +23,28 @@ from cartographer.adapters.klipper.mcu.constants import (
 )
 from cartographer.adapters.klipper.mcu.stream import KlipperStream, KlipperStreamMcu
 from cartographer.interfaces.printer import Mcu, Position, Sample
+from cartographer.lib.stream_recording import StreamRecorder, SupportsStreamRecording, convert_sample
+from cartographer.lib.stream_stats import StreamStats, SupportsStreamStats
 
 if TYPE_CHECKING:
     from configfile import ConfigWrapper
     from reactor import ReactorCompletion
 
+    from cartographer.lib.flight_recorder import FlightRecorder
     from cartographer.stream import Session
 
 logger = logging.getLogger(__name__)
 
 
-class _RawData(TypedDict):
-    clock: int
-    data: int
-    temp: int
+# Klipper adds the host time the message arrived at
+_RawData = TypedDict("_RawData", {"clock": int, "data": int, "temp": int, "#receive_time": float})
 
 
 @final
-class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
+class KlipperCartographerMcu(Mcu, KlipperStreamMcu, SupportsStreamRecording, SupportsStreamStats):
     _constants: KlipperCartographerConstants | None = None
     _commands: KlipperCartographerCommands | None = None
+    _recorder: StreamRecorder | None = None
 
     @property
     def constants(self) -> KlipperCartographerConstants:
@@ -60,11 +63,17 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
     def __init__(
         self,
         config: ConfigWrapper,
+        flight_recorder: FlightRecorder,
         smoothing_fn: Callable[[Sample], Sample] | None = None,
+        sample_latency: float = 0.0,
     ):
+        self.sample_latency = sample_latency
+        self.flight_recorder = flight_recorder
+        self.stream_stats = StreamStats()
         self.printer = config.get_printer()
+        self.reactor = self.printer.get_reactor()
         self.klipper_mcu = mcu.get_printer_mcu(self.printer, config.get("mcu"))
-        self._stream = KlipperStream[Sample](self, self.klipper_mcu.get_printer().get_reactor(), smoothing_fn)
+        self._stream = KlipperStream[Sample](self, self.reactor, smoothing_fn)
         self.dispatch = KlipperTriggerDispatch(self.klipper_mcu)
 
         self.motion_report = self.printer.load_object(config, "motion_report")
@@ -82,6 +91,7 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
     @override
     def start_homing_scan(self, print_time: float, frequency: float) -> ReactorCompletion:
         self._set_threshold(frequency)
+        self.record_event(f"Scan homing started at print time {print_time:.3f}, trigger frequency {frequency:.1f}")
         completion = self.dispatch.start(print_time)
 
         self.commands.send_home(
@@ -97,6 +107,7 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
 
     @override
     def start_homing_touch(self, print_time: float, threshold: int) -> ReactorCompletion:
+        self.record_event(f"Touch homing started at print time {print_time:.3f}, threshold {threshold}")
         completion = self.dispatch.start(print_time)
 
         self.commands.send_home(
@@ -115,8 +126,10 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
         self.dispatch.wait_end(home_end_time)
         self.commands.send_stop_home()
         result = self.dispatch.stop()
+        self.record_event(f"Homing stopped with reason {result}")
         if result >= MCU_trsync.REASON_COMMS_TIMEOUT:
             msg = "Communication timeout during homing"
+            _ = self.flight_recorder.dump(msg)
             raise RuntimeError(msg)
         if result != MCU_trsync.REASON_ENDSTOP_HIT:
             return 0.0
@@ -128,17 +141,50 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
     def start_session(self, start_condition: Callable[[Sample], bool] | None = None) -> Session[Sample]:
         return self._stream.start_session(start_condition)
 
+    @override
+    def set_sample_latency(self, latency: float) -> None:
+        self.sample_latency = latency
+
+    @override
+    def start_recording(self, path: str, max_bytes: int) -> StreamRecorder:
+        _ = self.stop_recording()
+        recorder = StreamRecorder(path, max_bytes)
+        self.constants.record_to(recorder)
+        self._recorder = recorder
+        return recorder
+
+    @override
+    def stop_recording(self) -> StreamRecorder | None:
+        recorder = self._recorder
+        if recorder is None:
+            return None
+        recorder.close()
+        self._recorder = None
+        return recorder
+
+    @override
+    def get_stream_stats(self) -> StreamStats:
+        return self.stream_stats
+
     def register_callback(self, callback: Callable[[Sample], None]) -> None:
         return self._stream.register_callback(callback)
 
     @override
     def start_streaming(self) -> None:
+        self.record_event("Streaming started")
+        self.stream_stats.restart()
         self.commands.send_stream_state(enable=True)
 
     @override
     def stop_streaming(self) -> None:
+        self.record_event("Streaming stopped")
         self.commands.send_stream_state(enable=False)
 
+    def record_event(self, message: str) -> None:
+        """Note an event in the flight recorder, in print time like the samples."""
+        print_time = self.klipper_mcu.estimated_print_time(self.reactor.monotonic())
+        self.flight_recorder.record_event(print_time, message)
+
     def _set_threshold(self, trigger_frequency: float) -> None:
         trigger = self.constants.frequency_to_count(trigger_frequency)
         untrigger = self.constants.frequency_to_count(trigger_frequency * (1 - TRIGGER_HYSTERESIS))
@@ -156,19 +202,27 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
 
     def _handle_shutdown(self) -> None:
         self.stop_streaming()
+        _ = self.stop_recording()
+        _ = self.flight_recorder.dump("Klippy shutdown")
 
     def _handle_data(self, data: _RawData) -> None:
+        handler_start = perf_counter()
         self._validate_data(data)
         clock = self.klipper_mcu.clock32_to_clock64(data["clock"])
         time = self.klipper_mcu.clock_to_print_time(clock)
 
-        frequency = self.constants.count_to_frequency(data["data"])
-        temperature = self.constants.calculate_temperature(data["temp"])
-        position, velocity = self.get_requested_position(time)
+        # The sensor reading lags the toolhead, so look up where it was when the reading was taken
+        position, velocity = self.get_requested_position(time - self.sample_latency)
+        if self._recorder is not None:
+            self._recorder.record_data(data["clock"], data["data"], data["temp"], time, position, velocity)
+        self.flight_recorder.record_sample(time, data["clock"], data["data"], data["temp"], position, velocity)
 
-        sample = Sample(time=time, frequency=frequency, temperature=temperature, position=position, velocity=velocity)
+        sample = convert_sample(self.constants, time, data["data"], data["temp"], position, velocity)
         self._stream.add_item(sample)
 
+        receive_time = self.klipper_mcu.estimated_print_time(data["#receive_time"])
+        self.stream_stats.record(time, receive_time, perf_counter() - handler_start)
+
     _data_error: str | None = None
 
     def _validate_data(self, data: _RawData) -> None:
@@ -186,9 +240,14 @@ class KlipperCartographerMcu(Mcu, KlipperStreamMcu):
         if error is None:
             return
 
-        logger.error(error, {"data": data})
+        message = error % {"data": count}
+        logger.error(message)
+        self.record_event(message)
         if len(self._stream.sessions) > 0:
-            self.klipper_mcu.get_printer().invoke_shutdown(error % {"data": data})
+            # The shutdown handler dumps the flight record
+            self.klipper_mcu.get_printer().invoke_shutdown(message)
+        else:
+            _ = self.flight_recorder.dump(message)
 
     def get_requested_position(self, time: float) -> tuple[Position | None, float | None]:
         trapq = self.motion_report.trapqs.get("toolhead")
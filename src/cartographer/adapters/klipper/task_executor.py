@@ -1,21 +1,26 @@
 from __future__ import annotations
 
 import multiprocessing
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Callable, TypeVar, final
 
 from typing_extensions import ParamSpec, override
 
-from cartographer.interfaces.multiprocessing import TaskExecutor
+from cartographer.interfaces.multiprocessing import SupportsTaskRouting, TaskExecutor
 
 if TYPE_CHECKING:
     from multiprocessing.connection import Connection
 
     from reactor import Reactor
 
+    from cartographer.interfaces.multiprocessing import ExecutorKind, TaskType
+
 P = ParamSpec("P")
 R = TypeVar("R")
 
 WAIT_TIME = 0.1
+MAX_WORKERS = 4
 
 
 @final
@@ -49,3 +54,70 @@ class KlipperMultiprocessingExecutor(TaskExecutor):
         if is_err:
             raise payload from None  # Raise the original exception
         return payload
+
+
+@final
+class KlipperThreadExecutor(TaskExecutor):
+    """Runs tasks on a persistent thread pool while the calling greenlet waits.
+
+    Suited to NumPy work that releases the GIL, there is no fork or pickling.
+    The worker wakes the greenlet through the reactor's thread-safe async callback.
+    """
+
+    def __init__(self, reactor: Reactor, max_workers: int | None = None) -> None:
+        self._reactor = reactor
+        self._max_workers = max_workers or min(MAX_WORKERS, os.cpu_count() or 1)
+        self._pool: ThreadPoolExecutor | None = None
+
+    @override
+    def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="cartographer")
+
+        completion = self._reactor.completion()
+
+        def wake(_: Future[R]) -> None:
+            self._reactor.register_async_callback(lambda _: completion.complete(None))
+
+        future = self._pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(wake)
+        _ = completion.wait()
+        return future.result()  # Raises the original exception
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+@final
+class KlipperInlineExecutor(TaskExecutor):
+    """Runs tasks directly on the reactor, blocking it until they finish."""
+
+    @override
+    def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        return fn(*args, **kwargs)
+
+
+@final
+class KlipperTaskExecutor(TaskExecutor, SupportsTaskRouting):
+    """Picks the configured executor per task type, untyped tasks run in a process."""
+
+    def __init__(self, reactor: Reactor, kinds: dict[TaskType, ExecutorKind]) -> None:
+        self._kinds = kinds
+        self.thread = KlipperThreadExecutor(reactor)
+        self.process = KlipperMultiprocessingExecutor(reactor)
+        self.inline = KlipperInlineExecutor()
+
+    @override
+    def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        return self.process.run(fn, *args, **kwargs)
+
+    @override
+    def for_task(self, task: TaskType) -> TaskExecutor:
+        kind = self._kinds.get(task, "process")
+        if kind == "thread":
+            return self.thread
+        if kind == "inline":
+            return self.inline
+        return self.process
@@ -94,6 +94,11 @@ class KlipperToolhead(Toolhead):
         status = self.toolhead.get_status(time)
         return status["axis_minimum"][2], status["axis_maximum"][2]
 
+    @override
+    def get_max_velocity(self) -> float:
+        time = self.toolhead.get_last_move_time()
+        return self.toolhead.get_status(time)["max_velocity"]
+
     @override
     def manual_probe(self, finalize_callback: Callable[[Position | None], None]) -> None:
         gcode = self.printer.lookup_object("gcode")
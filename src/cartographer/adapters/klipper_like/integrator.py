@@ -46,9 +46,11 @@ class KlipperLikeIntegrator(Integrator, ABC):
         self._toolhead: KlipperToolhead = adapters.toolhead
 
         self._gcode: GCodeDispatch = self._printer.lookup_object("gcode")
+        self._console_handler: logging.Handler | None = None
 
     @override
     def setup(self) -> None:
+        self._printer.register_event_handler("homing:home_rails_begin", self._handle_home_rails_begin)
         self._printer.register_event_handler("homing:home_rails_end", self._handle_home_rails_end)
         self._configure_macro_logger()
 
@@ -69,7 +71,14 @@ class KlipperLikeIntegrator(Integrator, ABC):
             else:
                 logger.warning("No original macro found to fallback to for '%s'", name)
 
-        self._gcode.register_command(name, _catch_macro_errors(macro.run), desc=macro.description)
+        self._gcode.register_command(
+            name,
+            _catch_macro_errors(
+                _record_macro(name, macro.run, self._mcu.record_event),
+                self._flush_console,
+            ),
+            desc=macro.description,
+        )
 
     @override
     def register_temperature_sensor_factories(self) -> None:
@@ -77,9 +86,18 @@ class KlipperLikeIntegrator(Integrator, ABC):
             "cartographer_coil", PrinterTemperatureCoil
         )
 
+    @reraise_as(CommandError)
+    def _handle_home_rails_begin(self, homing: Homing, rails: list[PrinterRail]) -> None:
+        homing_state = KlipperHomingState(homing, rails)
+        klipper_endstops = [
+            es.endstop for rail in rails for es, _ in rail.get_endstops() if isinstance(es, KlipperEndstop)
+        ]
+        for endstop in klipper_endstops:
+            endstop.on_home_begin(homing_state)
+
     @reraise_as(CommandError)
     def _handle_home_rails_end(self, homing: Homing, rails: list[PrinterRail]) -> None:
-        homing_state = KlipperHomingState(homing)
+        homing_state = KlipperHomingState(homing, rails)
         klipper_endstops = [
             es.endstop for rail in rails for es, _ in rail.get_endstops() if isinstance(es, KlipperEndstop)
         ]
@@ -87,12 +105,19 @@ class KlipperLikeIntegrator(Integrator, ABC):
             endstop.on_home_end(homing_state)
 
     def _configure_macro_logger(self) -> None:
-        handler = setup_console_logger(self._gcode)
+        handler = setup_console_logger(self._gcode, self._printer.get_reactor())
         log_level = logging.DEBUG if self._config.general.verbose else logging.INFO
         handler.setLevel(log_level)
+        self._console_handler = handler
 
+    def _flush_console(self) -> None:
+        if self._console_handler is not None:
+            self._console_handler.flush()
 
-def _catch_macro_errors(func: Callable[[GCodeCommand], None]) -> Callable[[GCodeCommand], None]:
+
+def _catch_macro_errors(
+    func: Callable[[GCodeCommand], None], flush_console: Callable[[], None]
+) -> Callable[[GCodeCommand], None]:
     @wraps(func)
     def wrapper(gcmd: GCodeCommand) -> None:
         try:
@@ -100,6 +125,27 @@ def _catch_macro_errors(func: Callable[[GCodeCommand], None]) -> Callable[[GCode
         except (RuntimeError, ValueError) as e:
             msg = dedent(str(e)).replace("\n", " ").replace("  ", "\n").strip()
             raise gcmd.error(msg) from e
+        finally:
+            # Output queued by the macro goes out before its completion or error
+            flush_console()
+
+    return wrapper
+
+
+def _record_macro(
+    name: str, func: Callable[[GCodeCommand], None], record_event: Callable[[str], None]
+) -> Callable[[GCodeCommand], None]:
+    """Note the macro in the flight recorder, next to the samples it was running with."""
+
+    @wraps(func)
+    def wrapper(gcmd: GCodeCommand) -> None:
+        record_event(f"{name} started")
+        try:
+            func(gcmd)
+        except Exception as e:
+            record_event(f"{name} failed: {e}")
+            raise
+        record_event(f"{name} finished")
 
     return wrapper
 
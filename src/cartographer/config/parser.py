@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable, Literal, Protocol, TypeVar
+from typing import TYPE_CHECKING, Iterable, Literal, Protocol, TypeVar
 
 from cartographer.interfaces.configuration import (
     BedMeshConfig,
@@ -11,6 +11,9 @@ from cartographer.interfaces.configuration import (
     TouchModelConfiguration,
 )
 
+if TYPE_CHECKING:
+    from cartographer.interfaces.multiprocessing import ExecutorKind
+
 K = TypeVar("K", bound=str)
 
 
@@ -36,7 +39,7 @@ class ParseConfigWrapper(Protocol):
     ) -> float: ...
     def get_required_float(self, option: str) -> float: ...
     def get_required_float_list(self, option: str, count: int | None = None) -> list[float]: ...
-    def get_int(self, option: str, default: int) -> int: ...
+    def get_int(self, option: str, default: int, minimum: int | None = None) -> int: ...
     def get_required_int_list(self, option: str, count: int | None = None) -> list[int]: ...
     def get_bool(self, option: str, default: bool) -> bool: ...
 
@@ -51,6 +54,9 @@ def list_to_tuple(lst: list[T]) -> tuple[T, T]:
     return (lst[0], lst[1])
 
 
+_executors: list[ExecutorKind] = ["inline", "thread", "process"]
+
+
 def parse_general_config(wrapper: ParseConfigWrapper) -> GeneralConfig:
     return GeneralConfig(
         x_offset=wrapper.get_required_float("x_offset"),
@@ -59,6 +65,8 @@ def parse_general_config(wrapper: ParseConfigWrapper) -> GeneralConfig:
         travel_speed=wrapper.get_float("travel_speed", default=50, minimum=1),
         macro_prefix=wrapper.get_optional_str("macro_prefix"),
         verbose=wrapper.get_bool("verbose", default=False),
+        mesh_executor=get_choice(wrapper, "mesh_executor", _executors, default="process"),
+        convergence_executor=get_choice(wrapper, "convergence_executor", _executors, default="process"),
     )
 
 
@@ -81,6 +89,10 @@ def parse_scan_config(wrapper: ParseConfigWrapper, models: dict[str, ScanModelCo
         mesh_height=wrapper.get_float("mesh_height", default=4, minimum=1),
         mesh_path=get_choice(wrapper, "mesh_path", _paths, default="snake"),
         mesh_corner_radius=wrapper.get_float("mesh_corner_radius", default=2, minimum=0),
+        mesh_min_samples=wrapper.get_int("mesh_min_samples", default=5, minimum=1),
+        mesh_direction_correction=wrapper.get_bool("mesh_direction_correction", default=False),
+        sample_latency=wrapper.get_float("sample_latency", default=0, minimum=-0.1, maximum=0.1),
+        homing_approach_height=wrapper.get_float("homing_approach_height", default=0, minimum=0, maximum=10),
     )
 
 
@@ -89,6 +101,7 @@ def parse_touch_config(wrapper: ParseConfigWrapper, models: dict[str, TouchModel
     return TouchConfig(
         samples=samples,
         max_samples=wrapper.get_int("max_samples", default=samples * 2),
+        approach_clearance=wrapper.get_float("approach_clearance", default=0, minimum=0, maximum=2),
         models=models,
     )
 
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from itertools import chain
 from typing import TYPE_CHECKING, final
 
+from cartographer.lib.stream_recording import SupportsStreamRecording
+from cartographer.lib.stream_stats import SupportsStreamStats
+from cartographer.lib.tracing import tracer
 from cartographer.macros.axis_twist_compensation import AxisTwistCompensationMacro
 from cartographer.macros.backlash import EstimateBacklashMacro
+from cartographer.macros.bed_mesh.mesh_quality import MeshQualityMacro
 from cartographer.macros.bed_mesh.scan_mesh import BedMeshCalibrateConfiguration, BedMeshCalibrateMacro
+from cartographer.macros.latency_calibrate import LatencyCalibrateMacro
 from cartographer.macros.probe import ProbeAccuracyMacro, ProbeMacro, QueryProbeMacro, ZOffsetApplyProbeMacro
 from cartographer.macros.scan_calibrate import DEFAULT_SCAN_MODEL_NAME, ScanCalibrateMacro
-from cartographer.macros.touch import TouchAccuracyMacro, TouchHomeMacro, TouchMacro
+from cartographer.macros.stream_record import StreamRecordMacro
+from cartographer.macros.stream_stats import StreamStatsMacro
+from cartographer.macros.touch import TouchAccuracyMacro, TouchHomeMacro, TouchMacro, TouchPointsMacro
 from cartographer.macros.touch_calibrate import DEFAULT_TOUCH_MODEL_NAME, TouchCalibrateMacro
+from cartographer.macros.touch_calibrate_checkpoint import CHECKPOINT_FILENAME
+from cartographer.macros.trace import TraceExportMacro
 from cartographer.probe.probe import Probe
 from cartographer.probe.scan_mode import ScanMode, ScanModeConfiguration
 from cartographer.probe.touch_mode import TouchMode, TouchModeConfiguration
@@ -49,7 +59,12 @@ class PrinterCartographer:
         if DEFAULT_SCAN_MODEL_NAME in adapters.config.scan.models:
             self.scan_mode.load_model(DEFAULT_SCAN_MODEL_NAME)
 
-        self.touch_mode = TouchMode(self.mcu, toolhead, TouchModeConfiguration.from_config(config))
+        self.touch_mode = TouchMode(
+            self.mcu,
+            toolhead,
+            TouchModeConfiguration.from_config(config),
+            scan=self.scan_mode,
+        )
         if DEFAULT_TOUCH_MODEL_NAME in adapters.config.touch.models:
             self.touch_mode.load_model(DEFAULT_TOUCH_MODEL_NAME)
 
@@ -70,28 +85,42 @@ class PrinterCartographer:
 
         self.probe_macro = ProbeMacro(probe)
         self.query_probe_macro = QueryProbeMacro(probe)
+        self.bed_mesh_macro = BedMeshCalibrateMacro(
+            probe,
+            toolhead,
+            adapters.bed_mesh,
+            adapters.task_executor,
+            BedMeshCalibrateConfiguration.from_config(config),
+        )
         self.macros = list(
             chain.from_iterable(
                 [
                     reg("PROBE", self.probe_macro, use_prefix=False),
-                    reg("PROBE_ACCURACY", ProbeAccuracyMacro(probe, toolhead), use_prefix=False),
+                    reg(
+                        "PROBE_ACCURACY",
+                        ProbeAccuracyMacro(probe, toolhead, stream_window=config.scan.samples),
+                        use_prefix=False,
+                    ),
                     reg("QUERY_PROBE", self.query_probe_macro, use_prefix=False),
                     reg("Z_OFFSET_APPLY_PROBE", ZOffsetApplyProbeMacro(probe, toolhead, config), use_prefix=False),
+                    reg("BED_MESH_CALIBRATE", self.bed_mesh_macro, use_prefix=False),
+                    reg("MESH_QUALITY", MeshQualityMacro(self.bed_mesh_macro, config.scan.mesh_min_samples)),
+                    reg("SCAN_CALIBRATE", ScanCalibrateMacro(probe, toolhead, config)),
+                    reg("ESTIMATE_BACKLASH", EstimateBacklashMacro(toolhead, self.scan_mode, config)),
+                    reg("LATENCY_CALIBRATE", LatencyCalibrateMacro(self.mcu, self.scan_mode, toolhead, config)),
                     reg(
-                        "BED_MESH_CALIBRATE",
-                        BedMeshCalibrateMacro(
+                        "TOUCH_CALIBRATE",
+                        TouchCalibrateMacro(
                             probe,
+                            self.mcu,
                             toolhead,
-                            adapters.bed_mesh,
-                            adapters.task_executor,
-                            BedMeshCalibrateConfiguration.from_config(config),
+                            config,
+                            checkpoint_path=os.path.join(adapters.state_dir, CHECKPOINT_FILENAME),
                         ),
-                        use_prefix=False,
                     ),
-                    reg("SCAN_CALIBRATE", ScanCalibrateMacro(probe, toolhead, config)),
-                    reg("ESTIMATE_BACKLASH", EstimateBacklashMacro(toolhead, self.scan_mode, config)),
-                    reg("TOUCH_CALIBRATE", TouchCalibrateMacro(probe, self.mcu, toolhead, config)),
+                    reg("TRACE_EXPORT", TraceExportMacro(tracer, adapters.state_dir)),
                     reg("TOUCH", TouchMacro(self.touch_mode)),
+                    reg("TOUCH_POINTS", TouchPointsMacro(self.touch_mode)),
                     reg("TOUCH_ACCURACY", TouchAccuracyMacro(self.touch_mode, toolhead)),
                     reg(
                         "TOUCH_HOME", TouchHomeMacro(self.touch_mode, toolhead, config.bed_mesh.zero_reference_position)
@@ -100,6 +129,11 @@ class PrinterCartographer:
             )
         )
 
+        if isinstance(self.mcu, SupportsStreamRecording):
+            self.macros.extend(reg("STREAM_RECORD", StreamRecordMacro(self.mcu, adapters.state_dir)))
+        if isinstance(self.mcu, SupportsStreamStats):
+            self.macros.extend(reg("STREAM_STATS", StreamStatsMacro(self.mcu.get_stream_stats())))
+
         if adapters.axis_twist_compensation:
             self.macros.extend(
                 reg(
@@ -110,7 +144,11 @@ class PrinterCartographer:
             )
 
     def get_status(self, eventtime: float) -> object:
-        return {
+        status: dict[str, object] = {
             "scan": self.scan_mode.get_status(eventtime),
             "touch": self.touch_mode.get_status(eventtime),
+            "mesh_quality": self.bed_mesh_macro.get_status(eventtime),
         }
+        if isinstance(self.mcu, SupportsStreamStats):
+            status["stream"] = self.mcu.get_stream_stats().get_status()
+        return status
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal, Protocol
+from typing import TYPE_CHECKING, Literal, Protocol
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.multiprocessing import ExecutorKind
 
 
 @dataclass(frozen=True)
@@ -12,6 +15,8 @@ class GeneralConfig:
     travel_speed: float
     verbose: bool
     macro_prefix: str | None
+    mesh_executor: ExecutorKind
+    convergence_executor: ExecutorKind
 
 
 @dataclass(frozen=True)
@@ -22,6 +27,10 @@ class ScanConfig:
     mesh_runs: int
     mesh_height: float
     mesh_corner_radius: float
+    mesh_min_samples: int
+    mesh_direction_correction: bool
+    sample_latency: float
+    homing_approach_height: float
     mesh_direction: Literal["x", "y"]
     mesh_path: Literal["snake", "alternating_snake", "spiral", "random"]
 
@@ -30,6 +39,7 @@ class ScanConfig:
 class TouchConfig:
     samples: int
     max_samples: int
+    approach_clearance: float
     models: dict[str, TouchModelConfiguration]
 
 
@@ -69,3 +79,4 @@ class Configuration(Protocol):
     def save_scan_model(self, config: ScanModelConfiguration) -> None: ...
     def save_touch_model(self, config: TouchModelConfiguration) -> None: ...
     def save_z_backlash(self, backlash: float) -> None: ...
+    def save_sample_latency(self, latency: float) -> None: ...
@@ -1,10 +1,27 @@
-from typing import Callable, Protocol, TypeVar
+from typing import Callable, Literal, Protocol, TypeVar, runtime_checkable
 
-from typing_extensions import ParamSpec
+from typing_extensions import ParamSpec, TypeAlias
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
 
+TaskType: TypeAlias = Literal["mesh", "convergence"]
+ExecutorKind: TypeAlias = Literal["inline", "thread", "process"]
+
+
 class TaskExecutor(Protocol):
     def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R: ...
+
+
+@runtime_checkable
+class SupportsTaskRouting(Protocol):
+    def for_task(self, task: TaskType) -> TaskExecutor:
+        """The executor configured for this type of task."""
+        ...
+
+
+def executor_for(executor: TaskExecutor, task: TaskType) -> TaskExecutor:
+    if isinstance(executor, SupportsTaskRouting):
+        return executor.for_task(task)
+    return executor
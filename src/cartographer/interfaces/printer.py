@@ -28,7 +28,15 @@ class HomingState(Protocol):
         ...
 
     def set_z_homed_position(self, position: float) -> None:
-        """Set the homed position for the z axis."""
+        """Set the homed position for the z axis, where the toolhead halted."""
+        ...
+
+    def get_z_overshoot(self) -> float:
+        """How far the z axis travelled past the point where the endstop triggered."""
+        ...
+
+    def get_z_retract_distance(self) -> float:
+        """How far z retracts before its second, slower homing move, 0 when there is none."""
         ...
 
 
@@ -47,6 +55,10 @@ class Endstop(Protocol):
         """Wait for homing to complete"""
         ...
 
+    def on_home_begin(self, homing_state: HomingState) -> None:
+        """To be called before the rails start homing"""
+        ...
+
     def on_home_end(self, homing_state: HomingState) -> None:
         """To be called when the homing process is complete"""
         ...
@@ -70,6 +82,7 @@ class Mcu(Protocol):
     def start_homing_touch(self, print_time: float, threshold: int) -> object: ...
     def stop_homing(self, home_end_time: float) -> float: ...
     def start_session(self, start_condition: Callable[[Sample], bool] | None = None) -> Session[Sample]: ...
+    def set_sample_latency(self, latency: float) -> None: ...
 
 
 class MacroParams(Protocol):
@@ -157,6 +170,10 @@ class Toolhead(Protocol):
         """Get the limits of the z axis."""
         ...
 
+    def get_max_velocity(self) -> float:
+        """Get the maximum velocity of the toolhead."""
+        ...
+
     def manual_probe(self, finalize_callback: Callable[[Position | None], None]) -> None:
         """Start a manual probe."""
         ...
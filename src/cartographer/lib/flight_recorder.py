@@ -0,0 +1,216 @@
+"""Always-on ring buffers of the most recent samples and events, dumped when something fails.
+
+Samples are written into preallocated arrays, so recording costs the same
+handful of stores no matter how long the printer has been running.
+
+A dump is a binary file:
+
+    header:  magic (4s) | version (H) | sample count (I) | event count (I) | reason length (H) | reason
+    samples: count x (time, clock, data, temp, x, y, z, velocity) as doubles, oldest first
+    events:  count x (time (d) | message length (H) | message), oldest first
+
+Event times are print times like the sample times, so both line up in a dump.
+Only the newest MAX_DUMPS dumps are kept in the dump directory.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import struct
+import time
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, final
+
+from cartographer.interfaces.printer import Position
+
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CRFR"
+VERSION = 1
+SAMPLE_CAPACITY = 4096  # About 8 seconds of data at the sensor's rate
+EVENT_CAPACITY = 256
+MAX_MESSAGE_LENGTH = 256
+DUMP_DIRECTORY = "cartographer_flight_records"
+MAX_DUMPS = 10
+
+_HEADER = struct.Struct("<4sHIIH")
+_EVENT = struct.Struct("<dH")
+_SAMPLE_FIELDS = 8
+
+
+@dataclass(frozen=True)
+class FlightSample:
+    time: float
+    clock: int
+    data: int
+    temp: int
+    position: Position | None
+    velocity: float | None
+
+
+@dataclass(frozen=True)
+class FlightEvent:
+    time: float
+    message: str
+
+
+@dataclass(frozen=True)
+class FlightRecord:
+    reason: str
+    samples: list[FlightSample]
+    events: list[FlightEvent]
+
+
+@final
+class FlightRecorder:
+    """Keeps the last raw readings and events in memory, to be dumped to directory on failure."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_capacity: int = SAMPLE_CAPACITY,
+        event_capacity: int = EVENT_CAPACITY,
+        max_dumps: int = MAX_DUMPS,
+    ) -> None:
+        self.directory = directory
+        self.max_dumps = max_dumps
+        self._samples = array("d", bytes(8 * _SAMPLE_FIELDS * sample_capacity))
+        self._sample_capacity = sample_capacity
+        self._sample_count = 0
+        self._event_times = array("d", bytes(8 * event_capacity))
+        self._event_messages: list[str] = [""] * event_capacity
+        self._event_capacity = event_capacity
+        self._event_count = 0
+
+    def record_sample(
+        self,
+        time: float,
+        clock: int,
+        data: int,
+        temp: int,
+        position: Position | None,
+        velocity: float | None,
+    ) -> None:
+        samples = self._samples
+        i = (self._sample_count % self._sample_capacity) * _SAMPLE_FIELDS
+        samples[i] = time
+        samples[i + 1] = clock
+        samples[i + 2] = data
+        samples[i + 3] = temp
+        if position is None:
+            samples[i + 4] = samples[i + 5] = samples[i + 6] = math.nan
+        else:
+            samples[i + 4] = position.x
+            samples[i + 5] = position.y
+            samples[i + 6] = position.z
+        samples[i + 7] = math.nan if velocity is None else velocity
+        self._sample_count += 1
+
+    def record_event(self, time: float, message: str) -> None:
+        i = self._event_count % self._event_capacity
+        self._event_times[i] = time
+        self._event_messages[i] = message
+        self._event_count += 1
+
+    def dump(self, reason: str) -> str | None:
+        """Write the buffers to a new file, returning its path.
+
+        Dumps happen while something else already went wrong,
+        so failing to write one is logged rather than raised.
+        """
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"cartographer_flight_{stamp}.bin")
+        # A data error shutting down klippy can follow a failed homing move within the same second
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"cartographer_flight_{stamp}_{suffix}.bin")
+            suffix += 1
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "wb") as f:
+                self._write(f, reason)
+            self._prune()
+        except OSError as e:
+            logger.error("Failed to write flight record to %s: %s", path, e)
+            return None
+        logger.info("Wrote flight record to %s", path)
+        return path
+
+    def _prune(self) -> None:
+        """Remove all but the newest dumps."""
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith("cartographer_flight_") and name.endswith(".bin")
+        ]
+        # Names can be reused once pruned within the same second, so order by modification time
+        paths.sort(key=os.path.getmtime)
+        for path in paths[: -self.max_dumps]:
+            os.remove(path)
+
+    def _write(self, f: BinaryIO, reason: str) -> None:
+        sample_count = min(self._sample_count, self._sample_capacity)
+        event_count = min(self._event_count, self._event_capacity)
+        encoded_reason = _encode(reason)
+        _ = f.write(_HEADER.pack(MAGIC, VERSION, sample_count, event_count, len(encoded_reason)))
+        _ = f.write(encoded_reason)
+
+        # Oldest first, the buffer wraps at the next write position
+        start = (self._sample_count - sample_count) % self._sample_capacity * _SAMPLE_FIELDS
+        end = sample_count * _SAMPLE_FIELDS + start
+        self._samples[start : min(end, len(self._samples))].tofile(f)
+        if end > len(self._samples):
+            self._samples[: end - len(self._samples)].tofile(f)
+
+        first = self._event_count - event_count
+        for n in range(first, self._event_count):
+            i = n % self._event_capacity
+            message = _encode(self._event_messages[i])
+            _ = f.write(_EVENT.pack(self._event_times[i], len(message)))
+            _ = f.write(message)
+
+
+def _encode(text: str) -> bytes:
+    return text.encode("utf-8", errors="replace")[:MAX_MESSAGE_LENGTH]
+
+
+def read_flight_record(path: str) -> FlightRecord:
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:4] != MAGIC:
+            msg = f"{path} is not a flight record"
+            raise RuntimeError(msg)
+        _, version, sample_count, event_count, reason_length = _HEADER.unpack(header)
+        if version != VERSION:
+            msg = f"Unsupported flight record version {version} in {path}"
+            raise RuntimeError(msg)
+        reason = f.read(reason_length).decode("utf-8", errors="replace")
+
+        values = array("d")
+        values.frombytes(f.read(8 * _SAMPLE_FIELDS * sample_count))
+        samples = [_to_sample(values[i : i + _SAMPLE_FIELDS]) for i in range(0, len(values), _SAMPLE_FIELDS)]
+
+        events: list[FlightEvent] = []
+        for _ in range(event_count):
+            event_time, length = _EVENT.unpack(f.read(_EVENT.size))
+            events.append(FlightEvent(event_time, f.read(length).decode("utf-8", errors="replace")))
+
+    return FlightRecord(reason, samples, events)
+
+
+def _to_sample(values: array[float]) -> FlightSample:
+    sample_time, clock, data, temp, x, y, z, velocity = values
+    return FlightSample(
+        time=sample_time,
+        clock=int(clock),
+        data=int(data),
+        temp=int(temp),
+        position=None if math.isnan(x) else Position(x, y, z),
+        velocity=None if math.isnan(velocity) else velocity,
+    )
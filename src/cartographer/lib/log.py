@@ -5,6 +5,8 @@ from typing import Callable, TypeVar
 
 from typing_extensions import ParamSpec
 
+from cartographer.lib.tracing import span
+
 P = ParamSpec("P")
 R = TypeVar("R")
 
@@ -15,7 +17,8 @@ def log_duration(message: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             start_time = time.time()
             try:
-                return func(*args, **kwargs)
+                with span(message):
+                    return func(*args, **kwargs)
             finally:
                 duration = time.time() - start_time
                 func_logger = logging.getLogger(func.__module__)
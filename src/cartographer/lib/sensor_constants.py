@@ -0,0 +1,37 @@
+"""Conversion of raw cartographer readings, shared by the live mcu and stream replays."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+# The coil thermistor, as set up in the mcu constants
+THERMISTOR_PULLUP = 10000.0
+THERMISTOR_T1 = 25.0
+THERMISTOR_R1 = 47000.0
+THERMISTOR_BETA = 4041.0
+KELVIN_TO_CELSIUS = -273.15
+
+COUNT_SCALE = 2**28
+
+
+@dataclass(frozen=True)
+class SensorConstants:
+    sensor_frequency: float
+    inverse_adc_max: float
+    adc_smooth_count: int
+
+    def count_to_frequency(self, count: int) -> float:
+        return count * self.sensor_frequency / COUNT_SCALE
+
+    def frequency_to_count(self, frequency: float) -> int:
+        return int(frequency * COUNT_SCALE / self.sensor_frequency)
+
+    def calculate_temperature(self, raw_temp: int) -> float:
+        adc = raw_temp / self.adc_smooth_count * self.inverse_adc_max
+        # Beta equation, matching Klipper's thermistor for the same coefficients
+        adc = max(0.00001, min(0.99999, adc))
+        resistance = THERMISTOR_PULLUP * adc / (1.0 - adc)
+        inv_t1 = 1.0 / (THERMISTOR_T1 - KELVIN_TO_CELSIUS)
+        inv_t = inv_t1 + (math.log(resistance) - math.log(THERMISTOR_R1)) / THERMISTOR_BETA
+        return 1.0 / inv_t + KELVIN_TO_CELSIUS
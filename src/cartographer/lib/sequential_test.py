@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import math
+from enum import Enum
+from typing import Callable, final
+
+from cartographer.lib.statistics import compute_mad
+
+# Relative standard error of the MAD of normal samples is about 1.166 / sqrt(n)
+MAD_RELATIVE_ERROR = 1.166
+DEFAULT_CONFIDENCE_Z = 1.2816  # One sided 90%
+# The error estimate above is asymptotic, with fewer samples a couple of equal
+# step-quantized values give a MAD of 0 no matter how far off the rest are.
+MIN_ACCEPT_SAMPLES = 5
+
+
+class Decision(Enum):
+    ACCEPT = "accept"
+    REJECT = "reject"
+    CONTINUE = "continue"
+
+
+@final
+class SequentialScoreTest:
+    """Decide after each sample whether a spread score is clearly within tolerance, clearly not, or undecided.
+
+    The score, MAD by default, gets a confidence interval in log space that narrows with every sample.
+    Once the interval lies entirely on one side of the tolerance no further samples can change the outcome.
+    Accepting needs at least `min_accept_samples`, rejecting only `min_samples`.
+    """
+
+    def __init__(
+        self,
+        tolerance: float,
+        *,
+        min_samples: int = 3,
+        min_accept_samples: int = MIN_ACCEPT_SAMPLES,
+        confidence_z: float = DEFAULT_CONFIDENCE_Z,
+        score: Callable[[list[float]], float] = compute_mad,
+    ) -> None:
+        if tolerance <= 0:
+            msg = "Tolerance must be positive"
+            raise ValueError(msg)
+        self.tolerance = tolerance
+        self.min_samples = max(2, min_samples)
+        self.min_accept_samples = max(self.min_samples, min_accept_samples)
+        self.confidence_z = confidence_z
+        self.score = score
+
+    def decide(self, samples: list[float]) -> Decision:
+        if len(samples) < self.min_samples:
+            return Decision.CONTINUE
+        return self.decide_score(self.score(samples), len(samples))
+
+    def decide_score(self, score: float, n: int) -> Decision:
+        """Decide from a score that is already known, e.g. kept up to date by a running estimator."""
+        if n < self.min_samples:
+            return Decision.CONTINUE
+
+        margin = math.exp(self.confidence_z * MAD_RELATIVE_ERROR / math.sqrt(n))
+        if score / margin > self.tolerance:
+            return Decision.REJECT
+        if n >= self.min_accept_samples and score * margin <= self.tolerance:
+            return Decision.ACCEPT
+        return Decision.CONTINUE
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, final
 
 import numpy as np
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
 
     from numpy.typing import NDArray
 
@@ -17,3 +18,98 @@ def compute_mad(samples: NDArray[np.float64] | Sequence[float]) -> float:
     median = np.median(samples)
     mad = np.median(np.abs(samples - median))
     return float(mad)
+
+
+@final
+class RunningMedianMAD:
+    """Median and median absolute deviation of a growing set of values.
+
+    Values are kept sorted, adding one is a binary search and an O(n) list insertion, the median is a lookup.
+    The MAD is found by a k-th element search over the deviations below and above the median,
+    which are both sorted already, in O(log n).
+    Like compute_mad and numpy, an empty estimator has an infinite MAD and a NaN median.
+    """
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self._values: list[float] = sorted(values)
+
+    def add(self, value: float) -> None:
+        insort(self._values, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def values(self) -> tuple[float, ...]:
+        """The values in ascending order."""
+        return tuple(self._values)
+
+    @property
+    def value_range(self) -> float:
+        if not self._values:
+            return 0.0
+        return self._values[-1] - self._values[0]
+
+    @property
+    def median(self) -> float:
+        values = self._values
+        n = len(values)
+        if n == 0:
+            return float("nan")
+        middle = n // 2
+        if n % 2 == 1:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+    @property
+    def mad(self) -> float:
+        n = len(self._values)
+        if n == 0:
+            return float("inf")
+        median = self.median
+        split = bisect_left(self._values, median)
+        middle = n // 2
+        if n % 2 == 1:
+            return self._kth_deviation(middle, median, split)
+        return (self._kth_deviation(middle - 1, median, split) + self._kth_deviation(middle, median, split)) / 2
+
+    def _kth_deviation(self, k: int, median: float, split: int) -> float:
+        values = self._values
+        below = split
+        above = len(values) - split
+
+        def lower(i: int) -> float:
+            return median - values[split - 1 - i]
+
+        def upper(i: int) -> float:
+            return values[split + i] - median
+
+        # Take i deviations from below the median and k + 1 - i from above
+        lo, hi = max(0, k + 1 - above), min(k + 1, below)
+        while lo <= hi:
+            i = (lo + hi) // 2
+            j = k + 1 - i
+            if i > 0 and j < above and lower(i - 1) > upper(j):
+                hi = i - 1
+            elif j > 0 and i < below and upper(j - 1) > lower(i):
+                lo = i + 1
+            else:
+                candidates = ([lower(i - 1)] if i > 0 else []) + ([upper(j - 1)] if j > 0 else [])
+                return max(candidates)
+
+        msg = "Deviation search did not converge"
+        raise RuntimeError(msg)
+
+
+def allan_deviation(values: NDArray[np.float64] | Sequence[float], sample_rate: float) -> list[tuple[float, float]]:
+    """Overlapping Allan deviation at averaging times of 1, 2, 4, ... samples, as (tau seconds, deviation)."""
+    x = np.asarray(values, dtype=float)
+    cumulative = np.concatenate(([0.0], np.cumsum(x)))
+    result: list[tuple[float, float]] = []
+    m = 1
+    while 2 * m < len(x):
+        means = (cumulative[m:] - cumulative[:-m]) / m
+        diffs = means[m:] - means[:-m]
+        result.append((m / sample_rate, float(np.sqrt(0.5 * np.mean(diffs**2)))))
+        m *= 2
+    return result
@@ -0,0 +1,206 @@
+"""Compact binary recordings of the raw cartographer data stream.
+
+A recording starts with a header followed by length-prefixed records:
+
+    header:  magic (4s) | version (H)
+    record:  kind (B) | payload length (H) | payload
+
+The constants record holds what is needed to convert raw readings,
+every data record holds one raw `cartographer_data` message together with
+the trapq snapshot it was matched against. Unknown record kinds are skipped
+on read so the format can grow without breaking older readers.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Protocol, Union, final, runtime_checkable
+
+from typing_extensions import TypeAlias
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.lib.sensor_constants import SensorConstants
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CRTS"
+VERSION = 1
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<BH")
+# sensor frequency, inverse adc max, adc smooth count
+_CONSTANTS = struct.Struct("<ddI")
+# clock, data, temp, print time, position x/y/z and velocity, NaN when unknown
+_DATA = struct.Struct("<IIId4d")
+
+KIND_CONSTANTS = 1
+KIND_DATA = 2
+
+
+class SampleConstants(Protocol):
+    def count_to_frequency(self, count: int) -> float: ...
+    def calculate_temperature(self, raw_temp: int) -> float: ...
+
+
+def convert_sample(
+    constants: SampleConstants,
+    time: float,
+    count: int,
+    raw_temp: int,
+    position: Position | None,
+    velocity: float | None,
+) -> Sample:
+    """Convert a raw reading into a sample, shared by the live stream and replays."""
+    return Sample(
+        time=time,
+        frequency=constants.count_to_frequency(count),
+        temperature=constants.calculate_temperature(raw_temp),
+        position=position,
+        velocity=velocity,
+    )
+
+
+@dataclass(frozen=True)
+class RecordedData:
+    clock: int
+    data: int
+    temp: int
+    time: float
+    position: Position | None
+    velocity: float | None
+
+
+Record: TypeAlias = Union[SensorConstants, RecordedData]
+
+
+def _nan_if_none(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+def _none_if_nan(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+@final
+class StreamRecorder:
+    """Appends raw stream messages to a recording, stopping once max_bytes is reached."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.records = 0
+        self.truncated = False
+        self._file: BinaryIO | None = open(path, "wb")  # noqa: SIM115
+        self.size = self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    def record_constants(self, sensor_frequency: float, inverse_adc_max: float, adc_smooth_count: int) -> None:
+        self._write(KIND_CONSTANTS, _CONSTANTS.pack(sensor_frequency, inverse_adc_max, adc_smooth_count))
+
+    def record_data(
+        self,
+        clock: int,
+        data: int,
+        temp: int,
+        time: float,
+        position: Position | None,
+        velocity: float | None,
+    ) -> None:
+        x, y, z = position.as_tuple() if position is not None else (math.nan, math.nan, math.nan)
+        self._write(KIND_DATA, _DATA.pack(clock, data, temp, time, x, y, z, _nan_if_none(velocity)))
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        if self._file is None:
+            return
+        length = _RECORD.size + len(payload)
+        if self.size + length > self.max_bytes:
+            self.truncated = True
+            logger.warning("Stream recording %s reached %d bytes, stopping", self.path, self.max_bytes)
+            self.close()
+            return
+        _ = self._file.write(_RECORD.pack(kind, len(payload)))
+        _ = self._file.write(payload)
+        self.size += length
+        self.records += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+
+@runtime_checkable
+class SupportsStreamRecording(Protocol):
+    def start_recording(self, path: str, max_bytes: int) -> StreamRecorder:
+        """Start appending the raw data stream to a recording at path."""
+        ...
+
+    def stop_recording(self) -> StreamRecorder | None:
+        """Stop the active recording, if any."""
+        ...
+
+
+def read_records(path: str) -> Iterator[Record]:
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            msg = f"{path} is not a stream recording"
+            raise RuntimeError(msg)
+        magic, version = _HEADER.unpack(header)
+        if magic != MAGIC:
+            msg = f"{path} is not a stream recording"
+            raise RuntimeError(msg)
+        if version != VERSION:
+            msg = f"Unsupported stream recording version {version} in {path}"
+            raise RuntimeError(msg)
+
+        while True:
+            prefix = f.read(_RECORD.size)
+            if len(prefix) < _RECORD.size:
+                return
+            kind, length = _RECORD.unpack(prefix)
+            payload = f.read(length)
+            if len(payload) < length:
+                # The recording was cut off mid-record, e.g. by a crash
+                logger.warning("Stream recording %s ends with a partial record", path)
+                return
+            if kind == KIND_CONSTANTS:
+                yield SensorConstants(*_CONSTANTS.unpack(payload))
+            elif kind == KIND_DATA:
+                clock, data, temp, time, x, y, z, velocity = _DATA.unpack(payload)
+                position = None if math.isnan(x) else Position(x, y, z)
+                yield RecordedData(clock, data, temp, time, position, _none_if_nan(velocity))
+
+
+def replay_samples(path: str) -> Iterator[Sample]:
+    """Convert a recording back into the samples the live stream produced."""
+    constants: SensorConstants | None = None
+    for record in read_records(path):
+        if isinstance(record, SensorConstants):
+            constants = record
+            continue
+        if constants is None:
+            msg = f"Stream recording {path} has data before its constants"
+            raise RuntimeError(msg)
+        yield convert_sample(constants, record.time, record.data, record.temp, record.position, record.velocity)
+
+
+class SampleSink(Protocol):
+    def add_item(self, item: Sample) -> None: ...
+
+
+def replay(path: str, stream: SampleSink) -> int:
+    """Feed a recording through a stream as fast as possible, returning the number of samples."""
+    count = 0
+    for sample in replay_samples(path):
+        stream.add_item(sample)
+        count += 1
+    return count
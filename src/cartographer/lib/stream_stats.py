@@ -0,0 +1,137 @@
+"""Health metrics for a sensor stream, updated in constant time per sample."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left
+from typing import Protocol, final, runtime_checkable
+
+# Upper bucket edges in seconds, doubling from 10us to about 84s
+HISTOGRAM_EDGES = tuple(1e-5 * 2**i for i in range(24))
+DROP_FACTOR = 1.5  # A gap this many expected intervals long means samples went missing
+INTERVAL_SMOOTHING = 0.01
+RATE_WINDOW = 1.0  # s
+
+
+@final
+class Histogram:
+    """Counts values into fixed, exponentially growing buckets."""
+
+    def __init__(self, edges: tuple[float, ...] = HISTOGRAM_EDGES) -> None:
+        self.edges = edges
+        # The last bucket collects everything above the largest edge
+        self.buckets = array("L", bytes(array("L").itemsize * (len(edges) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect_left(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """The upper edge of the bucket holding the q-th quantile, capped at the largest value seen."""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target and bucket > 0:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def get_status(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+@final
+class StreamStats:
+    """Tracks rate, gaps, drops, handler time and processing lag of a sample stream.
+
+    Times are in seconds, sample and receive times on the same clock.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples = 0
+        self.drops = 0
+        self.sample_rate = 0.0
+        self.gaps = Histogram()
+        self.handler_times = Histogram()
+        self.lag = Histogram()
+        self._expected_interval = math.nan
+        self._last_time: float | None = None
+        self._window_start: float | None = None
+        self._window_samples = 0
+
+    def restart(self) -> None:
+        """The stream was paused, the next sample does not follow the last one."""
+        self._last_time = None
+        self._window_start = None
+        self._window_samples = 0
+
+    def record(self, sample_time: float, receive_time: float, handler_time: float) -> None:
+        self.samples += 1
+        self.handler_times.add(handler_time)
+        self.lag.add(max(0.0, receive_time - sample_time))
+
+        last_time = self._last_time
+        self._last_time = sample_time
+        if last_time is not None:
+            self._record_gap(sample_time - last_time)
+
+        if self._window_start is None:
+            self._window_start = sample_time
+            self._window_samples = 0
+            return
+        self._window_samples += 1
+        elapsed = sample_time - self._window_start
+        if elapsed >= RATE_WINDOW:
+            self.sample_rate = self._window_samples / elapsed
+            self._window_start = sample_time
+            self._window_samples = 0
+
+    def _record_gap(self, gap: float) -> None:
+        self.gaps.add(gap)
+        expected = self._expected_interval
+        if math.isnan(expected):
+            self._expected_interval = gap
+            return
+        if gap > expected * DROP_FACTOR:
+            self.drops += max(1, round(gap / expected) - 1)
+            return
+        self._expected_interval += (gap - expected) * INTERVAL_SMOOTHING
+
+    def get_status(self) -> dict[str, object]:
+        return {
+            "samples": self.samples,
+            "sample_rate": self.sample_rate,
+            "drops": self.drops,
+            "gap": self.gaps.get_status(),
+            "handler_time": self.handler_times.get_status(),
+            "lag": self.lag.get_status(),
+        }
+
+
+@runtime_checkable
+class SupportsStreamStats(Protocol):
+    def get_stream_stats(self) -> StreamStats:
+        """Health metrics of the sensor data stream."""
+        ...
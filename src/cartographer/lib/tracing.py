@@ -0,0 +1,153 @@
+"""Nested timing spans kept in a ring buffer, exportable as Chrome trace events.
+
+    with span("Path generation", points=len(points)):
+        ...
+
+    @traced("Cluster position computation")
+    def compute(...): ...
+
+The export loads in chrome://tracing or https://ui.perfetto.dev.
+Spans recorded in a task executor's worker process stay in that process.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, TypeVar, final
+
+from typing_extensions import ParamSpec
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+TRACE_CAPACITY = 10000
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start: float
+    duration: float
+    depth: int
+    thread_id: int
+    args: dict[str, object]
+
+
+@final
+class _ActiveSpan:
+    __slots__ = ("_args", "_name", "_start", "_tracer")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict[str, object]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._tracer.depth += 1
+        self._start = self._tracer.clock()
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        tracer = self._tracer
+        end = tracer.clock()
+        tracer.depth -= 1
+        if exc_type is not None:
+            self._args["error"] = getattr(exc_type, "__name__", str(exc_type))
+        tracer.spans.append(
+            Span(self._name, self._start, end - self._start, tracer.depth, threading.get_ident(), self._args)
+        )
+
+
+@final
+class Tracer:
+    """Records completed spans, dropping the oldest once capacity is reached.
+
+    Spans nest per thread, a span opened on a worker thread starts at depth 0.
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.enabled = True
+        self.spans: deque[Span] = deque(maxlen=capacity)
+        self._local = threading.local()
+
+    @property
+    def depth(self) -> int:
+        """Number of spans currently open on the calling thread."""
+        return getattr(self._local, "depth", 0)
+
+    @depth.setter
+    def depth(self, value: int) -> None:
+        self._local.depth = value
+
+    def span(self, name: str, **args: object) -> _ActiveSpan | _NoSpan:
+        if not self.enabled:
+            return _NO_SPAN
+        return _ActiveSpan(self, name, args)
+
+    def traced(self, name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def to_chrome_trace(self) -> dict[str, object]:
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": "cartographer",
+                "ph": "X",
+                "ts": s.start * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {key: _jsonable(value) for key, value in s.args.items()},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@final
+class _NoSpan:
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _jsonable(value: object) -> object:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+tracer = Tracer()
+
+
+def span(name: str, **args: object) -> _ActiveSpan | _NoSpan:
+    """Time the enclosed block on the shared tracer."""
+    return tracer.span(name, **args)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Time every call of the decorated function on the shared tracer."""
+    return tracer.traced(name)
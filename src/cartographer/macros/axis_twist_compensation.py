@@ -11,11 +11,36 @@ from typing_extensions import override
 from cartographer.interfaces.printer import Macro, MacroParams, Toolhead
 
 if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
     from cartographer.interfaces.configuration import Configuration
     from cartographer.probe import Probe
 
 logger = logging.getLogger(__name__)
 
+MAX_SAMPLE_DISTANCE = 1.0  # mm along the line from a calibration point
+
+
+def bin_to_points(
+    positions: NDArray[np.float64],
+    values: NDArray[np.float64],
+    points: NDArray[np.float64],
+    max_distance: float = MAX_SAMPLE_DISTANCE,
+) -> list[float]:
+    """Median of the values measured within max_distance of each evenly spaced point."""
+    step = points[1] - points[0] if len(points) > 1 else 1.0
+    indices = np.clip(np.rint((positions - points[0]) / step).astype(int), 0, len(points) - 1)
+    close = np.abs(positions - points[indices]) <= max_distance
+
+    medians: list[float] = []
+    for i, point in enumerate(points):
+        members = values[close & (indices == i)]
+        if len(members) == 0:
+            msg = f"No scan samples near {point:.2f}"
+            raise RuntimeError(msg)
+        medians.append(float(np.median(members)))
+    return medians
+
 
 @dataclass
 class CalibrationOptions:
@@ -119,17 +144,17 @@ class AxisTwistCompensationMacro(Macro):
         end_pos: float,
         line_pos: float,
     ) -> None:
-        step = (end_pos - start_pos) / (sample_count - 1)
-        results: list[float] = []
+        positions = np.linspace(start_pos, end_pos, sample_count)
         start_time = time.time()
-        for i in range(sample_count):
-            position = start_pos + i * step
-            self._move_probe_to(axis, position, line_pos)
-            scan = self.probe.perform_scan()
-            self._move_nozzle_to(axis, position, line_pos)
+        scans = self._scan_line(axis, positions, line_pos)
+        logger.debug("Axis twist scan completed in %.2f seconds", time.time() - start_time)
+
+        results: list[float] = []
+        for position, scan in zip(positions, scans):
+            self._move_nozzle_to(axis, float(position), line_pos)
             touch = self.probe.perform_touch()
             result = scan - touch
-            logger.debug("Offset at %:.2f: %.6f", position, result)
+            logger.debug("Offset at %.2f: %.6f", position, result)
             results.append(result)
         logger.debug("Axis twist measurements completed in %.2f seconds", time.time() - start_time)
 
@@ -149,6 +174,36 @@ class AxisTwistCompensationMacro(Macro):
             ", ".join(f"{s:.6f}" for s in results),
         )
 
+    def _scan_line(self, axis: Literal["x", "y"], positions: NDArray[np.float64], line_pos: float) -> list[float]:
+        """Scan the whole line in a single sweep and bin the samples to the calibration points."""
+        scan = self.probe.scan
+        if not self.toolhead.is_homed("z"):
+            msg = "Z axis must be homed before probing"
+            raise RuntimeError(msg)
+
+        self.toolhead.move(z=scan.probe_height, speed=self.config.scan.probe_speed)
+        self._move_probe_to(axis, float(positions[0]), line_pos)
+        self.toolhead.wait_moves()
+
+        with scan.start_session() as session:
+            self._move_probe_to(axis, float(positions[-1]), line_pos)
+            self.toolhead.dwell(0.250)
+            self.toolhead.wait_moves()
+            move_time = self.toolhead.get_last_move_time()
+            session.wait_for(lambda samples: samples[-1].time >= move_time)
+
+        offset = self.config.general.x_offset if axis == "x" else self.config.general.y_offset
+        along: list[float] = []
+        heights: list[float] = []
+        for sample in session.get_items():
+            if sample.position is None:
+                continue
+            along.append((sample.position.x if axis == "x" else sample.position.y) + offset)
+            # Same as a stationary scan probe: toolhead z corrected by the distance error
+            heights.append(sample.position.z + scan.probe_height - scan.calculate_sample_distance(sample))
+
+        return bin_to_points(np.array(along), np.array(heights), positions)
+
     def _move_nozzle_to(self, axis: Literal["x", "y"], position: float, line_pos: float) -> None:
         self.toolhead.move(z=self.adapter.move_height, speed=self.adapter.speed)
         if axis == "x":
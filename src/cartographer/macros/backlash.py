@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Literal, final
+from typing import TYPE_CHECKING, Callable, Literal, final
 
 import numpy as np
 from typing_extensions import TypeAlias, override
@@ -10,11 +10,15 @@ from cartographer.interfaces.printer import Macro, MacroParams, Toolhead
 
 if TYPE_CHECKING:
     from cartographer.interfaces.configuration import Configuration
+    from cartographer.interfaces.printer import Sample
     from cartographer.probe.scan_mode import ScanMode
 
 logger = logging.getLogger(__name__)
 
 NOISE_THRESHOLD = 0.005  # mm, threshold for noise in backlash measurement
+SETTLE_TIME = 0.05  # s, dwell after a move before samples are used
+WINDOW_TIME = 0.1  # s, duration of each measurement window
+MIN_WINDOW_SAMPLES = 5
 
 
 @final
@@ -40,18 +44,28 @@ class EstimateBacklashMacro(Macro):
             self._toolhead.move(x=x, y=y, speed=speed)
         self._toolhead.wait_moves()
 
-        samples: dict[Literal["up", "down"], list[float]] = {"up": [], "down": []}
+        windows: dict[Literal["up", "down"], list[tuple[float, float]]] = {"up": [], "down": []}
 
-        with self._scan.start_session():
+        # Queue the whole sequence, settled windows are picked from the samples by time afterwards
+        with self._scan.start_session() as session:
             for _ in range(iterations):
-                for direction in samples:
+                for direction in windows:
                     # When moving up, approach from below
                     dir = -1 if direction == "up" else 1
                     self._toolhead.move(z=height + delta * dir, speed=speed)
                     self._toolhead.move(z=height, speed=speed)
-                    self._toolhead.wait_moves()
-                    dist = self._scan.measure_distance()
-                    samples[direction].append(dist)
+                    settled = self._toolhead.get_last_move_time() + SETTLE_TIME
+                    self._toolhead.dwell(SETTLE_TIME + WINDOW_TIME)
+                    windows[direction].append((settled, settled + WINDOW_TIME))
+            self._toolhead.wait_moves()
+            end_time = max(end for direction in windows.values() for _, end in direction)
+            session.wait_for(lambda items: items[-1].time >= end_time)
+
+        items = session.get_items()
+        samples = {
+            direction: window_medians(items, direction_windows, self._scan.calculate_sample_distance)
+            for direction, direction_windows in windows.items()
+        }
 
         global_mean = np.mean(samples["up"] + samples["down"])
         mean_up = np.mean(samples["up"]) - global_mean
@@ -131,6 +145,22 @@ class EstimateBacklashMacro(Macro):
                 )
 
 
+def window_medians(
+    samples: list[Sample], windows: list[tuple[float, float]], calculate_distance: Callable[[Sample], float]
+) -> list[float]:
+    """Median distance of the samples inside each (start, end) time window."""
+    times = np.array([sample.time for sample in samples], dtype=float)
+    bounds = np.searchsorted(times, np.array(windows, dtype=float).reshape(-1, 2))
+
+    medians: list[float] = []
+    for (start, end), (lo, hi) in zip(windows, bounds):
+        if hi - lo < MIN_WINDOW_SAMPLES:
+            msg = f"Only {hi - lo} samples between {start:.3f} and {end:.3f}, expected at least {MIN_WINDOW_SAMPLES}"
+            raise RuntimeError(msg)
+        medians.append(float(np.median([calculate_distance(sample) for sample in samples[lo:hi]])))
+    return medians
+
+
 _np_float_list: TypeAlias = "np.ndarray[Literal[1], np.dtype[np.float64]]"
 
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Iterator, Protocol
 
 from typing_extensions import TypeAlias
 
 if TYPE_CHECKING:
     import numpy as np
+    from numpy.typing import NDArray
 
     from cartographer.interfaces.printer import Position
 
@@ -17,7 +19,16 @@ class PathGenerator(Protocol):
     def generate_path(self, points: list[Point]) -> Iterator[Point]: ...
 
 
+@dataclass(frozen=True)
+class MeshGrid:
+    """Heights of a regular mesh as a (y_count, x_count) matrix spanning min to max."""
+
+    matrix: NDArray[np.float64]
+    min: tuple[float, float]
+    max: tuple[float, float]
+
+
 class BedMeshAdapter(Protocol):
-    def apply_mesh(self, mesh_points: list[Position], profile_name: str | None = None): ...
+    def apply_mesh(self, mesh: MeshGrid | list[Position], profile_name: str | None = None): ...
     def clear_mesh(self) -> None: ...
     def get_objects(self) -> list[Polygon]: ...
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Protocol, final
+
+import numpy as np
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Macro, MacroParams
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from cartographer.macros.bed_mesh.interfaces import Point
+    from cartographer.macros.bed_mesh.mesh_utils import GridPointResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SAMPLES = 5
+MAX_REPORTED_CELLS = 10
+
+
+@dataclass(frozen=True)
+class MeshQuality:
+    """Per-cell sample statistics of a scanned mesh, stored as (y_count, x_count) arrays."""
+
+    x_points: NDArray[np.float64]
+    y_points: NDArray[np.float64]
+    sample_count: NDArray[np.int_]
+    mad: NDArray[np.float64]
+    distance: NDArray[np.float64]
+
+    @staticmethod
+    def from_results(
+        results: list[GridPointResult], to_mesh_point: Callable[[Point], Point] | None = None
+    ) -> MeshQuality:
+        points = np.array([to_mesh_point(r.point) if to_mesh_point else r.point for r in results], dtype=float)
+        x_points = np.unique(points[:, 0])
+        y_points = np.unique(points[:, 1])
+        xi = np.searchsorted(x_points, points[:, 0])
+        yi = np.searchsorted(y_points, points[:, 1])
+
+        shape = (len(y_points), len(x_points))
+        sample_count = np.zeros(shape, dtype=int)
+        mad = np.full(shape, np.nan)
+        distance = np.full(shape, np.nan)
+
+        sample_count[yi, xi] = [r.sample_count for r in results]
+        mad[yi, xi] = [r.mad for r in results]
+        distance[yi, xi] = [r.distance for r in results]
+
+        return MeshQuality(x_points, y_points, sample_count, mad, distance)
+
+    def under_sampled(self, min_samples: int) -> list[tuple[Point, int]]:
+        yi, xi = np.nonzero(self.sample_count < min_samples)
+        return [
+            ((float(self.x_points[i]), float(self.y_points[j])), int(self.sample_count[j, i])) for j, i in zip(yi, xi)
+        ]
+
+    def noisy(self, max_mad: float) -> list[tuple[Point, float]]:
+        yi, xi = np.nonzero(np.nan_to_num(self.mad, nan=np.inf) > max_mad)
+        return [((float(self.x_points[i]), float(self.y_points[j])), float(self.mad[j, i])) for j, i in zip(yi, xi)]
+
+    def get_status(self) -> dict[str, object]:
+        def rounded(values: NDArray[np.float64], decimals: int) -> list[list[float | None]]:
+            return [[None if np.isnan(v) else round(float(v), decimals) for v in row] for row in values]
+
+        return {
+            "min_samples": int(self.sample_count.min()),
+            "sample_count": self.sample_count.tolist(),
+            "mad": rounded(self.mad, 6),
+            "distance": rounded(self.distance, 3),
+        }
+
+
+class MeshQualitySource(Protocol):
+    @property
+    def last_quality(self) -> MeshQuality | None: ...
+
+
+@final
+class MeshQualityMacro(Macro):
+    description = "Report per-cell sample statistics of the last scanned bed mesh."
+
+    def __init__(self, source: MeshQualitySource, min_samples: int = DEFAULT_MIN_SAMPLES) -> None:
+        self._source = source
+        self._min_samples = min_samples
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        min_samples = params.get_int("MIN_SAMPLES", default=self._min_samples, minval=1)
+        max_mad = params.get_float("MAX_MAD", default=None, above=0)
+
+        quality = self._source.last_quality
+        if quality is None:
+            msg = "No scanned mesh available, run BED_MESH_CALIBRATE first"
+            raise RuntimeError(msg)
+
+        counts = quality.sample_count
+        logger.info(
+            """
+            Mesh quality over %d cells:\n
+            samples per cell min %d, median %d, max %d,\n
+            MAD median %.6f, max %.6f,\n
+            distance to node mean %.3f, max %.3f
+            """,
+            counts.size,
+            int(counts.min()),
+            int(np.median(counts)),
+            int(counts.max()),
+            float(np.nanmedian(quality.mad)),
+            float(np.nanmax(quality.mad)),
+            float(np.nanmean(quality.distance)),
+            float(np.nanmax(quality.distance)),
+        )
+
+        under_sampled = quality.under_sampled(min_samples)
+        if under_sampled:
+            logger.warning(
+                "%d cells have fewer than %d samples: %s",
+                len(under_sampled),
+                min_samples,
+                _format_cells(under_sampled, "%d"),
+            )
+        else:
+            logger.info("All cells have at least %d samples", min_samples)
+
+        if max_mad is not None:
+            noisy = quality.noisy(max_mad)
+            if noisy:
+                logger.warning("%d cells exceed MAD %.6f: %s", len(noisy), max_mad, _format_cells(noisy, "%.6f"))
+
+
+def _format_cells(cells: list[tuple[Point, int]] | list[tuple[Point, float]], value_format: str) -> str:
+    formatted = ", ".join(f"({x:.2f},{y:.2f})={value_format % value}" for (x, y), value in cells[:MAX_REPORTED_CELLS])
+    if len(cells) > MAX_REPORTED_CELLS:
+        formatted += f" and {len(cells) - MAX_REPORTED_CELLS} more"
+    return formatted
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Literal
+from math import ceil
+from typing import TYPE_CHECKING, Callable, Literal, NamedTuple, Sequence
 
 import numpy as np
 
+from cartographer.macros.bed_mesh.interfaces import MeshGrid
+
 if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
     from cartographer.interfaces.printer import Sample
     from cartographer.macros.bed_mesh.interfaces import Point
 
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLE_DISTANCE = 1.0
+
 
 def cluster_points(points: list[Point], axis: Literal["x", "y"], tol: float = 1e-3) -> list[list[Point]]:
     # axis to cluster on:
@@ -39,11 +49,27 @@ class GridPointResult:
     point: Point
     z: float
     sample_count: int
+    mad: float
+    distance: float
 
 
-def assign_samples_to_grid(
-    grid: list[Point], samples: list[Sample], calculate_height: Callable[[Sample], float], max_distance: float = 1.0
-) -> list[GridPointResult]:
+class _BinnedSamples(NamedTuple):
+    x_vals: NDArray[np.float64]
+    y_vals: NDArray[np.float64]
+    zs: NDArray[np.float64]
+    times: NDArray[np.float64]
+    cells: NDArray[np.int_]
+    distances: NDArray[np.float64]
+    valid: NDArray[np.bool_]
+
+
+def _bin_samples(
+    grid: list[Point],
+    samples: list[Sample],
+    calculate_height: Callable[[Sample], float],
+    max_distance: float,
+    correct_direction: bool,
+) -> _BinnedSamples:
     # Extract sorted unique coordinates
     mesh_array: np.ndarray[float, np.dtype[np.float64]] = np.array(grid)
     x_vals = np.unique(mesh_array[:, 0])
@@ -58,37 +84,275 @@ def assign_samples_to_grid(
     x_step: float = (x_max - x_min) / (x_res - 1)
     y_step: float = (y_max - y_min) / (y_res - 1)
 
-    # Map (j, i) grid positions to (x, y)
-    index_to_point: dict[tuple[int, int], Point] = {
-        (j, i): (float(x), float(y)) for i, x in enumerate(x_vals) for j, y in enumerate(y_vals)
-    }
+    positioned = [sample for sample in samples if sample.position is not None]
+    xy = np.array([(s.position.x, s.position.y) for s in positioned if s.position is not None], dtype=float)
+    xy = xy.reshape(-1, 2)
+    zs = np.array([calculate_height(s) for s in positioned], dtype=float)
+    times = np.array([s.time for s in positioned], dtype=float)
+
+    i = np.rint((xy[:, 0] - x_min) / x_step).astype(int)
+    j = np.rint((xy[:, 1] - y_min) / y_step).astype(int)
+    in_grid = (i >= 0) & (i < x_res) & (j >= 0) & (j < y_res)
+    i = np.where(in_grid, i, 0)
+    j = np.where(in_grid, j, 0)
+
+    distances = np.hypot(xy[:, 0] - x_vals[i], xy[:, 1] - y_vals[j])
+    valid = in_grid & (distances <= max_distance)
+    cells = j * x_res + i
+
+    if correct_direction and len(zs) > 1:
+        zs = zs - direction_offsets(xy, zs, cells, valid, (y_res, x_res))
+
+    return _BinnedSamples(x_vals, y_vals, zs, times, cells, distances, valid)
+
 
-    # Accumulator: (row=j, col=i) → list of z values
-    accumulator: dict[tuple[int, int], list[float]] = defaultdict(list)
+def assign_samples_to_grid(
+    grid: list[Point],
+    samples: list[Sample],
+    calculate_height: Callable[[Sample], float],
+    max_distance: float = MAX_SAMPLE_DISTANCE,
+    correct_direction: bool = False,
+    run_end_times: Sequence[float] | None = None,
+) -> list[GridPointResult]:
+    """Bin samples to their nearest grid point.
 
-    for sample in samples:
-        if sample.position is None:
-            continue
-        sx = sample.position.x
-        sy = sample.position.y
-        i = round((sx - x_min) / x_step)
-        j = round((sy - y_min) / y_step)
+    With more than one run, each run gets its own estimate per point and the
+    runs are fused robustly instead of pooling all samples into one median.
+    """
+    binned = _bin_samples(grid, samples, calculate_height, max_distance, correct_direction)
+    x_vals, y_vals, zs, _, cells, distances, valid = binned
+    x_res = len(x_vals)
 
-        if 0 <= i < x_res and 0 <= j < y_res:
-            gx: float = x_vals[i]
-            gy: float = y_vals[j]
-            if np.hypot(sx - gx, sy - gy) > max_distance:
-                continue
+    fused: NDArray[np.float64] | None = None
+    if run_end_times is not None and len(run_end_times) > 1:
+        fused, _ = fuse_runs(_run_estimates(binned, run_end_times))
 
-            sz = calculate_height(sample)
-            accumulator[(j, i)].append(sz)
+    # Group valid samples by cell, row=j, col=i
+    order = np.flatnonzero(valid)
+    order = order[np.argsort(cells[order], kind="stable")]
+    sorted_cells = cells[order]
+    bounds = np.searchsorted(sorted_cells, np.arange(x_res * len(y_vals) + 1))
 
     results: list[GridPointResult] = []
 
-    for (j, i), point in index_to_point.items():
-        values = accumulator.get((j, i), [])
-        count = len(values)
-        z = float(np.median(values))
-        results.append(GridPointResult(point=point, z=z, sample_count=count))
+    for ii, x in enumerate(x_vals):
+        for jj, y in enumerate(y_vals):
+            cell = jj * x_res + ii
+            members = order[bounds[cell] : bounds[cell + 1]]
+            count = len(members)
+            z = mad = distance = float("nan")
+            if count > 0:
+                values = zs[members]
+                median = float(np.median(values))
+                z = median if fused is None else float(fused[cell])
+                mad = float(np.median(np.abs(values - median)))
+                distance = float(np.mean(distances[members]))
+            results.append(
+                GridPointResult(point=(float(x), float(y)), z=z, sample_count=count, mad=mad, distance=distance)
+            )
 
     return results
+
+
+def estimate_run_spread(
+    grid: list[Point],
+    samples: list[Sample],
+    calculate_height: Callable[[Sample], float],
+    run_end_times: Sequence[float],
+    max_distance: float = MAX_SAMPLE_DISTANCE,
+    correct_direction: bool = False,
+) -> float:
+    """Largest confidence interval half width of the fused runs over all grid points."""
+    binned = _bin_samples(grid, samples, calculate_height, max_distance, correct_direction)
+    _, half_width = fuse_runs(_run_estimates(binned, run_end_times))
+    if not np.isfinite(half_width).any():
+        return float("inf")
+    return float(np.nanmax(half_width))
+
+
+def _run_estimates(binned: _BinnedSamples, run_end_times: Sequence[float]) -> NDArray[np.float64]:
+    runs = len(run_end_times)
+    cell_count = len(binned.x_vals) * len(binned.y_vals)
+    run_ids = np.minimum(np.searchsorted(np.asarray(run_end_times), binned.times), runs - 1)
+    valid = binned.valid
+    keys = run_ids[valid] * cell_count + binned.cells[valid]
+    return _group_medians(binned.zs[valid], keys, runs * cell_count).reshape(runs, cell_count)
+
+
+HUBER_K = 1.345
+REJECT_K = 5.0
+MIN_RUN_SCALE = 0.001  # mm, keeps identical runs from producing a zero scale
+HUBER_ITERATIONS = 5
+CONFIDENCE_Z = 1.96
+
+
+def fuse_runs(estimates: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Fuse per-run estimates of shape (runs, points) with Huber weights.
+
+    Runs further than REJECT_K robust deviations from the median are rejected.
+    Returns the fused estimate and the half width of its 95% confidence interval per point.
+    """
+    finite = np.isfinite(estimates)
+    filled = np.where(finite, estimates, 0.0)
+    counts = finite.sum(axis=0)
+    fused = np.full(estimates.shape[1], np.nan)
+    half_width = np.full(estimates.shape[1], np.nan)
+    has_data = counts > 0
+    if not has_data.any():
+        return fused, half_width
+
+    center = np.nanmedian(estimates[:, has_data], axis=0)
+    scale = 1.4826 * np.nanmedian(np.abs(estimates[:, has_data] - center), axis=0)
+    scale = np.maximum(scale, MIN_RUN_SCALE)
+
+    values = filled[:, has_data]
+    present = finite[:, has_data]
+    weights = present.astype(float)
+    for _ in range(HUBER_ITERATIONS):
+        residual = np.abs(values - center) / scale
+        weights = np.where(residual <= HUBER_K, 1.0, HUBER_K / np.maximum(residual, HUBER_K))
+        weights = np.where(present & (residual <= REJECT_K), weights, 0.0)
+        center = np.sum(weights * values, axis=0) / np.sum(weights, axis=0)
+
+    effective_count = np.sum(weights, axis=0) ** 2 / np.sum(weights**2, axis=0)
+    fused[has_data] = center
+    half_width[has_data] = np.where(effective_count > 1, CONFIDENCE_Z * scale / np.sqrt(effective_count), np.inf)
+    return fused, half_width
+
+
+MIN_MOVE_DISTANCE = 1e-3  # mm between consecutive samples to count as moving
+MIN_OVERLAP_CELLS = 3
+
+
+def direction_offsets(
+    xy: NDArray[np.float64],
+    zs: NDArray[np.float64],
+    cells: NDArray[np.int_],
+    valid: NDArray[np.bool_],
+    shape: tuple[int, int],
+) -> NDArray[np.float64]:
+    """Per sample height bias caused by the direction of travel.
+
+    Samples moving along an axis in the positive direction are assumed to read
+    a constant offset higher than samples moving in the negative direction.
+    The offset is estimated from cells scanned in both directions when available,
+    otherwise from rows scanned in alternating directions,
+    where a row is compared against the average of its neighbours
+    and consecutive rows are paired up to cancel the bed curvature.
+    """
+    delta = np.gradient(xy, axis=0)
+    moving = np.hypot(delta[:, 0], delta[:, 1]) > MIN_MOVE_DISTANCE
+    along_x = moving & (np.abs(delta[:, 0]) >= np.abs(delta[:, 1]))
+    along_y = moving & ~along_x
+
+    offsets = np.zeros_like(zs)
+    for axis, along in ((0, along_x), (1, along_y)):
+        direction = np.where(along, np.sign(delta[:, axis]), 0.0)
+        bias = _estimate_direction_bias(zs, cells, valid & (direction != 0), direction, shape, axis)
+        logger.debug("Estimated %s direction bias %.6f", "xy"[axis], bias)
+        offsets += direction * bias
+
+    return offsets
+
+
+def _estimate_direction_bias(
+    zs: NDArray[np.float64],
+    cells: NDArray[np.int_],
+    mask: NDArray[np.bool_],
+    direction: NDArray[np.float64],
+    shape: tuple[int, int],
+    axis: int,
+) -> float:
+    size = shape[0] * shape[1]
+    forward = _group_medians(zs[mask & (direction > 0)], cells[mask & (direction > 0)], size).reshape(shape)
+    backward = _group_medians(zs[mask & (direction < 0)], cells[mask & (direction < 0)], size).reshape(shape)
+
+    overlap = np.isfinite(forward) & np.isfinite(backward)
+    if np.count_nonzero(overlap) >= MIN_OVERLAP_CELLS:
+        return float(np.median((forward[overlap] - backward[overlap]) / 2))
+
+    heights = np.where(np.isfinite(forward), forward, backward)
+    signs = np.where(np.isfinite(forward), 1.0, np.where(np.isfinite(backward), -1.0, 0.0))
+    if axis == 1:
+        # Rows moving along y are the columns of the mesh
+        heights = heights.T
+        signs = signs.T
+    if heights.shape[0] < 4:
+        return 0.0
+
+    middle, previous, following = signs[1:-1], signs[:-2], signs[2:]
+    alternating = (middle != 0) & (previous == -middle) & (following == -middle)
+    # Tilt cancels out in the difference to the neighbour average, leaving twice the bias
+    # plus the curvature across the rows, which has the same sign in every row.
+    difference = middle * (heights[1:-1] - (heights[:-2] + heights[2:]) / 2) / 2
+    # Neighbouring rows run in opposite directions, so averaging them cancels the curvature
+    paired = (difference[:-1] + difference[1:]) / 2
+    usable = alternating[:-1] & alternating[1:] & np.isfinite(paired)
+    paired = paired[usable]
+    if len(paired) == 0:
+        return 0.0
+    return float(np.median(paired))
+
+
+def _group_medians(values: NDArray[np.float64], keys: NDArray[np.int_], size: int) -> NDArray[np.float64]:
+    medians = np.full(size, np.nan)
+    if len(values) == 0:
+        return medians
+    order = np.argsort(keys, kind="stable")
+    unique_keys, starts = np.unique(keys[order], return_index=True)
+    for key, group in zip(unique_keys, np.split(values[order], starts[1:])):
+        medians[key] = np.median(group)
+    return medians
+
+
+def mesh_grid_from_points(points: NDArray[np.float64], decimals: int = 2) -> MeshGrid:
+    """Place (x, y, z) rows into a regular grid, coordinates are matched after rounding."""
+    xs = np.round(points[:, 0], decimals)
+    ys = np.round(points[:, 1], decimals)
+    x_unique = np.unique(xs)
+    y_unique = np.unique(ys)
+
+    matrix = np.full((len(y_unique), len(x_unique)), np.nan)
+    matrix[np.searchsorted(y_unique, ys), np.searchsorted(x_unique, xs)] = points[:, 2]
+
+    if len(points) != matrix.size or np.isnan(matrix).any():
+        msg = "Mesh has missing points or inconsistent coordinates"
+        raise RuntimeError(msg)
+
+    return MeshGrid(
+        matrix=matrix,
+        min=(float(x_unique[0]), float(y_unique[0])),
+        max=(float(x_unique[-1]), float(y_unique[-1])),
+    )
+
+
+def measure_sample_rate(samples: list[Sample]) -> float:
+    """Samples per second over the given, time ordered, samples."""
+    if len(samples) < 2:
+        msg = "Need at least two samples to measure the sample rate"
+        raise ValueError(msg)
+    duration = samples[-1].time - samples[0].time
+    if duration <= 0:
+        msg = "Samples do not span any time"
+        raise ValueError(msg)
+    return (len(samples) - 1) / duration
+
+
+def compute_auto_speed(
+    *,
+    sample_rate: float,
+    spacing: float,
+    min_samples: int,
+    passes: int,
+    max_speed: float,
+    max_distance: float = MAX_SAMPLE_DISTANCE,
+) -> float:
+    """Fastest speed that still gives every cell `min_samples` samples over all passes.
+
+    A pass over a node only collects samples while within `max_distance` of it,
+    and never further than half way to the next node.
+    """
+    capture_length = min(2 * max_distance, spacing)
+    samples_per_pass = ceil(min_samples / passes)
+    speed = capture_length * sample_rate / samples_per_pass
+    return min(speed, max_speed)
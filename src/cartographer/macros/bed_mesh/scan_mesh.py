@@ -4,25 +4,31 @@ import logging
 from dataclasses import dataclass
 from itertools import chain
 from math import ceil, isfinite
-from typing import TYPE_CHECKING, Literal, final
+from typing import TYPE_CHECKING, Callable, Literal, final
 
 import numpy as np
 from typing_extensions import override
 
+from cartographer.interfaces.multiprocessing import executor_for
 from cartographer.interfaces.printer import Macro, MacroParams, Position, Sample, SupportsFallbackMacro, Toolhead
 from cartographer.lib.log import log_duration
-from cartographer.macros.bed_mesh.alternating_snake import AlternatingSnakePathGenerator
-from cartographer.macros.bed_mesh.mesh_utils import assign_samples_to_grid
-from cartographer.macros.bed_mesh.random_path import RandomPathGenerator
-from cartographer.macros.bed_mesh.snake_path import SnakePathGenerator
-from cartographer.macros.bed_mesh.spiral_path import SpiralPathGenerator
+from cartographer.lib.tracing import span
+from cartographer.macros.bed_mesh.mesh_quality import MeshQuality
+from cartographer.macros.bed_mesh.mesh_utils import (
+    assign_samples_to_grid,
+    compute_auto_speed,
+    estimate_run_spread,
+    measure_sample_rate,
+    mesh_grid_from_points,
+)
 from cartographer.macros.utils import get_choice, get_float_tuple, get_int_tuple
 
 if TYPE_CHECKING:
     from cartographer.interfaces.configuration import Configuration
     from cartographer.interfaces.multiprocessing import TaskExecutor
-    from cartographer.macros.bed_mesh.interfaces import BedMeshAdapter, PathGenerator, Point
+    from cartographer.macros.bed_mesh.interfaces import BedMeshAdapter, MeshGrid, PathGenerator, Point
     from cartographer.probe import Probe
+    from cartographer.stream import Session
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +47,8 @@ class BedMeshCalibrateConfiguration:
     height: float
     corner_radius: float
     path: Literal["snake", "alternating_snake", "spiral", "random"]
+    min_samples: int
+    direction_correction: bool
 
     @staticmethod
     def from_config(config: Configuration):
@@ -56,17 +64,47 @@ class BedMeshCalibrateConfiguration:
             height=config.scan.mesh_height,
             corner_radius=config.scan.mesh_corner_radius,
             path=config.scan.mesh_path,
+            min_samples=config.scan.mesh_min_samples,
+            direction_correction=config.scan.mesh_direction_correction,
         )
 
 
 _directions: list[Literal["x", "y"]] = ["x", "y"]
 
-PATH_GENERATOR_MAP = {
-    "snake": SnakePathGenerator,
-    "alternating_snake": AlternatingSnakePathGenerator,
-    "spiral": SpiralPathGenerator,
-    "random": RandomPathGenerator,
+
+# Path generators are imported on first use, only the chosen one is ever loaded
+def _snake_path(direction: Literal["x", "y"], corner_radius: float) -> PathGenerator:
+    from cartographer.macros.bed_mesh.snake_path import SnakePathGenerator
+
+    return SnakePathGenerator(direction, corner_radius)
+
+
+def _alternating_snake_path(direction: Literal["x", "y"], corner_radius: float) -> PathGenerator:
+    from cartographer.macros.bed_mesh.alternating_snake import AlternatingSnakePathGenerator
+
+    return AlternatingSnakePathGenerator(direction, corner_radius)
+
+
+def _spiral_path(direction: Literal["x", "y"], corner_radius: float) -> PathGenerator:
+    from cartographer.macros.bed_mesh.spiral_path import SpiralPathGenerator
+
+    return SpiralPathGenerator(direction, corner_radius)
+
+
+def _random_path(direction: Literal["x", "y"], corner_radius: float) -> PathGenerator:
+    from cartographer.macros.bed_mesh.random_path import RandomPathGenerator
+
+    return RandomPathGenerator(direction, corner_radius)
+
+
+PATH_GENERATOR_MAP: dict[str, Callable[[Literal["x", "y"], float], PathGenerator]] = {
+    "snake": _snake_path,
+    "alternating_snake": _alternating_snake_path,
+    "spiral": _spiral_path,
+    "random": _random_path,
 }
+# Paths made of straight rows scanned in alternating directions
+DIRECTION_CORRECTED_PATHS = ("snake", "alternating_snake")
 
 
 @dataclass
@@ -75,10 +113,15 @@ class BedMeshParams:
     mesh_max: tuple[float, float]
     adaptive_margin: float
     speed: float
+    auto_speed: bool
+    min_samples: int
     runs: int
+    convergence: float
+    direction_correction: bool
     height: float
     corner_radius: float
     direction: Literal["x", "y"]
+    path: str
     path_generator: PathGenerator
     adaptive: bool
     probe_count: tuple[int, int]
@@ -91,16 +134,26 @@ class BedMeshParams:
         path_type = get_choice(params, "PATH", default=config.path, choices=PATH_GENERATOR_MAP.keys())
         path_generator = PATH_GENERATOR_MAP[path_type](direction, corner_radius)
         adaptive = params.get_int("ADAPTIVE", default=0) != 0
+        auto_speed = params.get("SPEED", default="").lower() == "auto"
+        direction_correction = (
+            params.get_int("DIRECTION_CORRECTION", default=int(config.direction_correction)) != 0
+            and path_type in DIRECTION_CORRECTED_PATHS
+        )
 
         return BedMeshParams(
             mesh_min=get_float_tuple(params, "MESH_MIN", default=config.mesh_min),
             mesh_max=get_float_tuple(params, "MESH_MAX", default=config.mesh_max),
             adaptive_margin=params.get_float("ADAPTIVE_MARGIN", config.adaptive_margin, minval=0),
-            speed=params.get_float("SPEED", default=config.speed, minval=50),
+            speed=config.speed if auto_speed else params.get_float("SPEED", default=config.speed, minval=50),
+            auto_speed=auto_speed,
+            min_samples=params.get_int("MIN_SAMPLES", default=config.min_samples, minval=1),
             runs=params.get_int("RUNS", default=config.runs, minval=1),
+            convergence=params.get_float("CONVERGENCE", default=0, minval=0),
+            direction_correction=direction_correction,
             height=params.get_float("HEIGHT", default=config.height, minval=0.5, maxval=5),
             corner_radius=corner_radius,
             direction=direction,
+            path=path_type,
             path_generator=path_generator,
             adaptive=adaptive,
             probe_count=get_int_tuple(params, "PROBE_COUNT", default=config.probe_count),
@@ -109,6 +162,9 @@ class BedMeshParams:
 
 
 MIN_POINTS = 3
+RATE_SAMPLE_COUNT = 50
+# Convergence is first checked after this many runs, so only these are sure to complete
+MIN_CONVERGED_RUNS = 2
 
 
 @final
@@ -116,6 +172,8 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
     description = "Gather samples across the bed to calibrate the bed mesh."
 
     _fallback: Macro | None = None
+    last_quality: MeshQuality | None = None
+    _quality_status: dict[str, object] | None = None
 
     def __init__(
         self,
@@ -131,6 +189,10 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
         self.task_executor = task_executor
         self.config = config
 
+    def get_status(self, eventtime: float) -> object:
+        del eventtime
+        return self._quality_status
+
     @override
     def set_fallback_macro(self, macro: Macro) -> None:
         self._fallback = macro
@@ -146,14 +208,26 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
 
         parsed_params = BedMeshParams.from_macro_params(params, self.config)
 
-        mesh_points = self._generate_mesh_points(parsed_params)
-        path = list(parsed_params.path_generator.generate_path(mesh_points))
+        with span("Path generation"):
+            mesh_points = self._generate_mesh_points(parsed_params)
+            path = list(parsed_params.path_generator.generate_path(mesh_points))
 
         self.adapter.clear_mesh()
-        samples = self._sample_path(parsed_params, path)
-        positions = self.task_executor.run(self.assign_positions_to_points, mesh_points, samples, parsed_params.height)
-
-        self.adapter.apply_mesh(positions, parsed_params.profile)
+        samples, run_end_times = self._sample_path(parsed_params, path, mesh_points)
+        with span("Executor round-trip", samples=len(samples)):
+            mesh, quality = executor_for(self.task_executor, "mesh").run(
+                self.assign_positions_to_points,
+                mesh_points,
+                samples,
+                parsed_params.height,
+                parsed_params.direction_correction,
+                run_end_times,
+            )
+        self.last_quality = quality
+        self._quality_status = quality.get_status()
+
+        with span("Mesh apply"):
+            self.adapter.apply_mesh(mesh, parsed_params.profile)
 
     def _generate_mesh_points(
         self,
@@ -214,31 +288,100 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
         return x_res, y_res
 
     @log_duration("Bed scan")
-    def _sample_path(self, params: BedMeshParams, path: list[Point]) -> list[Sample]:
+    def _sample_path(
+        self, params: BedMeshParams, path: list[Point], mesh_points: list[Point]
+    ) -> tuple[list[Sample], list[float]]:
         runs = params.runs
         height = params.height
         speed = params.speed
 
-        self.toolhead.move(z=height, speed=5)
-        self._move_probe_to_point(path[0], speed)
-        self.toolhead.wait_moves()
+        with span("Move to start"):
+            self.toolhead.move(z=height, speed=5)
+            self._move_probe_to_point(path[0], speed)
+            self.toolhead.wait_moves()
 
         with self.probe.scan.start_session() as session:
-            session.wait_for(lambda samples: len(samples) >= 10)
+            with span("Sample wait"):
+                session.wait_for(lambda samples: len(samples) >= 10)
+                if params.auto_speed:
+                    session.wait_for(lambda samples: len(samples) >= RATE_SAMPLE_COUNT)
+            if params.auto_speed:
+                speed = self._compute_auto_speed(params, self._compute_spacing(mesh_points), session.get_items())
+            run_end_times: list[float] = []
             for i in range(runs):
-                sequence = path if i % 2 == 0 else reversed(path)
-                for point in sequence:
-                    self._move_probe_to_point(point, speed)
-                self.toolhead.dwell(0.250)
-                self.toolhead.wait_moves()
-            move_time = self.toolhead.get_last_move_time()
-            session.wait_for(lambda samples: samples[-1].time >= move_time)
-            count = len(session.items)
-            session.wait_for(lambda samples: len(samples) >= count + 10)
+                with span("Motion", run=i + 1, points=len(path)):
+                    sequence = path if i % 2 == 0 else reversed(path)
+                    for point in sequence:
+                        self._move_probe_to_point(point, speed)
+                    self.toolhead.dwell(0.250)
+                    self.toolhead.wait_moves()
+                run_end_times.append(self.toolhead.get_last_move_time())
+                if (
+                    params.convergence > 0
+                    and MIN_CONVERGED_RUNS - 1 <= i < runs - 1
+                    and self._has_converged(params, mesh_points, session, run_end_times)
+                ):
+                    break
+            with span("Sample wait"):
+                move_time = self.toolhead.get_last_move_time()
+                session.wait_for(lambda samples: samples[-1].time >= move_time)
+                count = len(session.items)
+                session.wait_for(lambda samples: len(samples) >= count + 10)
 
         samples = session.get_items()
-        logger.debug("Gathered %d samples", len(samples))
-        return samples
+        logger.debug("Gathered %d samples over %d runs", len(samples), len(run_end_times))
+        return samples, run_end_times
+
+    def _has_converged(
+        self, params: BedMeshParams, mesh_points: list[Point], session: Session[Sample], run_end_times: list[float]
+    ) -> bool:
+        end_time = run_end_times[-1]
+        with span("Sample wait"):
+            session.wait_for(lambda samples: samples[-1].time >= end_time)
+        with span("Executor round-trip", samples=len(session.items)):
+            spread = executor_for(self.task_executor, "convergence").run(
+                self.estimate_spread,
+                mesh_points,
+                list(session.items),
+                run_end_times,
+                params.direction_correction,
+            )
+        logger.debug("Mesh confidence after %d runs: +/-%.4f mm", len(run_end_times), spread)
+        if spread > params.convergence:
+            return False
+        logger.info(
+            "Mesh converged to +/-%.4f mm after %d of %d runs",
+            spread,
+            len(run_end_times),
+            params.runs,
+        )
+        return True
+
+    def _compute_spacing(self, mesh_points: list[Point]) -> float:
+        points = np.array(mesh_points, dtype=float)
+        return float(min(np.min(np.diff(np.unique(points[:, axis]))) for axis in (0, 1)))
+
+    def _compute_auto_speed(self, params: BedMeshParams, spacing: float, samples: list[Sample]) -> float:
+        sample_rate = measure_sample_rate(samples)
+        # The alternating snake passes over every point twice per run
+        passes_per_run = 2 if params.path == "alternating_snake" else 1
+        # The scan may stop early on convergence, every point still needs its samples by then
+        runs = min(params.runs, MIN_CONVERGED_RUNS) if params.convergence > 0 else params.runs
+        speed = compute_auto_speed(
+            sample_rate=sample_rate,
+            spacing=spacing,
+            min_samples=params.min_samples,
+            passes=runs * passes_per_run,
+            max_speed=self.toolhead.get_max_velocity(),
+        )
+        logger.info(
+            "Automatic mesh speed %.1f mm/s (sample rate %.0f Hz, spacing %.2f mm, %d samples per point)",
+            speed,
+            sample_rate,
+            spacing,
+            params.min_samples,
+        )
+        return speed
 
     def _probe_point_to_nozzle_point(self, point: Point) -> Point:
         x, y = point
@@ -254,15 +397,39 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
         x, y = self._probe_point_to_nozzle_point(point)
         self.toolhead.move(x=float(x), y=float(y), speed=speed)
 
+    def estimate_spread(
+        self, mesh_points: list[Point], samples: list[Sample], run_end_times: list[float], correct_direction: bool
+    ) -> float:
+        nozzle_points = [self._probe_point_to_nozzle_point(p) for p in mesh_points]
+        return estimate_run_spread(
+            nozzle_points,
+            samples,
+            self.probe.scan.calculate_sample_distance,
+            run_end_times,
+            correct_direction=correct_direction,
+        )
+
     @log_duration("Cluster position computation")
     def assign_positions_to_points(
-        self, mesh_points: list[Point], samples: list[Sample], height: float
-    ) -> list[Position]:
+        self,
+        mesh_points: list[Point],
+        samples: list[Sample],
+        height: float,
+        correct_direction: bool = False,
+        run_end_times: list[float] | None = None,
+    ) -> tuple[MeshGrid, MeshQuality]:
         nozzle_points = [self._probe_point_to_nozzle_point(p) for p in mesh_points]
-        results = assign_samples_to_grid(nozzle_points, samples, self.probe.scan.calculate_sample_distance)
+        results = assign_samples_to_grid(
+            nozzle_points,
+            samples,
+            self.probe.scan.calculate_sample_distance,
+            correct_direction=correct_direction,
+            run_end_times=run_end_times,
+        )
+        quality = MeshQuality.from_results(results, self._nozzle_point_to_probe_point)
 
-        positions: list[Position] = []
-        for result in results:
+        points = np.empty((len(results), 3))
+        for i, result in enumerate(results):
             rx, ry = result.point
             if not isfinite(result.z):
                 msg = f"Cluster ({rx:.2f},{ry:.2f}) has no valid samples"
@@ -271,6 +438,6 @@ class BedMeshCalibrateMacro(Macro, SupportsFallbackMacro):
             z = height - result.z
             compensated = self.toolhead.apply_axis_twist_compensation(Position(x=float(rx), y=float(ry), z=z))
             px, py = self._nozzle_point_to_probe_point(result.point)
-            positions.append(Position(x=float(px), y=float(py), z=compensated.z))
+            points[i] = (px, py, compensated.z)
 
-        return positions
+        return mesh_grid_from_points(points), quality
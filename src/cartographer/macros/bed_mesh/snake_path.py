@@ -40,7 +40,6 @@ class SnakePathGenerator(PathGenerator):
             if i > 0:
                 # Create U-turn arc between previous end and current start
                 prev_last = prev_row[-1]
-                print(f"prev_last: {prev_last}, row: {row}, prev_row: {prev_row}")
                 curr_first = row[0]
                 entry_dir = row_direction(prev_row[-2:])
 
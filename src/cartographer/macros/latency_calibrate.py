@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, final
+
+import numpy as np
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Macro, MacroParams
+
+if TYPE_CHECKING:
+    from cartographer.interfaces.configuration import Configuration
+    from cartographer.interfaces.printer import Mcu, Sample, Toolhead
+    from cartographer.probe.scan_mode import ScanMode
+
+logger = logging.getLogger(__name__)
+
+MIN_VELOCITY = 0.5  # mm/s, samples slower than this carry no latency information
+MAX_LATENCY = 0.05  # s, anything beyond this is not a sensor delay
+SWEEP_BOTTOM = 1.0
+SWEEP_RANGE = 3.0
+
+
+@dataclass(frozen=True)
+class LatencyEstimate:
+    latency: float
+    direction_offset: float
+    residual: float
+    sample_count: int
+
+
+def estimate_sample_latency(samples: list[Sample], calculate_distance: Callable[[Sample], float]) -> LatencyEstimate:
+    """Estimate the delay between a sample's timestamp and the position it was measured at.
+
+    Samples from a bidirectional z sweep satisfy
+    ``distance - z = c + direction * offset - direction * velocity * latency``,
+    where the direction offset absorbs mechanical backlash.
+    Sweeping at more than one speed makes the two terms separable.
+    """
+    usable = [s for s in samples if s.position is not None and s.velocity is not None]
+    z = np.array([s.position.z for s in usable if s.position is not None], dtype=float)
+    velocity = np.array([s.velocity for s in usable], dtype=float)
+    distance = np.array([calculate_distance(s) for s in usable], dtype=float)
+
+    direction = np.sign(np.gradient(z)) if len(z) > 1 else np.zeros_like(z)
+    mask = (direction != 0) & (velocity > MIN_VELOCITY) & np.isfinite(distance)
+    if np.count_nonzero(mask) < 3 or len(np.unique(direction[mask])) < 2:
+        msg = "Not enough moving samples in both directions to estimate latency"
+        raise RuntimeError(msg)
+
+    direction = direction[mask]
+    velocity = velocity[mask]
+    residual = distance[mask] - z[mask]
+
+    design = np.column_stack([np.ones_like(direction), direction, direction * velocity])
+    coefficients, *_ = np.linalg.lstsq(design, residual, rcond=None)
+    error = residual - design @ coefficients
+
+    return LatencyEstimate(
+        latency=-float(coefficients[2]),
+        direction_offset=float(coefficients[1]),
+        residual=float(np.std(error)),
+        sample_count=int(np.count_nonzero(mask)),
+    )
+
+
+@final
+class LatencyCalibrateMacro(Macro):
+    description = "Sweep the probe up and down to calibrate the delay between samples and toolhead position."
+
+    def __init__(self, mcu: Mcu, scan: ScanMode, toolhead: Toolhead, config: Configuration) -> None:
+        self._mcu = mcu
+        self._scan = scan
+        self._toolhead = toolhead
+        self._config = config
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        speed = params.get_float("SPEED", default=10, above=1)
+        iterations = params.get_int("ITERATIONS", default=3, minval=1)
+
+        if not all(self._toolhead.is_homed(axis) for axis in ("x", "y", "z")):
+            msg = "Must home all axes before latency calibration"
+            raise RuntimeError(msg)
+        if not self._scan.has_model():
+            msg = "Scan must be calibrated before latency calibration"
+            raise RuntimeError(msg)
+
+        x, y = self._config.bed_mesh.zero_reference_position
+        self._toolhead.move(z=SWEEP_BOTTOM, speed=5)
+        self._toolhead.move(
+            x=x - self._config.general.x_offset,
+            y=y - self._config.general.y_offset,
+            speed=self._config.general.travel_speed,
+        )
+        self._toolhead.wait_moves()
+
+        with self._scan.start_session() as session:
+            for _ in range(iterations):
+                # Two speeds separate the latency from direction dependent offsets
+                for sweep_speed in (speed, speed / 2):
+                    self._toolhead.move(z=SWEEP_BOTTOM + SWEEP_RANGE, speed=sweep_speed)
+                    self._toolhead.move(z=SWEEP_BOTTOM, speed=sweep_speed)
+            self._toolhead.dwell(0.250)
+            self._toolhead.wait_moves()
+            move_time = self._toolhead.get_last_move_time()
+            session.wait_for(lambda samples: samples[-1].time >= move_time)
+
+        estimate = estimate_sample_latency(session.get_items(), self._scan.calculate_sample_distance)
+        logger.debug(
+            "Latency estimate %.6f s, direction offset %.6f mm, residual %.6f mm over %d samples",
+            estimate.latency,
+            estimate.direction_offset,
+            estimate.residual,
+            estimate.sample_count,
+        )
+
+        # Samples were positioned with the current latency, the estimate is what remains
+        latency = self._config.scan.sample_latency + estimate.latency
+        if abs(latency) > MAX_LATENCY:
+            msg = f"Estimated latency {latency * 1000:.2f} ms is implausible, check the scan model and try again"
+            raise RuntimeError(msg)
+
+        self._mcu.set_sample_latency(latency)
+        self._config.save_sample_latency(latency)
+        logger.info(
+            """
+            Sample latency calibrated to %.2f ms.
+            The SAVE_CONFIG command will update the printer config file and restart the printer.
+            """,
+            latency * 1000,
+        )
@@ -7,7 +7,9 @@ from typing import TYPE_CHECKING, final
 import numpy as np
 from typing_extensions import override
 
-from cartographer.interfaces.printer import Macro, MacroParams
+from cartographer.interfaces.printer import Macro, MacroParams, Position
+from cartographer.lib.statistics import allan_deviation
+from cartographer.macros.utils import get_choice
 from cartographer.probe.scan_model import ScanModel
 
 if TYPE_CHECKING:
@@ -17,6 +19,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+STREAM_SKIP_COUNT = 5
+ACCURACY_METHODS = ("scan", "stream")
+
 
 @final
 class ProbeMacro(Macro):
@@ -37,17 +42,32 @@ class ProbeMacro(Macro):
 class ProbeAccuracyMacro(Macro):
     description = "Probe the bed multiple times to measure the accuracy of the probe."
 
-    def __init__(self, probe: Probe, toolhead: Toolhead) -> None:
+    def __init__(self, probe: Probe, toolhead: Toolhead, stream_window: int = 20) -> None:
         self._probe = probe
         self._toolhead = toolhead
+        self._stream_window = stream_window
 
     @override
     def run(self, params: MacroParams) -> None:
+        method = get_choice(params, "METHOD", ACCURACY_METHODS, default="scan")
         lift_speed = params.get_float("LIFT_SPEED", 5.0, above=0)
         retract = params.get_float("SAMPLE_RETRACT_DIST", 1.0, minval=0)
         sample_count = params.get_int("SAMPLES", 10, minval=1)
         position = self._toolhead.get_position()
 
+        if method == "stream":
+            window = params.get_int("WINDOW", self._stream_window, minval=1)
+            logger.info(
+                "PROBE_ACCURACY METHOD=stream at X:%.3f Y:%.3f Z:%.3f (samples=%d window=%d)",
+                position.x,
+                position.y,
+                position.z,
+                sample_count,
+                window,
+            )
+            self._run_stream(sample_count, window)
+            return
+
         logger.info(
             "PROBE_ACCURACY at X:%.3f Y:%.3f Z:%.3f (samples=%d retract=%.3f lift_speed=%.1f)",
             position.x,
@@ -67,6 +87,46 @@ class ProbeAccuracyMacro(Macro):
             self._toolhead.move(z=pos.z + retract, speed=lift_speed)
         logger.debug("Measurements gathered: %s", measurements)
 
+        self._log_results(measurements)
+
+    def _run_stream(self, sample_count: int, window: int) -> None:
+        """Hold position and split one continuous session into consecutive measurement windows."""
+        scan = self._probe.scan
+        # A regular probe brings the toolhead to the probe height
+        _ = self._probe.perform_scan()
+        self._toolhead.wait_moves()
+
+        required = STREAM_SKIP_COUNT + sample_count * window
+        with scan.start_session() as session:
+            session.wait_for(lambda samples: len(samples) >= required)
+        samples = session.get_items()[STREAM_SKIP_COUNT:required]
+
+        position = self._toolhead.get_position()
+        # Same compensation perform_scan applies to its result
+        heights = np.array(
+            [
+                self._toolhead.apply_axis_twist_compensation(
+                    Position(position.x, position.y, position.z + scan.probe_height - scan.calculate_sample_distance(s))
+                ).z
+                for s in samples
+            ]
+        )
+        measurements = np.median(heights.reshape(sample_count, window), axis=1).tolist()
+        logger.debug("Measurements gathered: %s", measurements)
+        self._log_results(measurements)
+
+        duration = samples[-1].time - samples[0].time
+        if duration <= 0 or len(samples) < 3:
+            return
+        sample_rate = (len(samples) - 1) / duration
+        logger.info(
+            "Allan deviation over %.2f s at %.0f Hz: %s",
+            duration,
+            sample_rate,
+            ", ".join(f"{tau:.3f}s={deviation:.6f}" for tau, deviation in allan_deviation(heights, sample_rate)),
+        )
+
+    def _log_results(self, measurements: list[float]) -> None:
         max_value = max(measurements)
         min_value = min(measurements)
         range_value = max_value - min_value
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, final
+
+from typing_extensions import assert_never, override
+
+from cartographer.interfaces.printer import Macro, MacroParams
+from cartographer.macros.utils import get_enum_choice, get_filename
+
+if TYPE_CHECKING:
+    from cartographer.lib.stream_recording import SupportsStreamRecording
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 50  # MiB
+MAX_SIZE = 1024  # MiB
+
+
+class StreamRecordAction(Enum):
+    START = "start"
+    STOP = "stop"
+
+
+@final
+class StreamRecordMacro(Macro):
+    description = "Record the raw sensor stream to a file for offline replay."
+
+    def __init__(self, mcu: SupportsStreamRecording, state_dir: str) -> None:
+        self._mcu = mcu
+        self._state_dir = state_dir
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        action = get_enum_choice(params, "ACTION", StreamRecordAction, default=StreamRecordAction.START)
+        if action is StreamRecordAction.START:
+            return self._start(params)
+        elif action is StreamRecordAction.STOP:
+            return self._stop()
+
+        assert_never(action)
+
+    def _start(self, params: MacroParams) -> None:
+        filename = get_filename(params, "FILENAME", time.strftime("cartographer_stream_%Y%m%d_%H%M%S.bin"))
+        max_size = params.get_int("MAX_SIZE", DEFAULT_MAX_SIZE, minval=1, maxval=MAX_SIZE)
+
+        path = os.path.join(self._state_dir, filename)
+        _ = self._mcu.start_recording(path, max_size * 1024 * 1024)
+        logger.info("Recording sensor stream to %s, up to %d MiB", path, max_size)
+
+    def _stop(self) -> None:
+        recorder = self._mcu.stop_recording()
+        if recorder is None:
+            logger.info("No sensor stream recording is active")
+            return
+        logger.info(
+            """
+            Stopped recording sensor stream to %s
+            %d records, %d bytes%s
+            """,
+            recorder.path,
+            recorder.records,
+            recorder.size,
+            " (size limit reached)" if recorder.truncated else "",
+        )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, final
+
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Macro, MacroParams
+
+if TYPE_CHECKING:
+    from cartographer.lib.stream_stats import Histogram, StreamStats
+
+logger = logging.getLogger(__name__)
+
+
+def _format_ms(histogram: Histogram) -> str:
+    return (
+        f"mean {histogram.mean * 1000:.2f} ms, p50 {histogram.quantile(0.5) * 1000:.2f} ms, "
+        f"p99 {histogram.quantile(0.99) * 1000:.2f} ms, max {histogram.max * 1000:.2f} ms"
+    )
+
+
+@final
+class StreamStatsMacro(Macro):
+    description = "Report the health of the sensor data stream."
+
+    def __init__(self, stats: StreamStats) -> None:
+        self._stats = stats
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        reset = params.get_int("RESET", default=0) != 0
+        stats = self._stats
+
+        logger.info(
+            """
+            Sensor stream: %d samples at %.1f/s, %d dropped
+            Sample interval: %s
+            Handler time: %s
+            Processing lag: %s
+            """,
+            stats.samples,
+            stats.sample_rate,
+            stats.drops,
+            _format_ms(stats.gaps),
+            _format_ms(stats.handler_times),
+            _format_ms(stats.lag),
+        )
+        if reset:
+            stats.reset()
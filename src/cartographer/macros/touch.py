@@ -7,10 +7,11 @@ import numpy as np
 from typing_extensions import override
 
 from cartographer.interfaces.printer import Macro, MacroParams
-from cartographer.lib.statistics import compute_mad
+from cartographer.lib.statistics import RunningMedianMAD
+from cartographer.macros.utils import get_point_list
 
 if TYPE_CHECKING:
-    from cartographer.interfaces.printer import Toolhead
+    from cartographer.interfaces.printer import Position, Toolhead
     from cartographer.probe.touch_mode import TouchMode
 
 
@@ -32,6 +33,29 @@ class TouchMacro(Macro):
         self.last_trigger_position = trigger_position
 
 
+@final
+class TouchPointsMacro(Macro):
+    description = "Touch the bed at a list of points, e.g. POINTS=10,10,100,10."
+    last_results: list[Position] | None = None
+
+    def __init__(self, probe: TouchMode) -> None:
+        self._probe = probe
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        points = get_point_list(params, "POINTS")
+        results = self._probe.perform_probe_many(points)
+
+        heights = [result.z for result in results]
+        logger.info(
+            "Touched %d points, range %.6f: %s",
+            len(results),
+            max(heights) - min(heights),
+            ", ".join(f"({r.x:.2f},{r.y:.2f})={r.z:.6f}" for r in results),
+        )
+        self.last_results = results
+
+
 @final
 class TouchAccuracyMacro(Macro):
     description = "Touch the bed multiple times to measure the accuracy of the probe."
@@ -59,9 +83,11 @@ class TouchAccuracyMacro(Macro):
 
         self._toolhead.move(z=position.z + retract, speed=lift_speed)
         measurements: list[float] = []
+        running = RunningMedianMAD()
         while len(measurements) < sample_count:
             trigger_pos = self._probe.perform_probe()
             measurements.append(trigger_pos)
+            running.add(trigger_pos)
             pos = self._toolhead.get_position()
             self._toolhead.move(z=pos.z + retract, speed=lift_speed)
         logger.debug("Measurements gathered: %s", ", ".join(f"{m:.6f}" for m in measurements))
@@ -70,9 +96,9 @@ class TouchAccuracyMacro(Macro):
         min_value = min(measurements)
         range_value = max_value - min_value
         avg_value = np.mean(measurements)
-        median = np.median(measurements)
+        median = running.median
         std_dev = np.std(measurements)
-        mad = compute_mad(measurements)
+        mad = running.mad
 
         logger.info(
             """
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import replace
-from typing import TYPE_CHECKING, final
+from dataclasses import asdict, replace
+from typing import TYPE_CHECKING, Callable, final
 
 from typing_extensions import override
 
 from cartographer.interfaces.configuration import Configuration, TouchModelConfiguration
 from cartographer.interfaces.printer import Macro, MacroParams, Mcu
-from cartographer.lib.statistics import compute_mad
+from cartographer.lib.sequential_test import MIN_ACCEPT_SAMPLES, Decision, SequentialScoreTest
+from cartographer.lib.statistics import RunningMedianMAD, compute_mad
+from cartographer.lib.tracing import span, traced
+from cartographer.macros.touch_calibrate_checkpoint import CalibrationSettings, TouchCalibrationCheckpoint
 from cartographer.macros.utils import get_choice
 from cartographer.probe.touch_mode import MAD_TOLERANCE, TouchMode, TouchModeConfiguration
 
@@ -25,18 +28,53 @@ MIN_ALLOWED_STEP = 75
 MAX_ALLOWED_STEP = 500
 DEFAULT_TOUCH_MODEL_NAME = "default"
 DEFAULT_Z_OFFSET = -0.05
+BRACKET_GROWTH = 1.5
+SEARCH_RESOLUTION = MIN_ALLOWED_STEP
+SEARCH_METHODS = ("bracket", "linear")
+DEFAULT_SETTINGS = CalibrationSettings(
+    model_name=DEFAULT_TOUCH_MODEL_NAME,
+    speed=3,
+    threshold_start=500,
+    threshold_max=3000,
+    strategy="default",
+    search="bracket",
+)
 
 
 class CalibrationStrategy(ABC):
+    tolerance: float = MAD_TOLERANCE
+
     @abstractmethod
     def compute_score(self, samples: list[float]) -> float: ...
     @abstractmethod
     def is_acceptable(self, score: float) -> bool: ...
     @abstractmethod
-    def should_stop_early(self, samples: list[float]) -> bool: ...
+    def should_stop_early(self, count: int, score: float) -> bool: ...
     @abstractmethod
     def compute_step_increase(self, current_threshold: int, score: float) -> int: ...
 
+    def running_score(self, running: RunningMedianMAD) -> float:
+        """The score of the values in a running estimator, strategies override this to skip rescoring."""
+        return self.compute_score(list(running.values))
+
+    def decide(
+        self,
+        samples: list[float],
+        min_accept_samples: int = MIN_ACCEPT_SAMPLES,
+        running: RunningMedianMAD | None = None,
+    ) -> Decision:
+        """Whether the samples collected so far settle acceptability of the threshold.
+
+        Pass a running estimator kept up to date with the samples to score them without starting over.
+        """
+        test = SequentialScoreTest(self.tolerance, min_accept_samples=min_accept_samples)
+        if len(samples) < test.min_samples:
+            return Decision.CONTINUE
+        score = self.running_score(running if running is not None else RunningMedianMAD(samples))
+        if self.should_stop_early(len(samples), score):
+            return Decision.REJECT
+        return test.decide_score(score, len(samples))
+
 
 @final
 class DefaultCalibrationStrategy(CalibrationStrategy):
@@ -46,15 +84,19 @@ class DefaultCalibrationStrategy(CalibrationStrategy):
     def compute_score(self, samples: list[float]) -> float:
         return compute_mad(samples)
 
+    @override
+    def running_score(self, running: RunningMedianMAD) -> float:
+        return running.mad
+
     @override
     def is_acceptable(self, score: float) -> bool:
-        return score <= MAD_TOLERANCE
+        return score <= self.tolerance
 
     @override
-    def should_stop_early(self, samples: list[float]) -> bool:
-        if len(samples) < 3:
+    def should_stop_early(self, count: int, score: float) -> bool:
+        if count < 3:
             return False
-        return self.compute_score(samples) > 5 * MAD_TOLERANCE
+        return score > 5 * MAD_TOLERANCE
 
     @override
     def compute_step_increase(self, current_threshold: int, score: float) -> int:
@@ -69,19 +111,25 @@ class DefaultCalibrationStrategy(CalibrationStrategy):
 class AggressiveCalibrationStrategy(CalibrationStrategy):
     """Faster calibration with larger threshold steps."""
 
+    tolerance = MAD_TOLERANCE * 1.2  # Slightly more lenient
+
     @override
     def compute_score(self, samples: list[float]) -> float:
         return compute_mad(samples)
 
+    @override
+    def running_score(self, running: RunningMedianMAD) -> float:
+        return running.mad
+
     @override
     def is_acceptable(self, score: float) -> bool:
-        return score <= MAD_TOLERANCE * 1.2  # Slightly more lenient
+        return score <= self.tolerance
 
     @override
-    def should_stop_early(self, samples: list[float]) -> bool:
-        if len(samples) < 3:
+    def should_stop_early(self, count: int, score: float) -> bool:
+        if count < 3:
             return False
-        return self.compute_score(samples) > 10 * MAD_TOLERANCE  # Only stop for extreme cases
+        return score > 10 * MAD_TOLERANCE  # Only stop for extreme cases
 
     @override
     def compute_step_increase(self, current_threshold: int, score: float) -> int:
@@ -100,9 +148,13 @@ class PrecisionCalibrationStrategy(CalibrationStrategy):
 
     @override
     def compute_score(self, samples: list[float]) -> float:
-        mad = compute_mad(samples)
-        sample_range = max(samples) - min(samples)
+        return self._score(compute_mad(samples), max(samples) - min(samples))
+
+    @override
+    def running_score(self, running: RunningMedianMAD) -> float:
+        return self._score(running.mad, running.value_range)
 
+    def _score(self, mad: float, sample_range: float) -> float:
         # Cap the range contribution to prevent overreaction
         capped_range = min(sample_range / 2, self.RANGE_CAP)
 
@@ -111,13 +163,13 @@ class PrecisionCalibrationStrategy(CalibrationStrategy):
 
     @override
     def is_acceptable(self, score: float) -> bool:
-        return score <= MAD_TOLERANCE * 1.0  # Slightly relaxed
+        return score <= self.tolerance
 
     @override
-    def should_stop_early(self, samples: list[float]) -> bool:
-        if len(samples) < 5:
+    def should_stop_early(self, count: int, score: float) -> bool:
+        if count < 5:
             return False
-        return self.compute_score(samples) > MAD_TOLERANCE * 3.0
+        return score > MAD_TOLERANCE * 3.0
 
     @override
     def compute_step_increase(self, current_threshold: int, score: float) -> int:
@@ -139,20 +191,74 @@ STRATEGY_MAP = {
 class TouchCalibrateMacro(Macro):
     description = "Run the touch calibration"
 
-    def __init__(self, probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration) -> None:
+    def __init__(
+        self,
+        probe: Probe,
+        mcu: Mcu,
+        toolhead: Toolhead,
+        config: Configuration,
+        checkpoint_path: str | None = None,
+    ) -> None:
         self._probe = probe
         self._mcu = mcu
         self._toolhead = toolhead
         self._config = config
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint: TouchCalibrationCheckpoint | None = None
+
+    def _parse_settings(
+        self, params: MacroParams, defaults: CalibrationSettings = DEFAULT_SETTINGS
+    ) -> CalibrationSettings:
+        threshold_start = params.get_int("START", default=defaults.threshold_start, minval=100)
+        return CalibrationSettings(
+            model_name=params.get("MODEL_NAME", defaults.model_name),
+            speed=params.get_int("SPEED", default=defaults.speed, minval=1, maxval=5),
+            threshold_start=threshold_start,
+            threshold_max=params.get_int("MAX", default=defaults.threshold_max, minval=threshold_start),
+            strategy=get_choice(params, "STRATEGY", default=defaults.strategy, choices=STRATEGY_MAP.keys()),
+            search=get_choice(params, "SEARCH", default=defaults.search, choices=SEARCH_METHODS),
+        )
+
+    def _open_checkpoint(self, params: MacroParams) -> TouchCalibrationCheckpoint | None:
+        resume = params.get_int("RESUME", default=0) != 0
+        if self._checkpoint_path is None:
+            if resume:
+                msg = "Resuming touch calibration is not supported"
+                raise RuntimeError(msg)
+            return None
+
+        if not resume:
+            # Not saved until the calibration is about to start
+            return TouchCalibrationCheckpoint(self._checkpoint_path, self._parse_settings(params))
+
+        checkpoint = TouchCalibrationCheckpoint.load(self._checkpoint_path)
+        # Parameters left out keep the checkpoint's values, any given have to match them
+        requested = self._parse_settings(params, defaults=checkpoint.settings)
+        if requested != checkpoint.settings:
+            changed = ", ".join(
+                f"{name}={getattr(requested, name)} (checkpoint {value})"
+                for name, value in asdict(checkpoint.settings).items()
+                if getattr(requested, name) != value
+            )
+            msg = f"Touch calibration checkpoint was started with different parameters: {changed}"
+            raise RuntimeError(msg)
+        logger.info(
+            "Resuming touch calibration with %d thresholds already tested",
+            len(checkpoint.results),
+        )
+        return checkpoint
 
     @override
     def run(self, params: MacroParams) -> None:
-        name = params.get("MODEL_NAME", DEFAULT_TOUCH_MODEL_NAME)
-        speed = params.get_int("SPEED", default=3, minval=1, maxval=5)
-        threshold_start = params.get_int("START", default=500, minval=100)
-        threshold_max = params.get_int("MAX", default=3000, minval=threshold_start)
-        strategy_type = get_choice(params, "STRATEGY", default="default", choices=STRATEGY_MAP.keys())
+        checkpoint = self._open_checkpoint(params)
+        settings = checkpoint.settings if checkpoint is not None else self._parse_settings(params)
+        name = settings.model_name
+        speed = settings.speed
+        threshold_start = settings.threshold_start
+        threshold_max = settings.threshold_max
+        strategy_type = settings.strategy
         strategy = STRATEGY_MAP[strategy_type]()
+        search = settings.search
 
         if not self._toolhead.is_homed("x") or not self._toolhead.is_homed("y"):
             msg = "Must home x and y before calibration"
@@ -165,6 +271,9 @@ class TouchCalibrateMacro(Macro):
         )
         self._toolhead.wait_moves()
 
+        if checkpoint is not None:
+            checkpoint.save()
+
         logger.info(
             "Starting %s touch calibration at speed %d, threshold %d-%d",
             strategy_type,
@@ -183,17 +292,27 @@ class TouchCalibrateMacro(Macro):
         )
 
         forced_z = False
+        self._checkpoint = checkpoint
         try:
             if not self._toolhead.is_homed("z"):
                 forced_z = True
                 _, z_max = self._toolhead.get_z_axis_limits()
                 self._toolhead.set_z_position(z=z_max - 10)
 
-            threshold = self._find_acceptable_threshold(calibration_mode, threshold_start, threshold_max)
+            with span("Threshold search", search=search, strategy=strategy_type):
+                if search == "bracket":
+                    threshold = self._search_acceptable_threshold(calibration_mode, threshold_start, threshold_max)
+                else:
+                    threshold = self._find_acceptable_threshold(calibration_mode, threshold_start, threshold_max)
         finally:
+            self._checkpoint = None
             if forced_z:
                 self._toolhead.clear_z_homing_state()
 
+        # Only an interrupted calibration leaves its checkpoint behind
+        if checkpoint is not None:
+            checkpoint.clear()
+
         if threshold is None:
             logger.info(
                 """
@@ -229,15 +348,7 @@ class TouchCalibrateMacro(Macro):
         strategy = calibration_mode.strategy
 
         while current_threshold <= threshold_max:
-            samples = calibration_mode.collect_samples(current_threshold)
-            score = strategy.compute_score(samples)
-
-            logger.info(
-                "Threshold %d score: %.6f",
-                current_threshold,
-                score,
-            )
-            logger.debug("Samples: %s", ", ".join(f"{s:.6f}" for s in samples))
+            score = self._evaluate_threshold(calibration_mode, current_threshold)
 
             if strategy.is_acceptable(score):
                 logger.info("Threshold %d accepted (score %.6f)", current_threshold, score)
@@ -249,6 +360,68 @@ class TouchCalibrateMacro(Macro):
 
         return None
 
+    def _search_acceptable_threshold(
+        self, calibration_mode: CalibrationTouchMode, threshold_start: int, threshold_max: int
+    ) -> int | None:
+        """Bracket the lowest acceptable threshold with growing steps, then bisect the bracket."""
+        strategy = calibration_mode.strategy
+        lower: int | None = None
+        upper: int | None = None
+
+        current_threshold = threshold_start
+        while True:
+            score = self._evaluate_threshold(calibration_mode, current_threshold)
+            if strategy.is_acceptable(score):
+                upper = current_threshold
+                break
+            lower = current_threshold
+            if current_threshold >= threshold_max:
+                return None
+            current_threshold = min(threshold_max, int(current_threshold * BRACKET_GROWTH))
+            logger.info("Next threshold: %d", current_threshold)
+
+        if lower is None:
+            logger.info("Threshold %d accepted (score %.6f)", upper, score)
+            return upper
+
+        logger.info("Acceptable threshold is between %d and %d, refining", lower, upper)
+        while upper - lower > SEARCH_RESOLUTION:
+            middle = (lower + upper) // 2
+            if strategy.is_acceptable(self._evaluate_threshold(calibration_mode, middle)):
+                upper = middle
+            else:
+                lower = middle
+
+        logger.info("Threshold %d accepted", upper)
+        return upper
+
+    @traced("Threshold evaluation")
+    def _evaluate_threshold(self, calibration_mode: CalibrationTouchMode, threshold: int) -> float:
+        checkpoint = self._checkpoint
+        if checkpoint is None:
+            samples = calibration_mode.collect_samples(threshold)
+            score = calibration_mode.strategy.compute_score(samples)
+        elif threshold in checkpoint.results:
+            result = checkpoint.results[threshold]
+            samples, score = result.samples, result.score
+            logger.info("Threshold %d already tested", threshold)
+        else:
+            samples = calibration_mode.collect_samples(
+                threshold,
+                checkpoint.in_progress.get(threshold),
+                on_sample=lambda touches: checkpoint.record_touches(threshold, touches),
+            )
+            score = calibration_mode.strategy.compute_score(samples)
+            checkpoint.record_result(threshold, samples, score)
+
+        logger.info(
+            "Threshold %d score: %.6f",
+            threshold,
+            score,
+        )
+        logger.debug("Samples: %s", ", ".join(f"{s:.6f}" for s in samples))
+        return score
+
 
 @final
 class CalibrationTouchMode(TouchMode):
@@ -271,15 +444,37 @@ class CalibrationTouchMode(TouchMode):
         self._models["calibration"] = replace(self._models["calibration"], threshold=threshold)
         self.load_model("calibration")
 
-    def collect_samples(self, threshold: int) -> list[float]:
-        samples: list[float] = []
+    def collect_samples(
+        self,
+        threshold: int,
+        samples: list[float] | None = None,
+        on_sample: Callable[[list[float]], None] | None = None,
+    ) -> list[float]:
+        samples = list(samples or [])
+        running = RunningMedianMAD(samples)
         self.set_threshold(threshold)
 
-        for _ in range(self._config.samples * 3):
-            pos = self._perform_single_probe()
-            samples.append(pos)
+        max_samples = self._config.samples * 3
+        # Never settle for fewer touches than a TOUCH would take
+        min_accept_samples = max(self._config.samples, MIN_ACCEPT_SAMPLES)
+        decision = self.strategy.decide(samples, min_accept_samples, running)
+        while decision is Decision.CONTINUE and len(samples) < max_samples:
+            with span("Touch", threshold=threshold):
+                samples.append(self._perform_single_probe())
+            running.add(samples[-1])
+            logger.debug(
+                "Threshold %d touch %d: %.6f (median %.6f, MAD %.6f)",
+                threshold,
+                len(samples),
+                samples[-1],
+                running.median,
+                running.mad,
+            )
+            if on_sample is not None:
+                on_sample(samples)
+            decision = self.strategy.decide(samples, min_accept_samples, running)
 
-            if self.strategy.should_stop_early(samples):
-                break
+        if decision is not Decision.CONTINUE:
+            logger.debug("Threshold %d decided (%s) after %d touches", threshold, decision.value, len(samples))
 
-        return sorted(samples)
+        return list(running.values)
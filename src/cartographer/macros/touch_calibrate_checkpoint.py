@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import final
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = "cartographer_touch_calibrate.json"
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CalibrationSettings:
+    model_name: str
+    speed: int
+    threshold_start: int
+    threshold_max: int
+    strategy: str
+    search: str
+
+
+@dataclass
+class ThresholdResult:
+    samples: list[float]
+    score: float
+
+
+@final
+@dataclass
+class TouchCalibrationCheckpoint:
+    """Progress of a touch calibration, written to disk after every touch so it can be resumed."""
+
+    path: str
+    settings: CalibrationSettings
+    results: dict[int, ThresholdResult] = field(default_factory=dict)
+    in_progress: dict[int, list[float]] = field(default_factory=dict)
+
+    @staticmethod
+    def load(path: str) -> TouchCalibrationCheckpoint:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") != CHECKPOINT_VERSION:
+                msg = f"unsupported version {data.get('version')}"
+                raise ValueError(msg)
+            return TouchCalibrationCheckpoint(
+                path=path,
+                settings=CalibrationSettings(**data["settings"]),
+                results={int(t): ThresholdResult(**r) for t, r in data["results"].items()},
+                in_progress={int(t): list(s) for t, s in data["in_progress"].items()},
+            )
+        except FileNotFoundError:
+            msg = "No touch calibration checkpoint to resume"
+            raise RuntimeError(msg) from None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            msg = f"Unable to read touch calibration checkpoint {path}: {e}"
+            raise RuntimeError(msg) from e
+
+    def record_touches(self, threshold: int, samples: list[float]) -> None:
+        self.in_progress[threshold] = list(samples)
+        self.save()
+
+    def record_result(self, threshold: int, samples: list[float], score: float) -> None:
+        _ = self.in_progress.pop(threshold, None)
+        self.results[threshold] = ThresholdResult(list(samples), score)
+        self.save()
+
+    def save(self) -> None:
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "settings": asdict(self.settings),
+            "results": {str(t): asdict(r) for t, r in self.results.items()},
+            "in_progress": {str(t): s for t, s in self.in_progress.items()},
+        }
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump(data, f)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            # Losing the checkpoint must never abort the calibration itself
+            logger.warning("Unable to save touch calibration checkpoint: %s", e)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Unable to remove touch calibration checkpoint: %s", e)
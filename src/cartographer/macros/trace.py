@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, final
+
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Macro, MacroParams
+from cartographer.macros.utils import get_filename
+
+if TYPE_CHECKING:
+    from cartographer.lib.tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+
+@final
+class TraceExportMacro(Macro):
+    description = "Export recent timing spans as a Chrome trace."
+
+    def __init__(self, tracer: Tracer, state_dir: str) -> None:
+        self._tracer = tracer
+        self._state_dir = state_dir
+
+    @override
+    def run(self, params: MacroParams) -> None:
+        filename = get_filename(params, "FILENAME", time.strftime("cartographer_trace_%Y%m%d_%H%M%S.json"))
+        clear = params.get_int("CLEAR", default=0) != 0
+
+        path = os.path.join(self._state_dir, filename)
+        span_count = len(self._tracer.spans)
+        with open(path, "w") as f:
+            json.dump(self._tracer.to_chrome_trace(), f)
+        if clear:
+            self._tracer.clear()
+
+        logger.info(
+            """
+            Exported %d spans to %s
+            Open it in chrome://tracing or https://ui.perfetto.dev
+            """,
+            span_count,
+            path,
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from enum import Enum
 from typing import TYPE_CHECKING, Iterable, TypeVar
 
@@ -61,3 +62,24 @@ def get_float_tuple(params: MacroParams, option: str, default: tuple[float, floa
         raise ValueError(msg)
 
     return (float(parts[0]), float(parts[1]))
+
+
+def get_point_list(params: MacroParams, option: str) -> list[tuple[float, float]]:
+    """Parse a flat list of coordinates, e.g. ``POINTS=10,10,100,10``, into (x, y) pairs."""
+    param = params.get(option)
+    parts = [part for part in param.split(",") if part.strip()]
+    if not parts or len(parts) % 2 != 0:
+        msg = f"Expected pairs of float values for '{option}', got {len(parts)}: {param}"
+        raise ValueError(msg)
+
+    values = [float(part) for part in parts]
+    return list(zip(values[::2], values[1::2]))
+
+
+def get_filename(params: MacroParams, option: str, default: str) -> str:
+    """Parse a plain file name, files are only ever written inside the directory the macro chooses."""
+    filename = params.get(option, default=default)
+    if filename != os.path.basename(filename) or filename in ("", ".", ".."):
+        msg = f"Invalid file name '{filename}' for option '{option}', it must not contain a directory"
+        raise RuntimeError(msg)
+    return filename
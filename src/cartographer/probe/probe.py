@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, final
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from cartographer.interfaces.printer import Position
     from cartographer.probe.scan_mode import ScanMode
     from cartographer.probe.touch_mode import TouchMode
 
@@ -23,3 +26,6 @@ class Probe:
 
     def perform_touch(self) -> float:
         return self.touch.perform_probe()
+
+    def perform_touch_many(self, points: Sequence[tuple[float, float]]) -> list[Position]:
+        return self.touch.perform_probe_many(points)
@@ -38,6 +38,7 @@ class ScanModeConfiguration:
     y_offset: float
     travel_speed: float
     probe_speed: float
+    homing_approach_height: float
 
     samples: int
     models: dict[str, ScanModelConfiguration]
@@ -49,6 +50,7 @@ class ScanModeConfiguration:
             y_offset=config.general.y_offset,
             travel_speed=config.general.travel_speed,
             probe_speed=config.scan.probe_speed,
+            homing_approach_height=config.scan.homing_approach_height,
             samples=config.scan.samples,
             models=config.scan.models,
         )
@@ -82,6 +84,11 @@ class ScanMode(ScanModelSelectorMixin, ProbeMode, Endstop):
 
         self.last_z_result: float | None = None
 
+        self._coarse_approach: bool = False
+        self._homing_session: Session[Sample] | None = None
+        self._trigger_frequency: float = 0.0
+        self._trigger_distance: float | None = None
+
     @override
     def get_status(self, eventtime: float) -> object:
         return {
@@ -148,16 +155,57 @@ class ScanMode(ScanModelSelectorMixin, ProbeMode, Endstop):
     def get_endstop_position(self) -> float:
         return self.probe_height
 
+    @property
+    def two_stage_homing(self) -> bool:
+        return self._config.homing_approach_height > 0
+
+    @override
+    def on_home_begin(self, homing_state: HomingState) -> None:
+        # Only the first homing move of a z home is fast,
+        # the second move after the homing retract triggers at the probe height.
+        self._coarse_approach = False
+        if not self.two_stage_homing or not homing_state.is_homing_z():
+            return
+        approach_height = self._config.homing_approach_height
+        retract = homing_state.get_z_retract_distance()
+        if retract <= approach_height:
+            # Without a retract above the approach height there is no second move starting above the probe height
+            logger.warning(
+                """
+                homing_approach_height %.3f needs a z homing_retract_dist above it, got %.3f.
+                Homing z in a single move to the probe height.
+                """,
+                approach_height,
+                retract,
+            )
+            return
+        self._coarse_approach = True
+
     @override
     def home_start(self, print_time: float) -> object:
-        trigger_frequency = self.get_model().distance_to_frequency(self.probe_height)
-        return self._mcu.start_homing_scan(print_time, trigger_frequency)
+        trigger_distance = self.probe_height
+        if self._coarse_approach:
+            self._coarse_approach = False
+            trigger_distance += self._config.homing_approach_height
+        self._trigger_frequency = self.get_model().distance_to_frequency(trigger_distance)
+        self._trigger_distance = None
+
+        if self.two_stage_homing:
+            self._homing_session = self._mcu.start_session(lambda sample: sample.time >= print_time)
+        return self._mcu.start_homing_scan(print_time, self._trigger_frequency)
 
     @override
     def on_home_end(self, homing_state: HomingState) -> None:
+        self._coarse_approach = False
         if not homing_state.is_homing_z():
             return
-        distance = self.measure_distance()
+        distance = self._trigger_distance
+        self._trigger_distance = None
+        if distance is None:
+            distance = self.measure_distance()
+        else:
+            # The toolhead decelerates past the trigger sample, the homed position is where it halted
+            distance -= homing_state.get_z_overshoot()
         if math.isinf(distance):
             msg = "Toolhead stopped outside model range"
             raise RuntimeError(msg)
@@ -166,7 +214,27 @@ class ScanMode(ScanModelSelectorMixin, ProbeMode, Endstop):
 
     @override
     def home_wait(self, home_end_time: float) -> float:
-        return self._mcu.stop_homing(home_end_time)
+        session = self._homing_session
+        self._homing_session = None
+        if session is None:
+            return self._mcu.stop_homing(home_end_time)
+
+        with session:
+            trigger_time = self._mcu.stop_homing(home_end_time)
+            if trigger_time <= 0:
+                return trigger_time
+            # The mcu triggered on this sample, so it is guaranteed to arrive
+            session.wait_for(lambda samples: self._find_trigger_sample(samples) is not None)
+        trigger = self._find_trigger_sample(session.get_items())
+        if trigger is None:
+            return trigger_time
+
+        self._trigger_distance = self.calculate_sample_distance(trigger)
+        logger.debug("Homing triggered at %.3f with distance %.3f", trigger.time, self._trigger_distance)
+        return trigger.time
+
+    def _find_trigger_sample(self, samples: list[Sample]) -> Sample | None:
+        return next((sample for sample in samples if sample.frequency >= self._trigger_frequency), None)
 
     def start_session(
         self,
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
 
-from numpy.polynomial import Polynomial
 from typing_extensions import override
 
 from cartographer.interfaces.configuration import ScanModelConfiguration
@@ -11,6 +10,8 @@ from cartographer.probe.model import ModelSelectorMixin
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from numpy.polynomial import Polynomial
+
     from cartographer.interfaces.printer import Sample
 
 
@@ -34,6 +35,9 @@ class ScanModel:
     @property
     def poly(self) -> Polynomial:
         if self._poly is None:
+            # Deferred until the first conversion, keeping numpy.polynomial off the startup path
+            from numpy.polynomial import Polynomial
+
             self._poly = Polynomial(self.config.coefficients, domain=self.config.domain)
         return self._poly
 
@@ -50,6 +54,8 @@ class ScanModel:
         z_offsets = [pos.z for pos in positions if pos is not None]
         inverse_frequencies = [1 / sample.frequency for sample in samples]
 
+        from numpy.polynomial import Polynomial
+
         poly = cast("Polynomial", Polynomial.fit(inverse_frequencies, z_offsets, DEGREES))
         converted = cast("Polynomial", poly.convert(domain=poly.domain))
 
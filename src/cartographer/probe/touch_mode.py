@@ -9,13 +9,17 @@ import numpy as np
 from typing_extensions import override
 
 from cartographer.interfaces.printer import Endstop, HomingState, Mcu, Position, ProbeMode, Toolhead
-from cartographer.lib.statistics import compute_mad
+from cartographer.lib.sequential_test import Decision, SequentialScoreTest
+from cartographer.lib.statistics import RunningMedianMAD, compute_mad
 from cartographer.probe.touch_model import TouchModelSelectorMixin
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from cartographer.interfaces.configuration import Configuration, TouchModelConfiguration
+    from cartographer.interfaces.printer import Sample
+    from cartographer.probe.scan_mode import ScanMode
+    from cartographer.stream import Session
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +27,21 @@ logger = logging.getLogger(__name__)
 MAD_TOLERANCE = 0.0054  # Statistically equivalent to 0.008mm stddev
 RETRACT_DISTANCE = 2.0
 MAX_TOUCH_TEMPERATURE = 155
+APPROACH_SPEED = 10.0
+APPROACH_SAMPLES = 10
+# The fast approach is not a homing move, it has to stop short of the bed even when the scan estimate is off
+MIN_APPROACH_CLEARANCE = 0.5
+APPROACH_MAD_MARGIN = 5.0
+TRAVEL_HEIGHT = 5.0
 
 
 @dataclass(frozen=True)
 class TouchModeConfiguration:
     samples: int
     max_samples: int
+    approach_clearance: float
 
+    travel_speed: float
     x_offset: float
     y_offset: float
     mesh_min: tuple[float, float]
@@ -42,6 +54,8 @@ class TouchModeConfiguration:
         return TouchModeConfiguration(
             samples=config.touch.samples,
             max_samples=config.touch.max_samples,
+            approach_clearance=config.touch.approach_clearance,
+            travel_speed=config.general.travel_speed,
             models=config.touch.models,
             x_offset=config.general.x_offset,
             y_offset=config.general.y_offset,
@@ -89,6 +103,21 @@ class TouchBoundaries:
         )
 
 
+def order_by_travel(start: tuple[float, float], points: Sequence[tuple[float, float]]) -> list[int]:
+    """Greedy nearest neighbour visiting order starting from the current position."""
+    coords = np.array(points, dtype=float).reshape(-1, 2)
+    remaining = np.ones(len(coords), dtype=bool)
+    current = np.array(start, dtype=float)
+    order: list[int] = []
+    for _ in range(len(coords)):
+        distances = np.where(remaining, np.hypot(*(coords - current).T), np.inf)
+        index = int(np.argmin(distances))
+        order.append(index)
+        remaining[index] = False
+        current = coords[index]
+    return order
+
+
 class TouchMode(TouchModelSelectorMixin, ProbeMode, Endstop):
     """Implementation for Survey Touch."""
 
@@ -103,11 +132,15 @@ class TouchMode(TouchModelSelectorMixin, ProbeMode, Endstop):
     def is_ready(self) -> bool:
         return self.has_model()
 
-    def __init__(self, mcu: Mcu, toolhead: Toolhead, config: TouchModeConfiguration) -> None:
+    def __init__(
+        self, mcu: Mcu, toolhead: Toolhead, config: TouchModeConfiguration, scan: ScanMode | None = None
+    ) -> None:
         super().__init__(config.models)
         self._toolhead: Toolhead = toolhead
         self._mcu: Mcu = mcu
         self._config: TouchModeConfiguration = config
+        self._scan: ScanMode | None = scan
+        self._sequential_test = SequentialScoreTest(MAD_TOLERANCE)
 
         self.boundaries: TouchBoundaries = TouchBoundaries.from_config(config)
 
@@ -134,17 +167,62 @@ class TouchMode(TouchModelSelectorMixin, ProbeMode, Endstop):
         self.last_z_result = self._run_probe()
         return self.last_z_result
 
+    def perform_probe_many(self, points: Sequence[tuple[float, float]]) -> list[Position]:
+        """Touch every point, visiting them in travel order, and return the results in the given order."""
+        if not self._toolhead.is_homed("z"):
+            msg = "Z axis must be homed before probing"
+            raise RuntimeError(msg)
+
+        outside = [(x, y) for x, y in points if not self.is_within_boundaries(x=x, y=y)]
+        if outside:
+            formatted = ", ".join(f"({x:.2f},{y:.2f})" for x, y in outside)
+            msg = f"Points outside of the touch boundaries: {formatted}"
+            raise RuntimeError(msg)
+
+        pos = self._toolhead.get_position()
+        results: dict[int, Position] = {}
+        for index in order_by_travel((pos.x, pos.y), points):
+            x, y = points[index]
+            # Lift and travel are queued so they run back to back with the previous touch retract
+            if self._toolhead.get_position().z < TRAVEL_HEIGHT:
+                self._toolhead.move(z=TRAVEL_HEIGHT, speed=5)
+            self._toolhead.move(x=x, y=y, speed=self._config.travel_speed)
+            z = self._run_probe()
+            logger.debug("Touch at (%.2f,%.2f) is z=%.6f", x, y, z)
+            results[index] = Position(x, y, z)
+
+        return [results[i] for i in range(len(points))]
+
     def _run_probe(self) -> float:
+        if self._config.approach_clearance > 0 and self._scan is not None and self._scan.has_model():
+            with self._mcu.start_session() as session:
+                return self._collect_touches(session)
+        return self._collect_touches(None)
+
+    def _collect_touches(self, session: Session[Sample] | None) -> float:
+        """Touch until the samples agree, at most max_samples times.
+
+        The sequential test looks at every touch so far and can accept the set before `samples` touches,
+        `samples` is then a cap rather than an exact count. It needs MIN_ACCEPT_SAMPLES touches, with
+        fewer samples configured a combination of `samples` touches within tolerance always decides first.
+        """
         collected: list[float] = []
+        running = RunningMedianMAD()
         touch_samples = self._config.samples
         touch_max_samples = self._config.max_samples
         logger.debug("Starting touch sequence for %d samples within %d touches...", touch_samples, touch_max_samples)
 
         for i in range(touch_max_samples):
-            trigger_pos = self._perform_single_probe()
+            trigger_pos = self._perform_single_probe(session)
             collected.append(trigger_pos)
+            running.add(trigger_pos)
             logger.debug("Touch %d: %.6f", i + 1, trigger_pos)
 
+            if self._sequential_test.decide_score(running.mad, len(running)) is Decision.ACCEPT:
+                # The set is not validated like a combination, the median keeps stray touches out
+                self._log_sample_stats(f"Touches clearly within tolerance after {len(collected)} touches", collected)
+                return running.median
+
             if len(collected) < touch_samples:
                 continue
 
@@ -154,29 +232,65 @@ class TouchMode(TouchModelSelectorMixin, ProbeMode, Endstop):
 
             self._log_sample_stats("Acceptable touch combination found", valid_combo)
 
-            return float(np.median(valid_combo) if len(valid_combo) > 3 else np.mean(valid_combo))
+            return self._combine(valid_combo)
 
         self._log_sample_stats("No valid touch combination found in samples", collected)
         msg = f"Unable to find {touch_samples} samples within tolerance after {touch_max_samples} touches"
         raise TouchError(msg)
 
+    def _combine(self, samples: Sequence[float]) -> float:
+        return float(np.median(samples) if len(samples) > 3 else np.mean(samples))
+
     def _find_valid_combination(self, samples: list[float], size: int) -> tuple[float, ...] | None:
-        for combo in combinations(samples, size):
-            current_mad = compute_mad(combo)
-            if current_mad <= MAD_TOLERANCE:
-                return tuple(sorted(combo))
+        """First combination, sorted, that includes the latest sample and is within tolerance.
+
+        Touches are checked after each one, combinations of the earlier samples have been rejected already.
+        """
+        *earlier, latest = samples
+        for combo in combinations(earlier, size - 1):
+            running = RunningMedianMAD(combo)
+            running.add(latest)
+            if running.mad <= MAD_TOLERANCE:
+                return running.values
         return None
 
-    def _perform_single_probe(self) -> float:
+    def _perform_single_probe(self, session: Session[Sample] | None = None) -> float:
         model = self.get_model()
         if self._toolhead.get_position().z < RETRACT_DISTANCE:
             self._toolhead.move(z=RETRACT_DISTANCE, speed=5)
         self._toolhead.wait_moves()
+        if session is not None:
+            self._approach(session)
         trigger_pos = self._toolhead.z_homing_move(self, speed=model.speed)
         pos = self._toolhead.get_position()
         self._toolhead.move(z=max(pos.z + RETRACT_DISTANCE, RETRACT_DISTANCE), speed=5)
         return trigger_pos - model.z_offset
 
+    def _approach(self, session: Session[Sample]) -> None:
+        """Move quickly to the configured clearance above the bed using the scan distance.
+
+        The clearance is at least MIN_APPROACH_CLEARANCE, widened by the spread of the scan readings.
+        """
+        if self._scan is None:
+            return
+        scan = self._scan
+        move_time = self._toolhead.get_last_move_time()
+        session.wait_for(
+            lambda samples: len(samples) >= APPROACH_SAMPLES and samples[-APPROACH_SAMPLES].time >= move_time
+        )
+        distances = [scan.calculate_sample_distance(s) for s in session.items[-APPROACH_SAMPLES:]]
+        distance = float(np.median(distances))
+        clearance = max(self._config.approach_clearance, MIN_APPROACH_CLEARANCE)
+        clearance += APPROACH_MAD_MARGIN * compute_mad(distances)
+        travel = distance - clearance
+        if not np.isfinite(travel) or travel <= 0:
+            return
+
+        z = self._toolhead.get_position().z
+        logger.debug("Scan distance %.3f, fast approach from %.3f to %.3f", distance, z, z - travel)
+        self._toolhead.move(z=z - travel, speed=APPROACH_SPEED)
+        self._toolhead.wait_moves()
+
     @override
     def home_start(self, print_time: float) -> object:
         model = self.get_model()
@@ -198,6 +312,10 @@ class TouchMode(TouchModelSelectorMixin, ProbeMode, Endstop):
     def is_within_boundaries(self, *, x: float, y: float) -> bool:
         return self.boundaries.is_within(x=x, y=y)
 
+    @override
+    def on_home_begin(self, homing_state: HomingState) -> None:
+        pass
+
     @override
     def on_home_end(self, homing_state: HomingState) -> None:
         if not homing_state.is_homing_z():
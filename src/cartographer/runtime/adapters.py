@@ -17,3 +17,4 @@ class Adapters(Protocol):
     axis_twist_compensation: AxisTwistCompensationAdapter | None
     bed_mesh: BedMeshAdapter
     task_executor: TaskExecutor
+    state_dir: str
@@ -1,16 +1,17 @@
+from __future__ import annotations
+
 from typing import TYPE_CHECKING, cast
 
-from cartographer.adapters.kalico.adapters import KalicoAdapters
-from cartographer.adapters.kalico.integrator import KalicoIntegrator
-from cartographer.adapters.klipper.adapters import KlipperAdapters
-from cartographer.adapters.klipper.integrator import KlipperIntegrator
-from cartographer.runtime.adapters import Adapters
 from cartographer.runtime.environment import Environment, detect_environment
-from cartographer.runtime.integrator import Integrator
 
 if TYPE_CHECKING:
     from configfile import ConfigWrapper as KlipperConfigWrapper
 
+    from cartographer.runtime.adapters import Adapters
+    from cartographer.runtime.integrator import Integrator
+
+# Adapters are imported inside the functions, so only the detected environment's stack is loaded
+
 
 def init_adapter(config: object) -> Adapters:
     env = detect_environment(config)
@@ -28,9 +29,19 @@ def init_adapter(config: object) -> Adapters:
 
 
 def init_integrator(adapters: Adapters) -> Integrator:
+    # Neither adapter subclasses the other, the order only keeps Klipper setups from importing the Kalico stack
+    from cartographer.adapters.klipper.adapters import KlipperAdapters
+
     if isinstance(adapters, KlipperAdapters):
+        from cartographer.adapters.klipper.integrator import KlipperIntegrator
+
         return KlipperIntegrator(adapters)
+
+    from cartographer.adapters.kalico.adapters import KalicoAdapters
+
     if isinstance(adapters, KalicoAdapters):
+        from cartographer.adapters.kalico.integrator import KalicoIntegrator
+
         return KalicoIntegrator(adapters)
 
     msg = "Unsupported adapters"
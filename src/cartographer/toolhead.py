@@ -55,6 +55,10 @@ class BacklashCompensatingToolhead(Toolhead):
     def get_z_axis_limits(self) -> tuple[float, float]:
         return self.toolhead.get_z_axis_limits()
 
+    @override
+    def get_max_velocity(self) -> float:
+        return self.toolhead.get_max_velocity()
+
     @override
     def manual_probe(self, finalize_callback: Callable[[Position | None], None]) -> None:
         self.toolhead.manual_probe(finalize_callback)
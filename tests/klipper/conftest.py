@@ -2,3 +2,5 @@ import sys
 from unittest.mock import Mock
 
 sys.modules["gcode"] = Mock()
+sys.modules["mcu"] = Mock()
+sys.modules["greenlet"] = Mock()
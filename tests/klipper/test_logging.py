@@ -1,10 +1,24 @@
+from __future__ import annotations
+
 import logging
-from typing import Callable
+import threading
+from typing import TYPE_CHECKING, Callable, cast, final
 
 import pytest
-from typing_extensions import TypeAlias
+from typing_extensions import TypeAlias, override
+
+from cartographer.adapters.klipper.logging import (
+    FLUSH_INTERVAL,
+    MAX_LINES_PER_FLUSH,
+    MAX_PENDING,
+    GCodeConsoleFilter,
+    GCodeConsoleFormatter,
+    GCodeConsoleHandler,
+    format_macro,
+)
 
-from cartographer.adapters.klipper.logging import GCodeConsoleFilter, GCodeConsoleFormatter, format_macro
+if TYPE_CHECKING:
+    from reactor import Reactor
 
 
 @pytest.fixture
@@ -71,3 +85,159 @@ def test_console_filter_behavior(logger_name: str, level: int, expected: bool):
     )
     filt = GCodeConsoleFilter()
     assert filt.filter(record) is expected
+
+
+@final
+class FakeReactor:
+    NOW = 0.0
+    NEVER = 9999999999999999.0
+
+    def __init__(self) -> None:
+        self.callback: Callable[[float], float] | None = None
+        self.waketime = self.NEVER
+
+    def monotonic(self) -> float:
+        return 0.0
+
+    def register_timer(self, callback: Callable[[float], float], waketime: float) -> object:
+        self.callback = callback
+        self.waketime = waketime
+        return object()
+
+    def update_timer(self, timer: object, waketime: float) -> None:
+        del timer
+        self.waketime = waketime
+
+    def register_async_callback(self, callback: Callable[[float], None]) -> None:
+        callback(self.monotonic())
+
+    def fire(self) -> None:
+        assert self.callback is not None
+        self.waketime = self.callback(self.waketime)
+
+
+@final
+class FakeConsole:
+    def __init__(self) -> None:
+        self.writes: list[str] = []
+
+    def respond_raw(self, msg: str) -> None:
+        self.writes.append(msg)
+
+
+@final
+class CountingFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(message)s")
+        self.calls = 0
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        self.calls += 1
+        return super().format(record)
+
+
+@pytest.fixture
+def reactor() -> FakeReactor:
+    return FakeReactor()
+
+
+@pytest.fixture
+def console() -> FakeConsole:
+    return FakeConsole()
+
+
+@pytest.fixture
+def handler(console: FakeConsole, reactor: FakeReactor) -> GCodeConsoleHandler:
+    return GCodeConsoleHandler(console, cast("Reactor", cast("object", reactor)))
+
+
+def test_handler_batches_until_timer(
+    handler: GCodeConsoleHandler, console: FakeConsole, reactor: FakeReactor, log_record: LogRecordFactory
+):
+    _ = handler.handle(log_record(logging.INFO, "first"))
+    _ = handler.handle(log_record(logging.INFO, "second"))
+
+    assert console.writes == []
+    assert reactor.waketime == FLUSH_INTERVAL
+
+    reactor.fire()
+
+    assert console.writes == ["first\nsecond\n"]
+    assert reactor.waketime == reactor.NEVER
+
+
+def test_handler_coalesces_repeats(
+    handler: GCodeConsoleHandler, console: FakeConsole, reactor: FakeReactor, log_record: LogRecordFactory
+):
+    for _ in range(3):
+        _ = handler.handle(log_record(logging.INFO, "same"))
+    _ = handler.handle(log_record(logging.INFO, "other"))
+
+    reactor.fire()
+
+    assert console.writes == ["same (repeated 2 more times)\nother\n"]
+
+
+def test_handler_rate_limits_lines(
+    handler: GCodeConsoleHandler, console: FakeConsole, reactor: FakeReactor, log_record: LogRecordFactory
+):
+    for i in range(MAX_LINES_PER_FLUSH + 5):
+        _ = handler.handle(log_record(logging.INFO, f"line {i}"))
+
+    reactor.fire()
+    assert console.writes[0].count("\n") == MAX_LINES_PER_FLUSH
+    assert reactor.waketime == 2 * FLUSH_INTERVAL
+
+    reactor.fire()
+    assert console.writes[1].count("\n") == 5
+
+
+def test_handler_flushes_errors_immediately(
+    handler: GCodeConsoleHandler, console: FakeConsole, log_record: LogRecordFactory
+):
+    _ = handler.handle(log_record(logging.INFO, "before"))
+    _ = handler.handle(log_record(logging.ERROR, "failed"))
+
+    assert console.writes == ["before\nfailed\n"]
+
+
+def test_handler_drops_oldest_without_formatting(
+    handler: GCodeConsoleHandler, console: FakeConsole, log_record: LogRecordFactory
+):
+    formatter = CountingFormatter()
+    handler.setFormatter(formatter)
+    for i in range(MAX_PENDING + 3):
+        _ = handler.handle(log_record(logging.DEBUG, f"line {i}"))
+
+    handler.flush()
+
+    assert console.writes[0].startswith("!! 3 log messages dropped\nline 3\n")
+    assert formatter.calls == MAX_PENDING
+
+
+def test_handler_flush_writes_queued_lines(
+    handler: GCodeConsoleHandler, console: FakeConsole, reactor: FakeReactor, log_record: LogRecordFactory
+):
+    _ = handler.handle(log_record(logging.INFO, "queued"))
+
+    handler.flush()
+    reactor.fire()
+
+    assert console.writes == ["queued\n"]
+    assert reactor.waketime == reactor.NEVER
+
+
+def test_handler_schedules_records_from_other_threads(
+    handler: GCodeConsoleHandler, console: FakeConsole, reactor: FakeReactor, log_record: LogRecordFactory
+):
+    worker = threading.Thread(target=lambda: handler.handle(log_record(logging.WARNING, "from worker")))
+    worker.start()
+    worker.join()
+
+    assert console.writes == []
+    assert reactor.waketime == FLUSH_INTERVAL
+
+    reactor.fire()
+
+    assert console.writes == ["from worker\n"]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+
+from cartographer.adapters.klipper.mcu.mcu import KlipperCartographerMcu
+from cartographer.lib.flight_recorder import FlightRecord, FlightRecorder, read_flight_record
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MINIMUM_COUNT = 1000
+
+
+@pytest.fixture
+def flight_dir(tmp_path: Path) -> str:
+    return str(tmp_path / "records")
+
+
+@pytest.fixture
+def mcu(flight_dir: str) -> KlipperCartographerMcu:
+    printer = Mock()
+    config = Mock()
+    config.get_printer.return_value = printer
+    mcu = KlipperCartographerMcu(config, FlightRecorder(flight_dir))
+    mcu.motion_report.trapqs = {}
+    klipper_mcu = Mock()
+    klipper_mcu.clock_to_print_time.return_value = 1.0
+    klipper_mcu.estimated_print_time.return_value = 1.0
+    klipper_mcu.get_printer.return_value = printer
+    mcu.klipper_mcu = klipper_mcu
+
+    def invoke_shutdown(msg: str) -> None:
+        # Klipper runs the shutdown handlers when a shutdown is invoked
+        del msg
+        mcu._handle_shutdown()  # pyright:ignore[reportPrivateUsage]
+
+    printer.invoke_shutdown.side_effect = invoke_shutdown
+    mcu._constants = Mock(minimum_count=MINIMUM_COUNT)  # pyright:ignore[reportPrivateUsage]
+    mcu._constants.count_to_frequency.return_value = 2.0  # pyright:ignore[reportPrivateUsage]
+    mcu._constants.calculate_temperature.return_value = 30.0  # pyright:ignore[reportPrivateUsage]
+    mcu._commands = Mock()  # pyright:ignore[reportPrivateUsage]
+    return mcu
+
+
+def feed(mcu: KlipperCartographerMcu, count: int) -> None:
+    mcu._handle_data({"clock": 1, "data": count, "temp": 100, "#receive_time": 0.0})  # pyright:ignore[reportPrivateUsage]
+
+
+def dumps(flight_dir: str) -> list[FlightRecord]:
+    return [read_flight_record(os.path.join(flight_dir, name)) for name in os.listdir(flight_dir)]
+
+
+@pytest.mark.parametrize("in_session", [False, True])
+def test_over_range_count_dumps_flight_record(mcu: KlipperCartographerMcu, flight_dir: str, in_session: bool) -> None:
+    if in_session:
+        _ = mcu.start_session()
+
+    feed(mcu, MINIMUM_COUNT * 2)
+
+    # Within a session the shutdown handler writes the dump
+    (record,) = dumps(flight_dir)
+    message = "coil frequency reading exceeded max expected value, received 2000"
+    assert record.reason == ("Klippy shutdown" if in_session else message)
+    assert message in [event.message for event in record.events]
+
+
+def test_repeated_errors_dump_once(mcu: KlipperCartographerMcu, flight_dir: str) -> None:
+    feed(mcu, MINIMUM_COUNT * 2)
+    feed(mcu, MINIMUM_COUNT * 2)
+
+    assert len(dumps(flight_dir)) == 1
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable, cast, final
+
+import pytest
+
+from cartographer.adapters.klipper.task_executor import KlipperTaskExecutor, KlipperThreadExecutor
+from cartographer.interfaces.multiprocessing import executor_for
+from tests.mocks.task_executor import InlineTaskExecutor
+
+if TYPE_CHECKING:
+    from reactor import Reactor
+
+
+@final
+class FakeCompletion:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def complete(self, result: object) -> None:
+        del result
+        self._event.set()
+
+    def wait(self) -> None:
+        assert self._event.wait(timeout=5)
+
+
+@final
+class FakeReactor:
+    """Runs async callbacks straight away, as the reactor would once it wakes."""
+
+    def __init__(self) -> None:
+        self.async_callbacks = 0
+
+    def completion(self) -> FakeCompletion:
+        return FakeCompletion()
+
+    def register_async_callback(self, callback: Callable[[float], None]) -> None:
+        self.async_callbacks += 1
+        callback(0.0)
+
+
+@pytest.fixture
+def fake_reactor() -> FakeReactor:
+    return FakeReactor()
+
+
+@pytest.fixture
+def reactor(fake_reactor: FakeReactor) -> Reactor:
+    return cast("Reactor", cast("object", fake_reactor))
+
+
+def test_thread_executor_returns_result_from_worker(reactor: Reactor, fake_reactor: FakeReactor):
+    executor = KlipperThreadExecutor(reactor, max_workers=2)
+
+    thread_name = executor.run(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("cartographer")
+    assert fake_reactor.async_callbacks == 1
+    executor.shutdown()
+
+
+def test_thread_executor_raises_task_errors(reactor: Reactor):
+    executor = KlipperThreadExecutor(reactor)
+
+    def fail() -> None:
+        msg = "task failed"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="task failed"):
+        executor.run(fail)
+    executor.shutdown()
+
+
+def test_task_executor_routes_by_task_type(reactor: Reactor):
+    executor = KlipperTaskExecutor(reactor, {"mesh": "thread", "convergence": "inline"})
+
+    assert executor_for(executor, "mesh") is executor.thread
+    assert executor_for(executor, "convergence") is executor.inline
+
+
+def test_executor_for_keeps_plain_executors():
+    executor = InlineTaskExecutor()
+
+    assert executor_for(executor, "mesh") is executor
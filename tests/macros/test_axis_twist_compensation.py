@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cartographer.macros.axis_twist_compensation import bin_to_points
+
+
+def test_bin_to_points_takes_median_near_each_point():
+    positions = np.arange(0, 20.01, 0.25)
+    values = positions / 10
+    values[positions == 10] = 100  # outlier
+
+    medians = bin_to_points(positions, values, np.array([0.0, 10.0, 20.0]))
+
+    assert medians == pytest.approx([0.05, 1.025, 1.95])  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_bin_to_points_requires_samples_near_every_point():
+    positions = np.arange(0, 5, 0.25)
+
+    with pytest.raises(RuntimeError, match="No scan samples near 10.00"):
+        _ = bin_to_points(positions, positions, np.array([0.0, 10.0]))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+from cartographer.interfaces.printer import Sample
+from cartographer.macros.backlash import welchs_ttest, window_medians
+
+
+def samples_at(times: list[float], value: float) -> list[Sample]:
+    return [Sample(frequency=value, time=t, position=None, velocity=None, temperature=0) for t in times]
+
+
+def distance(sample: Sample) -> float:
+    return sample.frequency
+
+
+def test_window_medians_picks_samples_by_time() -> None:
+    samples = samples_at([i / 100 for i in range(10)], 1.0)
+    samples += samples_at([0.1 + i / 100 for i in range(10)], 9.0)  # moving, outside windows
+    samples += samples_at([0.2 + i / 100 for i in range(10)], 2.0)
+
+    assert window_medians(samples, [(0.0, 0.095), (0.2, 0.295)], distance) == [1.0, 2.0]
+
+
+def test_window_medians_requires_samples() -> None:
+    samples = samples_at([0.0, 0.01], 1.0)
+
+    with pytest.raises(RuntimeError, match="Only 2 samples"):
+        _ = window_medians(samples, [(0.0, 0.1)], distance)
+
+
+def test_welchs_ttest_detects_offset() -> None:
+    t_stat, _ = welchs_ttest([1.0, 1.01, 0.99, 1.0], [0.9, 0.91, 0.89, 0.9])
+
+    assert t_stat > 2
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.macros.latency_calibrate import estimate_sample_latency
+
+
+def sweep(speeds: list[float], latency: float, backlash: float, rate: float = 500) -> list[Sample]:
+    """Triangle z sweeps between 1 and 4 where the sensor reads the height from `latency` seconds ago."""
+    samples: list[Sample] = []
+    rng = np.random.default_rng(0)
+    time = 0.0
+    for speed in speeds:
+        for start, end in ((1.0, 4.0), (4.0, 1.0)):
+            duration = abs(end - start) / speed
+            direction = 1 if end > start else -1
+            for t in np.arange(0, duration, 1 / rate):
+                z = start + direction * speed * t
+                true_z = z - direction * speed * latency
+                measured = true_z + (backlash if direction < 0 else 0) + rng.normal(0, 0.001)
+                samples.append(
+                    Sample(
+                        frequency=measured,
+                        time=time + t,
+                        position=Position(0, 0, z),
+                        velocity=speed,
+                        temperature=0,
+                    )
+                )
+            time += duration
+    return samples
+
+
+def distance(sample: Sample) -> float:
+    return sample.frequency
+
+
+def test_estimates_latency():
+    samples = sweep([10, 5], latency=0.003, backlash=0.0)
+
+    estimate = estimate_sample_latency(samples, distance)
+
+    assert estimate.latency == pytest.approx(0.003, abs=1e-4)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_separates_latency_from_backlash():
+    samples = sweep([10, 5], latency=0.002, backlash=0.02)
+
+    estimate = estimate_sample_latency(samples, distance)
+
+    assert estimate.latency == pytest.approx(0.002, abs=1e-4)  # pyright:ignore[reportUnknownMemberType]
+    assert estimate.direction_offset == pytest.approx(-0.01, abs=1e-3)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_requires_both_directions():
+    samples = sweep([10], latency=0.002, backlash=0)
+    upwards = samples[: len(samples) // 2]
+
+    with pytest.raises(RuntimeError, match="both directions"):
+        _ = estimate_sample_latency(upwards, distance)
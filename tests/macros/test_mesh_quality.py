@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.macros.bed_mesh.mesh_quality import MeshQuality, MeshQualityMacro
+from cartographer.macros.bed_mesh.mesh_utils import assign_samples_to_grid
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+    from pytest_mock import MockerFixture
+
+    from cartographer.interfaces.printer import MacroParams
+    from cartographer.macros.bed_mesh.interfaces import Point
+    from tests.mocks.params import MockParams
+
+
+def make_grid(nx: int, ny: int, spacing: float) -> list[Point]:
+    return [(x * spacing, y * spacing) for y in range(ny) for x in range(nx)]
+
+
+def sample_at(x: float, y: float, z: float) -> Sample:
+    return Sample(frequency=z, time=0, position=Position(x, y, 0), velocity=0, temperature=0)
+
+
+def height(sample: Sample) -> float:
+    return sample.frequency
+
+
+def test_assign_samples_keeps_cell_statistics():
+    grid = make_grid(3, 3, 10.0)
+    samples = [sample_at(0.0, 0.0, 1.0), sample_at(0.5, 0.0, 2.0), sample_at(0.0, 0.5, 6.0)]
+    samples += [sample_at(float(x), float(y), 0) for x, y in grid if (x, y) != (0.0, 0.0)]
+
+    results = assign_samples_to_grid(grid, samples, height)
+    origin = next(r for r in results if r.point == (0.0, 0.0))
+
+    assert origin.sample_count == 3
+    assert origin.z == 2.0
+    assert origin.mad == 1.0
+    assert origin.distance == pytest.approx(1 / 3)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_quality_arrays_are_row_major():
+    grid = make_grid(3, 2, 10.0)
+    samples = [sample_at(float(x), float(y), 0) for x, y in grid for _ in range(int(x / 10) + 1)]
+
+    quality = MeshQuality.from_results(assign_samples_to_grid(grid, samples, height))
+
+    assert quality.sample_count.shape == (2, 3)
+    assert quality.sample_count.tolist() == [[1, 2, 3], [1, 2, 3]]
+    assert quality.under_sampled(2) == [((0.0, 0.0), 1), ((0.0, 10.0), 1)]
+
+
+def test_quality_status_is_serializable():
+    grid = make_grid(3, 3, 10.0)
+    samples = [sample_at(float(x), float(y), 0) for x, y in grid if (x, y) != (20.0, 20.0)]
+
+    status = MeshQuality.from_results(assign_samples_to_grid(grid, samples, height)).get_status()
+
+    assert status["min_samples"] == 0
+    assert status["mad"] == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, None]]
+
+
+def test_macro_flags_under_sampled_cells(mocker: MockerFixture, caplog: LogCaptureFixture, params: MockParams) -> None:
+    grid = make_grid(3, 3, 10.0)
+    samples = [sample_at(float(x), float(y), 0) for x, y in grid for _ in range(5 if x > 0 else 2)]
+    bed_mesh_macro = mocker.Mock()
+    bed_mesh_macro.last_quality = MeshQuality.from_results(assign_samples_to_grid(grid, samples, height))
+    params.params = {"MIN_SAMPLES": "3"}
+
+    with caplog.at_level(logging.INFO):
+        MeshQualityMacro(bed_mesh_macro).run(params)
+
+    assert "3 cells have fewer than 3 samples" in caplog.text
+    assert "(0.00,10.00)=2" in caplog.text
+
+
+def test_macro_requires_mesh(mocker: MockerFixture, params: MacroParams) -> None:
+    bed_mesh_macro = mocker.Mock()
+    bed_mesh_macro.last_quality = None
+
+    with pytest.raises(RuntimeError, match="No scanned mesh"):
+        MeshQualityMacro(bed_mesh_macro).run(params)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.macros.bed_mesh.mesh_utils import assign_samples_to_grid, fuse_runs, mesh_grid_from_points
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+    from cartographer.macros.bed_mesh.interfaces import Point
+
+BIAS = 0.05
+SPACING = 10.0
+COUNT = 5
+# Cells see slightly asymmetric sample windows on the tilted surface
+TOLERANCE = 1e-3
+BOWL_SPACING = 50.0
+
+
+def surface(x: float, y: float) -> float:
+    return 0.001 * x + 0.02 * y
+
+
+def bowl(x: float, y: float) -> float:
+    center = (COUNT - 1) * BOWL_SPACING / 2
+    return 1e-5 * ((x - center) ** 2 + (y - center) ** 2)
+
+
+def make_grid(spacing: float = SPACING) -> list[Point]:
+    return [(x * spacing, y * spacing) for y in range(COUNT) for x in range(COUNT)]
+
+
+def scan_rows(
+    reverse_pass: bool = False,
+    *,
+    bias: float = BIAS,
+    spacing: float = SPACING,
+    bed: Callable[[float, float], float] = surface,
+) -> list[Sample]:
+    """Snake along x where moving in +x reads bias too high and -x reads bias too low."""
+    xs = np.arange(-1, (COUNT - 1) * spacing + 1, 0.2)
+    rows = [(row, row % 2 == 0) for row in range(COUNT)]
+    if reverse_pass:
+        rows += [(row, not forward) for row, forward in reversed(rows)]
+
+    samples: list[Sample] = []
+    for row, forward in rows:
+        y = row * spacing
+        for x in xs if forward else xs[::-1]:
+            z = bed(x, y) + (bias if forward else -bias)
+            samples.append(Sample(frequency=z, time=0, position=Position(x, y, 0), velocity=0, temperature=0))
+    return samples
+
+
+def height(sample: Sample) -> float:
+    return sample.frequency
+
+
+def max_error(
+    grid: list[Point],
+    samples: list[Sample],
+    correct_direction: bool,
+    bed: Callable[[float, float], float] = surface,
+) -> float:
+    results = assign_samples_to_grid(grid, samples, height, correct_direction=correct_direction)
+    return max(abs(r.z - bed(*r.point)) for r in results)
+
+
+def test_uncorrected_rows_carry_bias():
+    assert max_error(make_grid(), scan_rows(), correct_direction=False) == pytest.approx(BIAS, abs=TOLERANCE)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_corrects_alternating_rows():
+    assert max_error(make_grid(), scan_rows(), correct_direction=True) < TOLERANCE
+
+
+def test_corrects_with_reverse_pass():
+    assert max_error(make_grid(), scan_rows(reverse_pass=True), correct_direction=True) < TOLERANCE
+
+
+def test_correction_keeps_unbiased_scans():
+    samples = [
+        Sample(frequency=surface(s.position.x, s.position.y), time=0, position=s.position, velocity=0, temperature=0)
+        for s in scan_rows()
+        if s.position is not None
+    ]
+
+    assert max_error(make_grid(), samples, correct_direction=True) < TOLERANCE
+
+
+def test_correction_keeps_unbiased_curved_bed():
+    samples = scan_rows(bias=0.0, spacing=BOWL_SPACING, bed=bowl)
+
+    assert max_error(make_grid(BOWL_SPACING), samples, correct_direction=True, bed=bowl) < TOLERANCE
+
+
+def test_corrects_bias_on_curved_bed():
+    samples = scan_rows(spacing=BOWL_SPACING, bed=bowl)
+
+    assert max_error(make_grid(BOWL_SPACING), samples, correct_direction=True, bed=bowl) < TOLERANCE
+
+
+def test_fuse_runs_rejects_outlier_run():
+    estimates = np.array([[1.0, 2.0], [1.001, 2.001], [0.999, 1.999], [1.5, 2.0]])
+
+    fused, half_width = fuse_runs(estimates)
+
+    assert fused == pytest.approx([1.0, 2.0], abs=1e-3)  # pyright:ignore[reportUnknownMemberType]
+    assert np.all(half_width < 0.01)
+
+
+def test_fuse_runs_ignores_missing_runs():
+    estimates = np.array([[1.0, np.nan], [1.0, np.nan], [1.0, 3.0]])
+
+    fused, half_width = fuse_runs(estimates)
+
+    assert fused.tolist() == [1.0, 3.0]
+    assert np.isinf(half_width[1])
+
+
+def test_multiple_runs_are_fused_per_run():
+    grid = make_grid()
+    good = scan_rows(reverse_pass=True)
+    runs = [
+        [Sample(s.frequency, time=run, position=s.position, velocity=0, temperature=0) for s in good]
+        for run in range(3)
+    ]
+    # The last run is offset as if the probe drifted, it should not drag the mesh
+    runs.append([Sample(s.frequency + 0.5, time=3, position=s.position, velocity=0, temperature=0) for s in good])
+    samples = [s for run in runs for s in run]
+
+    results = assign_samples_to_grid(grid, samples, height, correct_direction=True, run_end_times=[0, 1, 2, 3])
+
+    assert max(abs(r.z - surface(*r.point)) for r in results) < TOLERANCE
+
+
+def test_mesh_grid_places_points_by_coordinate():
+    points = np.array([(x, y, x + 10 * y) for x in (0.004, 10.0, 20.0) for y in (5.0, 0.0)])
+
+    grid = mesh_grid_from_points(points)
+
+    assert grid.min == (0.0, 0.0)
+    assert grid.max == (20.0, 5.0)
+    assert grid.matrix.tolist() == [[0.004, 10.0, 20.0], [50.004, 60.0, 70.0]]
+
+
+def test_mesh_grid_requires_complete_grid():
+    points = np.array([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)])
+
+    with pytest.raises(RuntimeError, match="missing points"):
+        _ = mesh_grid_from_points(points)
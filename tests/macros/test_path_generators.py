@@ -73,3 +73,11 @@ def test_path_generator_covers_all_points(generator: GeneratorFixture, grid_poin
     for p0, p1 in zip(path, path[1:]):
         dist = np.linalg.norm(np.array(p1) - np.array(p0))
         assert dist <= max_step, f"{gen_name} discontinuity {dist:.2f} on {grid_name}"
+
+
+def test_path_generator_writes_nothing_to_stdout(generator: GeneratorFixture, capsys: pytest.CaptureFixture[str]):
+    _, gen = generator
+
+    _ = list(gen.generate_path(make_grid(4, 4, 1.0)))
+
+    assert capsys.readouterr().out == ""
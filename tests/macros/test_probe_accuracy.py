@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.macros.probe import STREAM_SKIP_COUNT, ProbeAccuracyMacro
+
+if TYPE_CHECKING:
+    from pytest import LogCaptureFixture
+    from pytest_mock import MockerFixture
+
+    from cartographer.interfaces.printer import Toolhead
+    from cartographer.probe.probe import Probe
+    from tests.mocks.params import MockParams
+
+
+def test_stream_method_uses_one_session(
+    mocker: MockerFixture, caplog: LogCaptureFixture, probe: Probe, toolhead: Toolhead, params: MockParams
+) -> None:
+    samples = [
+        Sample(frequency=2.0 + 0.01 * (i % 2), time=i / 100, position=None, velocity=None, temperature=0)
+        for i in range(STREAM_SKIP_COUNT + 4 * 10)
+    ]
+    session = mocker.MagicMock()
+    session.__enter__.return_value = session
+    session.get_items.return_value = samples
+    start_session = mocker.patch.object(probe.scan, "start_session", return_value=session)
+    perform_scan = mocker.patch.object(probe, "perform_scan", return_value=0.0)
+    mocker.patch.object(probe.scan, "calculate_sample_distance", side_effect=lambda s: s.frequency)
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 2))
+    params.params = {"METHOD": "stream", "SAMPLES": "4", "WINDOW": "10"}
+
+    with caplog.at_level(logging.INFO):
+        ProbeAccuracyMacro(probe, toolhead).run(params)
+
+    perform_scan.assert_called_once()
+    start_session.assert_called_once()
+    assert "probe accuracy results" in caplog.text
+    assert "range 0.000000" in caplog.text
+    assert "Allan deviation" in caplog.text
+
+
+def test_stream_method_applies_axis_twist_compensation(
+    mocker: MockerFixture, caplog: LogCaptureFixture, probe: Probe, toolhead: Toolhead, params: MockParams
+) -> None:
+    samples = [
+        Sample(frequency=2.0, time=i / 100, position=None, velocity=None, temperature=0)
+        for i in range(STREAM_SKIP_COUNT + 2 * 5)
+    ]
+    session = mocker.MagicMock()
+    session.__enter__.return_value = session
+    session.get_items.return_value = samples
+    mocker.patch.object(probe.scan, "start_session", return_value=session)
+    mocker.patch.object(probe, "perform_scan", return_value=0.0)
+    mocker.patch.object(probe.scan, "calculate_sample_distance", side_effect=lambda s: s.frequency)
+    toolhead.get_position = mocker.Mock(return_value=Position(10, 20, 2))
+    toolhead.apply_axis_twist_compensation = mocker.Mock(side_effect=lambda p: Position(p.x, p.y, p.z + 0.1))
+    params.params = {"METHOD": "stream", "SAMPLES": "2", "WINDOW": "5"}
+
+    with caplog.at_level(logging.INFO):
+        ProbeAccuracyMacro(probe, toolhead).run(params)
+
+    expected = 2 + probe.scan.probe_height - 2.0 + 0.1
+    assert f"median {expected:.6f}" in caplog.text
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cartographer.interfaces.printer import Sample
+from cartographer.macros.bed_mesh.mesh_utils import compute_auto_speed, measure_sample_rate
+from cartographer.macros.bed_mesh.scan_mesh import BedMeshCalibrateConfiguration, BedMeshCalibrateMacro, BedMeshParams
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+    from cartographer.interfaces.configuration import Configuration
+    from cartographer.interfaces.multiprocessing import TaskExecutor
+    from cartographer.interfaces.printer import Toolhead
+    from cartographer.probe.probe import Probe
+    from tests.mocks.params import MockParams
+
+
+def sample(time: float) -> Sample:
+    return Sample(frequency=1, time=time, position=None, velocity=None, temperature=0)
+
+
+def test_measure_sample_rate():
+    samples = [sample(i / 500) for i in range(11)]
+
+    assert measure_sample_rate(samples) == pytest.approx(500)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_measure_sample_rate_needs_duration():
+    with pytest.raises(ValueError, match="span"):
+        _ = measure_sample_rate([sample(1), sample(1)])
+
+
+def test_auto_speed_is_capped_by_toolhead():
+    speed = compute_auto_speed(sample_rate=500, spacing=20, min_samples=5, passes=1, max_speed=300)
+
+    assert speed == 200
+
+
+def test_auto_speed_slows_down_for_dense_meshes():
+    speed = compute_auto_speed(sample_rate=500, spacing=1, min_samples=5, passes=1, max_speed=1000)
+
+    assert speed == 100
+
+
+def test_auto_speed_spreads_samples_over_passes():
+    speed = compute_auto_speed(sample_rate=500, spacing=20, min_samples=6, passes=2, max_speed=1000)
+
+    assert speed == pytest.approx(1000 / 3)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_params_auto_speed(params: MockParams, config: Configuration):
+    params.params = {"SPEED": "AUTO"}
+
+    parsed = BedMeshParams.from_macro_params(params, BedMeshCalibrateConfiguration.from_config(config))
+
+    assert parsed.auto_speed
+    assert parsed.speed == config.bed_mesh.speed
+
+
+def test_params_fixed_speed(params: MockParams, config: Configuration):
+    params.params = {"SPEED": "150"}
+
+    parsed = BedMeshParams.from_macro_params(params, BedMeshCalibrateConfiguration.from_config(config))
+
+    assert not parsed.auto_speed
+    assert parsed.speed == 150
+
+
+def test_params_convergence_disabled_by_default(params: MockParams, config: Configuration):
+    parsed = BedMeshParams.from_macro_params(params, BedMeshCalibrateConfiguration.from_config(config))
+
+    assert parsed.convergence == 0
+
+
+@pytest.mark.parametrize(("convergence", "expected"), [("0", 1000), ("0.01", 1000 / 3)])
+def test_auto_speed_only_counts_runs_that_always_complete(
+    mocker: MockerFixture,
+    probe: Probe,
+    toolhead: Toolhead,
+    task_executor: TaskExecutor,
+    params: MockParams,
+    config: Configuration,
+    convergence: str,
+    expected: float,
+):
+    toolhead.get_max_velocity = mocker.Mock(return_value=5000)
+    macro_config = BedMeshCalibrateConfiguration.from_config(config)
+    macro = BedMeshCalibrateMacro(probe, toolhead, mocker.Mock(), task_executor, macro_config)
+    params.params = {"SPEED": "AUTO", "RUNS": "6", "MIN_SAMPLES": "6", "CONVERGENCE": convergence}
+    parsed = BedMeshParams.from_macro_params(params, macro_config)
+    samples = [sample(i / 500) for i in range(50)]
+
+    # Early stop can end the scan after two runs, those alone must gather the samples
+    speed = macro._compute_auto_speed(parsed, 20, samples)  # pyright:ignore[reportPrivateUsage]
+
+    assert speed == pytest.approx(expected)  # pyright:ignore[reportUnknownMemberType]
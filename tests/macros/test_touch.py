@@ -7,13 +7,15 @@ import pytest
 from typing_extensions import TypeAlias
 
 from cartographer.interfaces.printer import MacroParams, Position, Toolhead
-from cartographer.macros.touch import TouchAccuracyMacro, TouchHomeMacro, TouchMacro
+from cartographer.macros.touch import TouchAccuracyMacro, TouchHomeMacro, TouchMacro, TouchPointsMacro
 from cartographer.probe.touch_mode import TouchMode, TouchModeConfiguration
 
 if TYPE_CHECKING:
     from pytest import LogCaptureFixture
     from pytest_mock import MockerFixture
 
+    from tests.mocks.params import MockParams
+
 Probe: TypeAlias = TouchMode
 
 
@@ -152,3 +154,27 @@ def test_touch_home_macro(
     macro.run(params)
 
     assert set_z_position_spy.mock_calls == [mocker.call(expected)]
+
+
+def test_touch_points_macro_output(
+    mocker: MockerFixture,
+    caplog: LogCaptureFixture,
+    probe: Probe,
+    params: MockParams,
+):
+    macro = TouchPointsMacro(probe)
+    probe.perform_probe_many = mocker.Mock(return_value=[Position(10, 10, 0.1), Position(20, 10, 0.3)])
+    params.params = {"POINTS": "10,10,20,10"}
+
+    with caplog.at_level(logging.INFO):
+        macro.run(params)
+
+    probe.perform_probe_many.assert_called_once_with([(10.0, 10.0), (20.0, 10.0)])
+    assert "Touched 2 points, range 0.200000" in caplog.text
+
+
+def test_touch_points_requires_pairs(probe: Probe, params: MockParams):
+    params.params = {"POINTS": "10,10,20"}
+
+    with pytest.raises(ValueError, match="pairs"):
+        TouchPointsMacro(probe).run(params)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cartographer.lib.sequential_test import Decision
+from cartographer.lib.statistics import RunningMedianMAD
+from cartographer.macros.touch_calibrate import (
+    STRATEGY_MAP,
+    CalibrationStrategy,
+    DefaultCalibrationStrategy,
+    TouchCalibrateMacro,
+)
+from cartographer.macros.touch_calibrate_checkpoint import CalibrationSettings, TouchCalibrationCheckpoint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+    from cartographer.interfaces.configuration import Configuration
+    from cartographer.interfaces.printer import Mcu, Toolhead
+    from cartographer.probe.probe import Probe
+    from tests.mocks.params import MockParams
+
+ACCEPTABLE_FROM = 1730
+
+
+@pytest.fixture
+def macro(probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration) -> TouchCalibrateMacro:
+    return TouchCalibrateMacro(probe, mcu, toolhead, config)
+
+
+@pytest.fixture
+def calibration_mode(mocker: MockerFixture):
+    mode = mocker.Mock()
+    mode.strategy = DefaultCalibrationStrategy()
+
+    def collect_samples(threshold: int, *_: object, **__: object) -> list[float]:
+        spread = 0.001 if threshold >= ACCEPTABLE_FROM else 0.1
+        return [i * spread for i in range(5)]
+
+    mode.collect_samples = mocker.Mock(side_effect=collect_samples)
+    return mode
+
+
+def test_bracket_search_finds_lowest_acceptable_threshold(macro: TouchCalibrateMacro, calibration_mode) -> None:
+    threshold = macro._search_acceptable_threshold(calibration_mode, 500, 3000)  # pyright:ignore[reportPrivateUsage]
+
+    assert threshold is not None
+    assert ACCEPTABLE_FROM <= threshold <= ACCEPTABLE_FROM + 75
+
+
+def test_bracket_search_evaluates_fewer_thresholds(macro: TouchCalibrateMacro, calibration_mode) -> None:
+    _ = macro._search_acceptable_threshold(calibration_mode, 500, 3000)  # pyright:ignore[reportPrivateUsage]
+    bracketed = calibration_mode.collect_samples.call_count
+    calibration_mode.collect_samples.reset_mock()
+
+    _ = macro._find_acceptable_threshold(calibration_mode, 500, 3000)  # pyright:ignore[reportPrivateUsage]
+
+    assert bracketed < calibration_mode.collect_samples.call_count
+
+
+def test_bracket_search_accepts_start(macro: TouchCalibrateMacro, calibration_mode) -> None:
+    assert macro._search_acceptable_threshold(calibration_mode, 2000, 3000) == 2000  # pyright:ignore[reportPrivateUsage]
+    assert calibration_mode.collect_samples.call_count == 1
+
+
+def test_bracket_search_fails_below_max(macro: TouchCalibrateMacro, calibration_mode) -> None:
+    assert macro._search_acceptable_threshold(calibration_mode, 500, 1500) is None  # pyright:ignore[reportPrivateUsage]
+
+
+def test_strategy_rejects_noisy_threshold_early() -> None:
+    strategy = DefaultCalibrationStrategy()
+
+    assert strategy.decide([0.0, 0.05, 0.1]) is Decision.REJECT
+    assert strategy.decide([0.0] * 5) is Decision.ACCEPT
+
+
+def test_strategy_does_not_accept_quantized_outlier_early() -> None:
+    strategy = DefaultCalibrationStrategy()
+
+    assert strategy.decide([0.1, 0.1, 0.5]) is Decision.CONTINUE
+    assert strategy.decide([0.1, 0.1, 0.5, 0.1, 0.1], min_accept_samples=8) is Decision.CONTINUE
+
+
+@pytest.mark.parametrize("strategy_class", list(STRATEGY_MAP.values()))
+def test_running_score_matches_batch_score(strategy_class: type[CalibrationStrategy]) -> None:
+    strategy = strategy_class()
+    samples = [0.1, 0.102, 0.097, 0.11, 0.1, 0.099]
+
+    assert strategy.running_score(RunningMedianMAD(samples)) == pytest.approx(strategy.compute_score(samples))  # pyright:ignore[reportUnknownMemberType]
+
+
+SETTINGS = CalibrationSettings(
+    model_name="default", speed=3, threshold_start=500, threshold_max=3000, strategy="default", search="bracket"
+)
+
+
+def test_checkpoint_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.json")
+    checkpoint = TouchCalibrationCheckpoint(path, SETTINGS)
+    checkpoint.record_result(500, [0.1, 0.2], 0.05)
+    checkpoint.record_touches(750, [0.1])
+
+    loaded = TouchCalibrationCheckpoint.load(path)
+
+    assert loaded.settings == SETTINGS
+    assert loaded.results[500].samples == [0.1, 0.2]
+    assert loaded.in_progress == {750: [0.1]}
+
+
+def test_checkpoint_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match="No touch calibration checkpoint"):
+        _ = TouchCalibrationCheckpoint.load(str(tmp_path / "missing.json"))
+
+
+def test_resumed_search_reuses_tested_thresholds(
+    tmp_path: Path, probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration, calibration_mode
+) -> None:
+    path = str(tmp_path / "state.json")
+    macro = TouchCalibrateMacro(probe, mcu, toolhead, config, checkpoint_path=path)
+    macro._checkpoint = TouchCalibrationCheckpoint(path, SETTINGS)  # pyright:ignore[reportPrivateUsage]
+    first = macro._search_acceptable_threshold(calibration_mode, 500, 3000)  # pyright:ignore[reportPrivateUsage]
+    calibration_mode.collect_samples.reset_mock()
+
+    macro._checkpoint = TouchCalibrationCheckpoint.load(path)  # pyright:ignore[reportPrivateUsage]
+    second = macro._search_acceptable_threshold(calibration_mode, 500, 3000)  # pyright:ignore[reportPrivateUsage]
+
+    assert first == second
+    calibration_mode.collect_samples.assert_not_called()
+
+
+def test_checkpoint_not_saved_when_preconditions_fail(
+    tmp_path: Path, probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration, params: MockParams
+) -> None:
+    path = tmp_path / "state.json"
+    toolhead.is_homed = lambda axis: False
+    macro = TouchCalibrateMacro(probe, mcu, toolhead, config, checkpoint_path=str(path))
+
+    with pytest.raises(RuntimeError, match="Must home"):
+        macro.run(params)
+
+    assert not path.exists()
+
+
+def test_resume_rejects_changed_parameters(
+    tmp_path: Path, probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration, params: MockParams
+) -> None:
+    path = str(tmp_path / "state.json")
+    TouchCalibrationCheckpoint(path, SETTINGS).save()
+    macro = TouchCalibrateMacro(probe, mcu, toolhead, config, checkpoint_path=path)
+    params.params = {"RESUME": "1", "SPEED": "2"}
+
+    with pytest.raises(RuntimeError, match="different parameters: speed=2"):
+        macro.run(params)
+
+
+def test_resume_keeps_checkpoint_parameters(
+    tmp_path: Path, probe: Probe, mcu: Mcu, toolhead: Toolhead, config: Configuration, params: MockParams
+) -> None:
+    path = str(tmp_path / "state.json")
+    TouchCalibrationCheckpoint(path, replace(SETTINGS, speed=2)).save()
+    macro = TouchCalibrateMacro(probe, mcu, toolhead, config, checkpoint_path=path)
+    params.params = {"RESUME": "1", "SPEED": "2"}
+
+    checkpoint = macro._open_checkpoint(params)  # pyright:ignore[reportPrivateUsage]
+
+    assert checkpoint is not None
+    assert checkpoint.settings.speed == 2
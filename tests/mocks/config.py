@@ -22,6 +22,8 @@ default_general_config = GeneralConfig(
     z_backlash=0,
     macro_prefix="cartographer",
     verbose=False,
+    mesh_executor="inline",
+    convergence_executor="inline",
 )
 default_scan_config = ScanConfig(
     samples=20,
@@ -31,11 +33,16 @@ default_scan_config = ScanConfig(
     mesh_direction="x",
     mesh_height=4.0,
     mesh_corner_radius=2.0,
+    mesh_min_samples=5,
+    mesh_direction_correction=False,
+    sample_latency=0,
+    homing_approach_height=0,
     mesh_path="snake",
 )
 default_touch_config = TouchConfig(
     samples=5,
     max_samples=10,
+    approach_clearance=0,
     models={},
 )
 default_bed_mesh_config = BedMeshConfig(
@@ -75,3 +82,7 @@ class MockConfiguration(Configuration):
     @override
     def save_z_backlash(self, backlash: float) -> None:
         self.general = replace(self.general, z_backlash=backlash)
+
+    @override
+    def save_sample_latency(self, latency: float) -> None:
+        self.scan = replace(self.scan, sample_latency=latency)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import logging
+from dataclasses import replace
 from typing import TYPE_CHECKING, cast
+from unittest.mock import call
 
 import pytest
 from numpy.polynomial import Polynomial
 
 from cartographer.interfaces.configuration import Configuration, ScanModelConfiguration
-from cartographer.interfaces.printer import HomingState, Position, Sample, Toolhead
+from cartographer.interfaces.printer import HomingState, Mcu, Position, Sample, Toolhead
+from cartographer.probe.scan_mode import ScanMode, ScanModeConfiguration
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
@@ -136,3 +140,107 @@ def test_probe_does_homing_move(mocker: MockerFixture, probe: Probe, toolhead: T
     _ = probe.scan.perform_probe()
 
     assert toolhead.z_homing_move.mock_calls == [mocker.call(probe.scan, speed=mocker.ANY)]
+
+
+@pytest.fixture
+def two_stage_scan(mcu: Mcu, toolhead: Toolhead, config: Configuration, probe: Probe) -> ScanMode:
+    scan_config = replace(ScanModeConfiguration.from_config(config), homing_approach_height=3)
+    scan = ScanMode(mcu, toolhead, scan_config)
+    scan.load_model(probe.scan.get_model().name)
+    return scan
+
+
+def test_two_stage_homing_triggers_higher_first(
+    mocker: MockerFixture, mcu: Mcu, two_stage_scan: ScanMode, homing_state: HomingState, session: Session[Sample]
+):
+    model = two_stage_scan.get_model()
+    mcu.stop_homing = lambda home_end_time: 0.0
+    start_homing_scan = mocker.patch.object(mcu, "start_homing_scan")
+    homing_state.get_z_retract_distance = lambda: 5.0
+
+    two_stage_scan.on_home_begin(homing_state)
+    for _ in range(2):
+        _ = two_stage_scan.home_start(0)
+        _ = two_stage_scan.home_wait(1)
+
+    assert start_homing_scan.mock_calls == [
+        call(0, model.distance_to_frequency(two_stage_scan.probe_height + 3)),
+        call(0, model.distance_to_frequency(two_stage_scan.probe_height)),
+    ]
+
+
+@pytest.mark.parametrize("retract", [0.0, 3.0])
+def test_two_stage_homing_needs_retract_above_approach_height(
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+    mcu: Mcu,
+    two_stage_scan: ScanMode,
+    homing_state: HomingState,
+    session: Session[Sample],
+    retract: float,
+):
+    model = two_stage_scan.get_model()
+    mcu.stop_homing = lambda home_end_time: 0.0
+    start_homing_scan = mocker.patch.object(mcu, "start_homing_scan")
+    homing_state.get_z_retract_distance = lambda: retract
+
+    with caplog.at_level(logging.WARNING):
+        two_stage_scan.on_home_begin(homing_state)
+    _ = two_stage_scan.home_start(0)
+    _ = two_stage_scan.home_wait(1)
+
+    assert "homing_retract_dist" in caplog.text
+    assert start_homing_scan.mock_calls == [call(0, model.distance_to_frequency(two_stage_scan.probe_height))]
+
+
+def test_two_stage_homing_reuses_trigger_sample(
+    mocker: MockerFixture,
+    mcu: Mcu,
+    two_stage_scan: ScanMode,
+    homing_state: HomingState,
+    session: Session[Sample],
+):
+    homed_position_spy = mocker.spy(homing_state, "set_z_homed_position")
+    homing_state.get_z_overshoot = lambda: 0.0
+    two_stage_scan.measure_distance = mocker.Mock(return_value=5)
+    mcu.stop_homing = lambda home_end_time: home_end_time
+    trigger_frequency = two_stage_scan.get_model().distance_to_frequency(two_stage_scan.probe_height)
+    session.items = [
+        Sample(frequency=trigger_frequency * 0.9, time=0.1, position=None, velocity=None, temperature=0),
+        Sample(frequency=trigger_frequency * 1.01, time=0.2, position=None, velocity=None, temperature=0),
+        Sample(frequency=trigger_frequency * 1.02, time=0.3, position=None, velocity=None, temperature=0),
+    ]
+
+    _ = two_stage_scan.home_start(0)
+    trigger_time = two_stage_scan.home_wait(1)
+    two_stage_scan.on_home_end(homing_state)
+
+    assert trigger_time == 0.2
+    assert two_stage_scan.measure_distance.call_count == 0
+    homed_position_spy.assert_called_once_with(
+        pytest.approx(two_stage_scan.calculate_sample_distance(session.items[1]))  # pyright:ignore[reportUnknownMemberType]
+    )
+
+
+def test_two_stage_homing_corrects_for_overshoot(
+    mocker: MockerFixture,
+    mcu: Mcu,
+    two_stage_scan: ScanMode,
+    homing_state: HomingState,
+    session: Session[Sample],
+):
+    homed_position_spy = mocker.spy(homing_state, "set_z_homed_position")
+    # The toolhead halted 0.3mm below the point where it triggered
+    homing_state.get_z_overshoot = lambda: 0.3
+    mcu.stop_homing = lambda home_end_time: home_end_time
+    trigger_frequency = two_stage_scan.get_model().distance_to_frequency(two_stage_scan.probe_height)
+    trigger = Sample(frequency=trigger_frequency * 1.01, time=0.2, position=None, velocity=None, temperature=0)
+    session.items = [trigger]
+
+    _ = two_stage_scan.home_start(0)
+    _ = two_stage_scan.home_wait(1)
+    two_stage_scan.on_home_end(homing_state)
+
+    homed_position_spy.assert_called_once_with(
+        pytest.approx(two_stage_scan.calculate_sample_distance(trigger) - 0.3)  # pyright:ignore[reportUnknownMemberType]
+    )
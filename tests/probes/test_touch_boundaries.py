@@ -39,6 +39,8 @@ def make_config(
     return TouchModeConfiguration(
         samples=1,
         max_samples=1,
+        approach_clearance=0,
+        travel_speed=50,
         mesh_min=mesh_min,
         mesh_max=mesh_max,
         x_offset=x_offset,
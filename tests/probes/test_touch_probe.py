@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from itertools import cycle
 from typing import TYPE_CHECKING
 
 import pytest
 
 from cartographer.interfaces.configuration import Configuration, TouchModelConfiguration
-from cartographer.interfaces.printer import HomingState, Mcu, Position, TemperatureStatus, Toolhead
+from cartographer.interfaces.printer import HomingState, Mcu, Position, Sample, TemperatureStatus, Toolhead
+from cartographer.lib.sequential_test import MIN_ACCEPT_SAMPLES
+from cartographer.probe.touch_mode import (
+    APPROACH_MAD_MARGIN,
+    APPROACH_SPEED,
+    MIN_APPROACH_CLEARANCE,
+    TouchMode,
+    TouchModeConfiguration,
+    order_by_travel,
+)
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
@@ -126,3 +137,149 @@ def test_probe_outside_bounds(mocker: MockerFixture, toolhead: Toolhead, probe:
 
     with pytest.raises(RuntimeError, match="outside .* boundaries"):
         _ = probe.touch.home_start(0)
+
+
+@pytest.fixture
+def approach_touch(mocker: MockerFixture, toolhead: Toolhead, mcu: Mcu, config: Configuration) -> TouchMode:
+    scan = mocker.Mock()
+    scan.calculate_sample_distance = mocker.Mock(return_value=1.5)
+    touch = TouchMode(mcu, toolhead, replace(TouchModeConfiguration.from_config(config), approach_clearance=0.8), scan)
+    touch.load_model("test_touch")
+    session = mocker.MagicMock()
+    session.__enter__.return_value = session
+    session.items = [Sample(frequency=1, time=10, position=None, velocity=None, temperature=0)] * 10
+    mcu.start_session = mocker.Mock(return_value=session)
+    toolhead.get_last_move_time = mocker.Mock(return_value=5)
+    toolhead.z_homing_move = mocker.Mock(return_value=0.5)
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 2))
+    return touch
+
+
+def test_scan_approach_moves_to_clearance(mocker: MockerFixture, toolhead: Toolhead, approach_touch: TouchMode) -> None:
+    move_spy = mocker.spy(toolhead, "move")
+
+    assert approach_touch.perform_probe() == 0.5
+    assert mocker.call(z=pytest.approx(1.3), speed=APPROACH_SPEED) in move_spy.mock_calls
+
+
+def test_scan_approach_keeps_minimum_clearance(
+    mocker: MockerFixture, toolhead: Toolhead, approach_touch: TouchMode
+) -> None:
+    approach_touch._config = replace(approach_touch._config, approach_clearance=0.1)  # pyright:ignore[reportPrivateUsage]
+    move_spy = mocker.spy(toolhead, "move")
+
+    _ = approach_touch.perform_probe()
+
+    target = 2 - (1.5 - MIN_APPROACH_CLEARANCE)
+    assert mocker.call(z=pytest.approx(target), speed=APPROACH_SPEED) in move_spy.mock_calls
+
+
+def test_scan_approach_widens_clearance_for_noisy_readings(
+    mocker: MockerFixture, toolhead: Toolhead, approach_touch: TouchMode
+) -> None:
+    distances = cycle([1.4, 1.6])
+
+    def noisy_distance(_sample: Sample) -> float:
+        return next(distances)
+
+    approach_touch._scan.calculate_sample_distance = mocker.Mock(side_effect=noisy_distance)  # pyright:ignore[reportPrivateUsage, reportOptionalMemberAccess]
+    move_spy = mocker.spy(toolhead, "move")
+
+    _ = approach_touch.perform_probe()
+
+    # MAD 0.1 around a median of 1.5
+    target = 2 - (1.5 - 0.8 - APPROACH_MAD_MARGIN * 0.1)
+    assert mocker.call(z=pytest.approx(target), speed=APPROACH_SPEED) in move_spy.mock_calls
+
+
+def test_order_by_travel_visits_nearest_first() -> None:
+    points = [(100.0, 0.0), (10.0, 0.0), (50.0, 0.0), (0.0, 5.0)]
+
+    assert order_by_travel((0, 0), points) == [3, 1, 2, 0]
+
+
+def test_probe_many_returns_results_in_input_order(mocker: MockerFixture, toolhead: Toolhead, probe: Probe) -> None:
+    heights = {10.0: 0.1, 20.0: 0.2, 30.0: 0.3}
+    position = Position(0, 0, 10)
+
+    def move(*, x: float | None = None, y: float | None = None, z: float | None = None, speed: float) -> None:
+        nonlocal position
+        del speed
+        position = Position(
+            position.x if x is None else x, position.y if y is None else y, position.z if z is None else z
+        )
+
+    toolhead.move = mocker.Mock(side_effect=move)
+    toolhead.get_position = mocker.Mock(side_effect=lambda: position)
+    toolhead.z_homing_move = mocker.Mock(side_effect=lambda *_, **__: heights[position.x])
+
+    results = probe.perform_touch_many([(30, 30), (10, 10), (20, 20)])
+
+    assert [r.z for r in results] == pytest.approx([0.3, 0.1, 0.2])  # pyright:ignore[reportUnknownMemberType]
+    touched_x = [call.kwargs["x"] for call in toolhead.move.mock_calls if "x" in call.kwargs]
+    assert touched_x == [10, 20, 30]
+
+
+def test_probe_many_rejects_points_outside_boundaries(probe: Probe) -> None:
+    with pytest.raises(RuntimeError, match=r"outside of the touch boundaries: \(500.00,10.00\)"):
+        _ = probe.perform_touch_many([(10, 10), (500, 10)])
+
+
+def test_probe_stops_early_when_touches_agree(
+    mocker: MockerFixture, toolhead: Toolhead, mcu: Mcu, config: Configuration
+) -> None:
+    touch = TouchMode(mcu, toolhead, replace(TouchModeConfiguration.from_config(config), samples=8, max_samples=16))
+    touch.load_model("test_touch")
+    toolhead.z_homing_move = mocker.Mock(return_value=0.5)
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 1))
+
+    assert touch.perform_probe() == 0.5
+    # samples is a cap, the sequential test accepts as soon as it can
+    assert toolhead.z_homing_move.call_count == MIN_ACCEPT_SAMPLES
+
+
+@pytest.mark.parametrize(
+    "touches, expected",
+    [
+        ([0.1, 0.1, 0.5, 0.1, 0.1], 0.1),
+        ([0.0, 0.001, 0.5, 0.0, 0.001], 0.001),
+    ],
+)
+def test_probe_keeps_quantized_outlier_out(
+    mocker: MockerFixture, toolhead: Toolhead, probe: Probe, touches: list[float], expected: float
+) -> None:
+    toolhead.z_homing_move = mocker.Mock(side_effect=touches)
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 1))
+
+    assert probe.touch.perform_probe() == expected
+    assert toolhead.z_homing_move.call_count == 5
+
+
+def test_early_stop_keeps_quantized_outlier_out(
+    mocker: MockerFixture, toolhead: Toolhead, mcu: Mcu, config: Configuration
+) -> None:
+    touch = TouchMode(mcu, toolhead, replace(TouchModeConfiguration.from_config(config), samples=8, max_samples=16))
+    touch.load_model("test_touch")
+    toolhead.z_homing_move = mocker.Mock(side_effect=[0.1, 0.1, 0.5, 0.1, 0.1, 0.1, 0.1, 0.1])
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 1))
+
+    assert touch.perform_probe() == 0.1
+
+
+def test_probe_below_sequential_minimum_touches_samples_times(
+    mocker: MockerFixture, toolhead: Toolhead, mcu: Mcu, config: Configuration
+) -> None:
+    touch = TouchMode(mcu, toolhead, replace(TouchModeConfiguration.from_config(config), samples=3, max_samples=6))
+    touch.load_model("test_touch")
+    toolhead.z_homing_move = mocker.Mock(return_value=0.5)
+    toolhead.get_position = mocker.Mock(return_value=Position(0, 0, 1))
+
+    assert touch.perform_probe() == 0.5
+    assert toolhead.z_homing_move.call_count == 3
+
+
+def test_valid_combination_includes_latest_touch(probe: Probe) -> None:
+    touches = [0.1, 0.2, 0.1, 0.3, 0.1, 0.1]
+
+    assert probe.touch._find_valid_combination(touches, 5) == (0.1, 0.1, 0.1, 0.2, 0.3)  # pyright:ignore[reportPrivateUsage]
+    assert probe.touch._find_valid_combination([0.0, 0.01, 0.02, 0.03, 0.04, 0.05], 5) is None  # pyright:ignore[reportPrivateUsage]
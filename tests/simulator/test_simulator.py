@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from cartographer.interfaces.printer import Position
+from simulator import GaussianNoise, SimulatedPrinter, SimulatorAdapters, TiltedBed
+from simulator.configuration import SimulatorConfiguration, default_scan_config
+from simulator.motion import Move, Trajectory
+from simulator.reactor import VirtualReactor
+from simulator.sensor import synthetic_scan_model
+
+
+def test_move_follows_trapezoid():
+    move = Move.plan(0, Position(0, 0, 0), Position(10, 0, 0), speed=10, accel=100, z_origin=0)
+
+    assert move.planned_end_time == pytest.approx(1.1)  # pyright:ignore[reportUnknownMemberType]
+    assert move.position_at(0.05)[0].x == pytest.approx(0.125)  # pyright:ignore[reportUnknownMemberType]
+    assert move.position_at(0.5) == (Position(4.5, 0, 0), 10)
+    assert move.position_at(2)[0] == Position(10, 0, 0)
+
+
+def test_short_move_never_reaches_speed():
+    move = Move.plan(0, Position(0, 0, 0), Position(0, 0, 1), speed=100, accel=100, z_origin=0)
+
+    assert move.cruise_velocity == pytest.approx(10)  # pyright:ignore[reportUnknownMemberType]
+    assert move.cruise_time == pytest.approx(0)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_halt_drops_later_motion():
+    trajectory = Trajectory(Position(0, 0, 10))
+    trajectory.append(Move.plan(0, Position(0, 0, 10), Position(0, 0, 0), speed=5, accel=1000, z_origin=0))
+    trajectory.append(Move.plan(3, Position(0, 0, 0), Position(0, 0, 5), speed=5, accel=1000, z_origin=0))
+
+    trajectory.halt(1)
+
+    assert trajectory.end_position().z == pytest.approx(5.0125)  # pyright:ignore[reportUnknownMemberType]
+    assert trajectory.position_at(10)[0] == trajectory.end_position()
+
+
+def test_reactor_runs_timers_in_virtual_time():
+    reactor = VirtualReactor()
+    ticks: list[float] = []
+
+    def tick(eventtime: float) -> float:
+        ticks.append(eventtime)
+        return eventtime + 0.5
+
+    _ = reactor.register_timer(tick, 0)
+    reactor.wait_for(lambda: len(ticks) >= 3)
+
+    assert ticks == [0, 0.5, 1.0]
+    assert reactor.monotonic() == 1.0
+
+
+def test_reactor_reports_stalled_waits():
+    with pytest.raises(RuntimeError, match="stalled"):
+        VirtualReactor().wait_for(lambda: False)
+
+
+def test_mesh_recovers_bed_surface():
+    bed = TiltedBed(x_slope=0.001, y_slope=-0.0005)
+    adapters = SimulatorAdapters(bed=bed, noise=GaussianNoise(0.001))
+    printer = SimulatedPrinter(adapters)
+
+    printer.home_z()
+    printer.run_macro("BED_MESH_CALIBRATE")
+
+    mesh = adapters.recording_bed_mesh.active
+    assert mesh is not None
+    y_count, x_count = mesh.matrix.shape
+    xs = np.linspace(mesh.min[0], mesh.max[0], x_count)
+    ys = np.linspace(mesh.min[1], mesh.max[1], y_count)
+    expected = np.array([[bed.height(x, y) for x in xs] for y in ys])
+    # The mesh is relative to wherever z was homed, only its shape has to match
+    error = mesh.matrix - expected
+    assert np.ptp(error) < 0.01
+
+
+def test_latency_calibration_finds_sensor_latency():
+    adapters = SimulatorAdapters(sensor_latency=0.002)
+    printer = SimulatedPrinter(adapters)
+
+    printer.run_macro("CARTOGRAPHER_LATENCY_CALIBRATE")
+
+    assert adapters.config.scan.sample_latency == pytest.approx(0.002, abs=2e-4)  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_simulation_is_deterministic():
+    def run() -> float | None:
+        printer = SimulatedPrinter(SimulatorAdapters(noise=GaussianNoise(0.005), seed=3))
+        printer.run_macro("CARTOGRAPHER_TOUCH")
+        return printer.cartographer.touch_mode.last_z_result
+
+    assert run() == run()
+
+
+def test_halt_brakes_with_deceleration():
+    trajectory = Trajectory(Position(0, 0, 10))
+    trajectory.append(Move.plan(0, Position(0, 0, 10), Position(0, 0, 0), speed=5, accel=1000, z_origin=0))
+
+    trajectory.halt(1, decel=100)
+
+    # 5mm/s braking at 100mm/s^2 takes 0.05s and 0.125mm
+    assert trajectory.last.end_time == pytest.approx(1.05)  # pyright:ignore[reportUnknownMemberType]
+    assert trajectory.end_position().z == pytest.approx(5.0125 - 0.125)  # pyright:ignore[reportUnknownMemberType]
+
+
+@pytest.mark.parametrize("approach_height", [0.0, 3.0])
+@pytest.mark.parametrize("halt_decel", [None, 500.0])
+def test_scan_homing_matches_physical_height(approach_height: float, halt_decel: float | None):
+    config = SimulatorConfiguration(scan=replace(default_scan_config(), homing_approach_height=approach_height))
+    config.save_scan_model(synthetic_scan_model())
+    adapters = SimulatorAdapters(config=config, noise=GaussianNoise(0.0), halt_latency=0.01, halt_decel=halt_decel)
+    printer = SimulatedPrinter(adapters)
+
+    printer.home_z(speed=20, retract_dist=5 if approach_height else 0)
+
+    # Scan homing makes z the sensor's distance to the bed
+    adapters.toolhead.wait_moves()
+    position = adapters.toolhead.get_position()
+    physical = adapters.trajectory.physical_position_at(printer.time)
+    sensor_height = physical.z - adapters.bed.height(
+        physical.x + config.general.x_offset, physical.y + config.general.y_offset
+    )
+    assert position.z == pytest.approx(sensor_height, abs=0.005)  # pyright:ignore[reportUnknownMemberType]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from benchmarks.imports import parse_import_time
+from benchmarks.registry import Benchmark
+from benchmarks.results import BenchmarkResult, ResultsFile, Status, compare
+from benchmarks.runner import run_benchmark
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def result(key: str, median: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        key=key, name=key, group="micro", params={}, rounds=1, loops=1, min=median, median=median, mean=median, stddev=0
+    )
+
+
+def test_benchmark_key_includes_params():
+    bench = Benchmark("path", "micro", {"grid": 10, "generator": "snake"}, lambda **_: lambda: None)
+
+    assert bench.key == "path[grid=10,generator=snake]"
+
+
+def test_compare_flags_regressions():
+    baseline = ResultsFile([result("same", 1.0), result("slower", 1.0), result("faster", 1.0), result("gone", 1.0)])
+    current = ResultsFile([result("same", 1.05), result("slower", 1.2), result("faster", 0.5), result("added", 1.0)])
+
+    statuses = {c.key: c.status for c in compare(baseline, current, threshold=0.1)}
+
+    assert statuses == {
+        "same": Status.UNCHANGED,
+        "slower": Status.REGRESSION,
+        "faster": Status.IMPROVEMENT,
+        "added": Status.NEW,
+        "gone": Status.MISSING,
+    }
+
+
+def test_results_round_trip(tmp_path: Path):
+    path = str(tmp_path / "results.json")
+    results = ResultsFile([result("bench", 0.5)])
+
+    results.save(path)
+
+    assert ResultsFile.load(path).results == results.results
+
+
+def test_run_benchmark_reports_time_per_call():
+    calls: list[int] = []
+    bench = Benchmark("count", "micro", {}, lambda: lambda: calls.append(1))
+
+    measured = run_benchmark(bench, rounds=3, min_round_time=0.001)
+
+    assert measured.rounds == 3
+    assert measured.loops > 1
+    assert 0 < measured.min <= measured.median
+
+
+def test_run_benchmark_uses_self_reported_time():
+    bench = Benchmark("reported", "import", {}, lambda: lambda: 0.25, self_timed=True)
+
+    measured = run_benchmark(bench, rounds=3)
+
+    assert measured.loops == 1
+    assert measured.median == 0.25
+
+
+def test_parse_import_time():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     cartographer.lib",
+            "import time:      3000 |      45000 | cartographer.core",
+        ]
+    )
+
+    assert parse_import_time(output, "cartographer.core") == 0.045
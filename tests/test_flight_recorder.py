@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cartographer.interfaces.printer import Position
+from cartographer.lib.flight_recorder import FlightEvent, FlightRecorder, FlightSample, read_flight_record
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def fill(recorder: FlightRecorder, count: int) -> None:
+    for i in range(count):
+        position = Position(1.0, 2.0, i / 10) if i % 2 == 0 else None
+        recorder.record_sample(i / 500, 1000 * i, 50_000_000 + i, 16000, position, 5.0 if position else None)
+
+
+def test_dump_round_trip(tmp_path: Path) -> None:
+    recorder = FlightRecorder(str(tmp_path), sample_capacity=8, event_capacity=4)
+    fill(recorder, 2)
+    recorder.record_event(1.5, "TOUCH started")
+
+    path = recorder.dump("TOUCH failed")
+
+    assert path is not None
+    record = read_flight_record(path)
+    assert record.reason == "TOUCH failed"
+    assert record.samples == [
+        FlightSample(0.0, 0, 50_000_000, 16000, Position(1.0, 2.0, 0.0), 5.0),
+        FlightSample(0.002, 1000, 50_000_001, 16000, None, None),
+    ]
+    assert record.events == [FlightEvent(1.5, "TOUCH started")]
+
+
+def test_keeps_only_the_most_recent_entries_in_order(tmp_path: Path) -> None:
+    recorder = FlightRecorder(str(tmp_path), sample_capacity=8, event_capacity=4)
+    fill(recorder, 21)
+    for i in range(10):
+        recorder.record_event(float(i), f"event {i}")
+
+    path = recorder.dump("shutdown")
+
+    assert path is not None
+    record = read_flight_record(path)
+    assert [s.clock for s in record.samples] == [1000 * i for i in range(13, 21)]
+    assert [e.message for e in record.events] == ["event 6", "event 7", "event 8", "event 9"]
+
+
+def test_dumps_do_not_overwrite_each_other(tmp_path: Path) -> None:
+    recorder = FlightRecorder(str(tmp_path))
+
+    first = recorder.dump("homing failed")
+    second = recorder.dump("macro failed")
+
+    assert first is not None
+    assert second is not None
+    assert first != second
+    assert read_flight_record(first).reason == "homing failed"
+
+
+def test_long_messages_are_truncated(tmp_path: Path) -> None:
+    recorder = FlightRecorder(str(tmp_path))
+    recorder.record_event(0.0, "x" * 1000)
+
+    path = recorder.dump("y" * 1000)
+
+    assert path is not None
+    record = read_flight_record(path)
+    assert len(record.reason) == 256
+    assert len(record.events[0].message) == 256
+
+
+def test_dump_creates_its_directory(tmp_path: Path) -> None:
+    recorder = FlightRecorder(os.path.join(str(tmp_path), "records"))
+
+    path = recorder.dump("shutdown")
+
+    assert path is not None
+    assert os.path.dirname(path) == str(tmp_path / "records")
+
+
+def test_keeps_only_the_newest_dumps(tmp_path: Path) -> None:
+    recorder = FlightRecorder(str(tmp_path), max_dumps=3)
+    _ = (tmp_path / "printer.cfg").write_text("")
+
+    paths = [recorder.dump(f"failure {i}") for i in range(5)]
+
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(str(p)) for p in paths[2:]] + ["printer.cfg"])
+
+
+def test_dump_failure_is_not_raised(tmp_path: Path) -> None:
+    blocker = tmp_path / "blocker"
+    _ = blocker.write_text("")
+    recorder = FlightRecorder(os.path.join(str(blocker), "records"))
+
+    assert recorder.dump("shutdown") is None
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other.bin"
+    _ = path.write_bytes(b"something else entirely")
+
+    with pytest.raises(RuntimeError, match="not a flight record"):
+        _ = read_flight_record(str(path))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from cartographer.lib.sequential_test import Decision, SequentialScoreTest
+
+TOLERANCE = 0.005
+
+
+@pytest.fixture
+def test() -> SequentialScoreTest:
+    return SequentialScoreTest(TOLERANCE)
+
+
+def test_needs_minimum_samples(test: SequentialScoreTest) -> None:
+    assert test.decide([0.0, 0.0]) is Decision.CONTINUE
+
+
+def test_accepts_identical_samples(test: SequentialScoreTest) -> None:
+    assert test.decide([0.1] * 5) is Decision.ACCEPT
+
+
+@pytest.mark.parametrize("samples", [[0.1, 0.1, 0.5], [0.0, 0.001, 0.5], [0.1, 0.1, 0.1]])
+def test_does_not_accept_few_samples(test: SequentialScoreTest, samples: list[float]) -> None:
+    assert test.decide(samples) is Decision.CONTINUE
+
+
+def test_rejects_before_accept_minimum(test: SequentialScoreTest) -> None:
+    assert test.min_accept_samples > 3
+    assert test.decide([0.0, 0.05, 0.1]) is Decision.REJECT
+
+
+def test_rejects_clearly_noisy_samples(test: SequentialScoreTest) -> None:
+    assert test.decide([0.0, 0.05, 0.1]) is Decision.REJECT
+
+
+def test_borderline_needs_more_samples(test: SequentialScoreTest) -> None:
+    samples = [0.0, 0.004, 0.008, 0.012]
+
+    assert test.decide(samples) is Decision.CONTINUE
+
+
+def test_interval_narrows_with_more_samples() -> None:
+    test = SequentialScoreTest(TOLERANCE, score=lambda _: TOLERANCE * 0.7)
+
+    assert test.decide([0.0] * 5) is Decision.CONTINUE
+    assert test.decide([0.0] * 20) is Decision.ACCEPT
+
+
+def test_requires_positive_tolerance() -> None:
+    with pytest.raises(ValueError, match="positive"):
+        _ = SequentialScoreTest(0)
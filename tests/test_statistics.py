@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from cartographer.lib.statistics import RunningMedianMAD, allan_deviation, compute_mad
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 7, 10, 51])
+def test_running_estimator_matches_batch(count: int) -> None:
+    values = np.random.default_rng(count).normal(0, 0.01, count).tolist()
+    running = RunningMedianMAD()
+
+    for i, value in enumerate(values):
+        running.add(value)
+        seen = values[: i + 1]
+        assert running.median == pytest.approx(np.median(seen))  # pyright:ignore[reportUnknownMemberType]
+        assert running.mad == pytest.approx(compute_mad(seen))  # pyright:ignore[reportUnknownMemberType]
+
+
+def test_running_estimator_with_duplicates() -> None:
+    running = RunningMedianMAD([1.0, 1.0, 1.0, 2.0, 5.0])
+
+    assert running.median == 1.0
+    assert running.mad == 0.0
+
+
+def test_running_estimator_empty() -> None:
+    running = RunningMedianMAD()
+
+    assert len(running) == 0
+    assert running.mad == compute_mad([]) == float("inf")
+    assert np.isnan(running.median)
+
+
+def test_allan_deviation_of_white_noise_falls_with_averaging() -> None:
+    values = np.random.default_rng(0).normal(0, 0.01, 4096)
+
+    deviations = allan_deviation(values, sample_rate=100)
+
+    assert deviations[0][0] == pytest.approx(0.01)  # pyright:ignore[reportUnknownMemberType]
+    assert deviations[0][1] == pytest.approx(0.01, rel=0.1)  # pyright:ignore[reportUnknownMemberType]
+    assert deviations[4][1] == pytest.approx(0.01 / 4, rel=0.2)  # pyright:ignore[reportUnknownMemberType]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from typing_extensions import override
+
+from cartographer.interfaces.printer import Position, Sample
+from cartographer.lib.sensor_constants import SensorConstants
+from cartographer.lib.stream_recording import (
+    RecordedData,
+    StreamRecorder,
+    SupportsStreamRecording,
+    read_records,
+    replay,
+    replay_samples,
+)
+from cartographer.macros.stream_record import StreamRecordMacro
+from tests.mocks.params import MockParams
+from tests.test_stream import MockStream
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SENSOR_FREQUENCY = 12e6
+INVERSE_ADC_MAX = 1 / 4095
+ADC_SMOOTH_COUNT = 8
+
+
+def record(path: str, count: int, max_bytes: int = 1024 * 1024) -> StreamRecorder:
+    recorder = StreamRecorder(path, max_bytes)
+    recorder.record_constants(SENSOR_FREQUENCY, INVERSE_ADC_MAX, ADC_SMOOTH_COUNT)
+    for i in range(count):
+        position = Position(10.0, 20.0, 1.0 + i * 0.01) if i % 2 == 0 else None
+        recorder.record_data(1000 * i, 50_000_000 + i, 16000, 1.0 + i * 0.002, position, 5.0 if position else None)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "stream.bin")
+    _ = record(path, 3)
+
+    records = list(read_records(path))
+
+    assert records == [
+        SensorConstants(SENSOR_FREQUENCY, INVERSE_ADC_MAX, ADC_SMOOTH_COUNT),
+        RecordedData(0, 50_000_000, 16000, 1.0, Position(10.0, 20.0, 1.0), 5.0),
+        RecordedData(1000, 50_000_001, 16000, 1.002, None, None),
+        RecordedData(2000, 50_000_002, 16000, 1.004, Position(10.0, 20.0, 1.02), 5.0),
+    ]
+
+
+def test_recording_stops_at_max_bytes(tmp_path: Path) -> None:
+    path = str(tmp_path / "stream.bin")
+    recorder = record(path, 100, max_bytes=500)
+
+    assert recorder.truncated
+    assert not recorder.active
+    assert os.path.getsize(path) == recorder.size <= 500
+    assert len(list(read_records(path))) == recorder.records
+
+
+def test_partial_record_is_ignored(tmp_path: Path) -> None:
+    path = str(tmp_path / "stream.bin")
+    recorder = record(path, 3)
+    with open(path, "r+b") as f:
+        _ = f.truncate(recorder.size - 5)
+
+    assert len(list(read_records(path))) == 3
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "stream.bin"
+    _ = path.write_bytes(b"not a recording")
+
+    with pytest.raises(RuntimeError, match="not a stream recording"):
+        _ = list(read_records(str(path)))
+
+
+def test_replay_converts_samples(tmp_path: Path) -> None:
+    path = str(tmp_path / "stream.bin")
+    _ = record(path, 2)
+
+    samples = list(replay_samples(path))
+
+    assert samples[0].frequency == pytest.approx(50_000_000 * SENSOR_FREQUENCY / 2**28)
+    assert samples[0].position == Position(10.0, 20.0, 1.0)
+    assert samples[1].position is None
+    assert samples[1].time == 1.002
+
+
+def test_replay_temperature_matches_thermistor() -> None:
+    constants = SensorConstants(SENSOR_FREQUENCY, INVERSE_ADC_MAX, ADC_SMOOTH_COUNT)
+    # At 25C the thermistor matches its reference resistance of 47k against the 10k pullup
+    adc = 47000 / (47000 + 10000)
+
+    temperature = constants.calculate_temperature(round(adc * 4095 * ADC_SMOOTH_COUNT))
+
+    assert temperature == pytest.approx(25.0, abs=0.05)
+
+
+def test_replay_feeds_stream(tmp_path: Path) -> None:
+    path = str(tmp_path / "stream.bin")
+    _ = record(path, 10)
+    stream = MockStream()
+
+    with stream.start_session() as session:
+        count = replay(path, stream)
+
+    assert count == 10
+    assert all(isinstance(s, Sample) for s in session.get_items())
+    assert len(session.get_items()) == 10
+
+
+class RecordingMcu(SupportsStreamRecording):
+    def __init__(self) -> None:
+        self.recorder: StreamRecorder | None = None
+
+    @override
+    def start_recording(self, path: str, max_bytes: int) -> StreamRecorder:
+        self.recorder = StreamRecorder(path, max_bytes)
+        return self.recorder
+
+    @override
+    def stop_recording(self) -> StreamRecorder | None:
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+
+
+def test_macro_toggles_recording(tmp_path: Path) -> None:
+    mcu = RecordingMcu()
+    macro = StreamRecordMacro(mcu, str(tmp_path))
+    params = MockParams()
+    params.params = {"FILENAME": "trace.bin", "MAX_SIZE": "2"}
+
+    macro.run(params)
+
+    assert mcu.recorder is not None
+    assert mcu.recorder.path == str(tmp_path / "trace.bin")
+    assert mcu.recorder.max_bytes == 2 * 1024 * 1024
+
+    params.params = {"ACTION": "stop"}
+    macro.run(params)
+
+    assert mcu.recorder is None
+    assert (tmp_path / "trace.bin").exists()
+
+
+@pytest.mark.parametrize("filename", ["../trace.bin", "/tmp/trace.bin", "sub/trace.bin", ".."])
+def test_macro_rejects_paths_outside_state_dir(tmp_path: Path, filename: str) -> None:
+    mcu = RecordingMcu()
+    macro = StreamRecordMacro(mcu, str(tmp_path / "state"))
+    params = MockParams()
+    params.params = {"FILENAME": filename}
+
+    with pytest.raises(RuntimeError, match="must not contain a directory"):
+        macro.run(params)
+
+    assert mcu.recorder is None
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from cartographer.lib.stream_stats import Histogram, StreamStats, SupportsStreamStats
+from simulator import SimulatedPrinter, SimulatorAdapters
+
+INTERVAL = 1 / 500
+
+
+def feed(stats: StreamStats, times: list[float], lag: float = 0.0) -> None:
+    for t in times:
+        stats.record(t, t + lag, 0.0001)
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.add(0.001)
+    histogram.add(0.5)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == pytest.approx(0.001, rel=0.5)
+    assert histogram.quantile(1.0) == 0.5
+    assert histogram.max == 0.5
+
+
+def test_measures_sample_rate() -> None:
+    stats = StreamStats()
+
+    feed(stats, [i * INTERVAL for i in range(1001)])
+
+    assert stats.sample_rate == pytest.approx(500)
+    assert stats.drops == 0
+    assert stats.gaps.mean == pytest.approx(INTERVAL)
+
+
+def test_detects_dropped_samples() -> None:
+    stats = StreamStats()
+    times = [i * INTERVAL for i in range(100)]
+    del times[50:53]
+
+    feed(stats, times)
+
+    assert stats.drops == 3
+
+
+def test_restart_does_not_count_as_drops() -> None:
+    stats = StreamStats()
+    feed(stats, [i * INTERVAL for i in range(100)])
+
+    stats.restart()
+    feed(stats, [10 + i * INTERVAL for i in range(100)])
+
+    assert stats.drops == 0
+    assert stats.samples == 200
+
+
+def test_tracks_lag() -> None:
+    stats = StreamStats()
+
+    feed(stats, [i * INTERVAL for i in range(100)], lag=0.02)
+
+    assert stats.lag.mean == pytest.approx(0.02)
+
+
+def test_simulator_reports_stream_status() -> None:
+    printer = SimulatedPrinter(SimulatorAdapters())
+    printer.run_macro("PROBE")
+
+    status = printer.cartographer.get_status(printer.time)
+
+    assert isinstance(status, dict)
+    stream = status["stream"]
+    assert stream["drops"] == 0
+    assert stream["sample_rate"] == pytest.approx(500, rel=0.01)
+    printer.run_macro("CARTOGRAPHER_STREAM_STATS", reset=1)
+    mcu = printer.adapters.mcu
+    assert isinstance(mcu, SupportsStreamStats)
+    assert mcu.get_stream_stats().samples == 0
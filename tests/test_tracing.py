@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cartographer.lib.tracing import Tracer, tracer
+from simulator import SimulatedPrinter, SimulatorAdapters
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def test_spans_nest() -> None:
+    trace = Tracer(clock=FakeClock())
+
+    with trace.span("outer"), trace.span("inner", point=3):
+        pass
+
+    inner, outer = trace.spans
+    assert (inner.name, inner.depth, inner.args) == ("inner", 1, {"point": 3})
+    assert (outer.name, outer.depth) == ("outer", 0)
+    assert outer.start < inner.start
+    assert outer.start + outer.duration > inner.start + inner.duration
+
+
+def test_spans_nest_per_thread() -> None:
+    trace = Tracer(clock=FakeClock())
+
+    def work() -> None:
+        with trace.span("worker"):
+            pass
+
+    with trace.span("outer"):
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+
+    worker_span, outer = trace.spans
+    assert (worker_span.name, worker_span.depth) == ("worker", 0)
+    assert (outer.name, outer.depth) == ("outer", 0)
+
+
+def test_decorator_records_calls() -> None:
+    trace = Tracer(clock=FakeClock())
+
+    @trace.traced("work")
+    def work(x: int) -> int:
+        return x * 2
+
+    assert work(2) == 4
+    assert [s.name for s in trace.spans] == ["work"]
+
+
+def test_failed_span_records_error() -> None:
+    trace = Tracer(clock=FakeClock())
+
+    with pytest.raises(ValueError), trace.span("fails"):
+        raise ValueError
+
+    assert trace.spans[0].args == {"error": "ValueError"}
+    assert trace.depth == 0
+
+
+def test_keeps_most_recent_spans() -> None:
+    trace = Tracer(capacity=2, clock=FakeClock())
+
+    for name in ("a", "b", "c"):
+        with trace.span(name):
+            pass
+
+    assert [s.name for s in trace.spans] == ["b", "c"]
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    trace = Tracer(clock=FakeClock())
+    trace.enabled = False
+
+    with trace.span("ignored"):
+        pass
+
+    assert not trace.spans
+
+
+def test_chrome_trace_export() -> None:
+    trace = Tracer(clock=FakeClock())
+    with trace.span("phase", points=object()):
+        pass
+
+    events = trace.to_chrome_trace()["traceEvents"]
+
+    assert isinstance(events, list)
+    assert len(events) == 1
+    event = events[0]
+    assert (event["name"], event["ph"], event["ts"], event["dur"]) == ("phase", "X", 1e6, 1e6)
+    assert isinstance(event["args"]["points"], str)
+
+
+def test_bed_mesh_phases_are_exported(tmp_path: Path) -> None:
+    tracer.clear()
+    printer = SimulatedPrinter(SimulatorAdapters(state_dir=str(tmp_path)))
+    printer.home_z()
+    printer.run_macro("BED_MESH_CALIBRATE")
+
+    printer.run_macro("CARTOGRAPHER_TRACE_EXPORT", filename="trace.json", clear=1)
+
+    with open(tmp_path / "trace.json") as f:
+        names = {event["name"] for event in json.load(f)["traceEvents"]}
+    assert {
+        "Path generation",
+        "Motion",
+        "Sample wait",
+        "Executor round-trip",
+        "Cluster position computation",
+        "Mesh apply",
+    } <= names
+    assert not tracer.spans
@@ -4,6 +4,7 @@ from typing import Protocol
 
 from mcu import MCU_endstop
 from stepper import MCU_stepper
+from toolhead import ToolHead
 
 type _Pos = list[float]
 
@@ -14,6 +15,8 @@ class PrinterHoming:
     def probing_move(self, mcu_probe: _McuProbe, pos: _Pos, speed: float) -> _Pos: ...
 
 class Homing:
+    toolhead: ToolHead
+    def get_trigger_position(self, stepper_name: str) -> int: ...
     def set_homed_position(self, pos: list[float | None]) -> None: ...
     def get_axes(self) -> list[int]: ...
 
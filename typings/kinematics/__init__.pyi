@@ -18,7 +18,7 @@ class Status(TypedDict):
 class Kinematics(Protocol):
     def get_steppers(self) -> list[MCU_stepper]: ...
     def get_status(self, eventtime: float) -> Status: ...
-    def calc_position(self, stepper_positions: dict[str, _Pos]) -> _Pos: ...
+    def calc_position(self, stepper_positions: dict[str, float]) -> _Pos: ...
     def clear_homing_state(
         self, axes: str | tuple[int, ...]
     ) -> None: ...  # TODO: Kalico and old klippy takes tuple[int,..]
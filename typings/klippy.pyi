@@ -53,6 +53,7 @@ class Printer:
     def is_shutdown(self) -> bool: ...
     def invoke_shutdown(self, msg: str) -> None: ...
     def get_reactor(self) -> Reactor: ...
+    def get_start_args(self) -> dict[str, object]: ...
     @overload
     def register_event_handler(self, event: Literal["klippy:connect"], callback: Callable[[], None]) -> None: ...
     @overload
@@ -34,6 +34,7 @@ class MCU:
     def print_time_to_clock(self, print_time: float) -> int: ...
     def clock_to_print_time(self, clock: int) -> float: ...
     def clock32_to_clock64(self, clock32: int) -> int: ...
+    def estimated_print_time(self, eventtime: float) -> float: ...
     def get_printer(self) -> Printer: ...
     def get_status(self) -> _MCUStatus: ...
     def is_fileoutput(self) -> bool: ...
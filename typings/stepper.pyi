@@ -1,16 +1,24 @@
 # https://github.com/Klipper3d/klipper/blob/master/klippy/stepper.py
-from typing import Literal
+from typing import Literal, NamedTuple
 
 from mcu import MCU
 
-type _Pos = list[float]
-
 class MCU_stepper:
     def get_mcu(self) -> MCU: ...
     def get_name(self, short: bool = False) -> str: ...
-    def get_commanded_position(self) -> _Pos: ...
+    def get_commanded_position(self) -> float: ...
+    def mcu_to_commanded_position(self, mcu_pos: int) -> float: ...
     def is_active_axis(self, axis: Literal["x", "y", "z", "e"]) -> bool: ...
 
+class _HomingInfo(NamedTuple):
+    speed: float
+    position_endstop: float
+    retract_speed: float
+    retract_dist: float
+    positive_dir: bool
+    second_homing_speed: float
+
 class PrinterRail:
+    def get_homing_info(self) -> _HomingInfo: ...
     def get_steppers(self) -> list[MCU_stepper]: ...
     def get_endstops(self) -> list[tuple[object, str]]: ...